@@ -1,10 +1,10 @@
-import os
 from logging.config import fileConfig
 
 from dotenv import load_dotenv
 from sqlalchemy import engine_from_config, pool
 
 from alembic import context
+from fantasy_optimizer.db.database import database_url
 
 load_dotenv()
 
@@ -13,8 +13,8 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# Override sqlalchemy.url from environment so we never hardcode credentials
-config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
+# Override sqlalchemy.url from config.toml/environment so we never hardcode credentials
+config.set_main_option("sqlalchemy.url", database_url())
 
 # Import all models so autogenerate can detect them
 import fantasy_optimizer.db.models  # noqa: F401, E402
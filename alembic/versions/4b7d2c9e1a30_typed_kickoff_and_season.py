@@ -0,0 +1,52 @@
+"""typed kickoff timestamp and season on player_gameweek_stats
+
+Revision ID: 4b7d2c9e1a30
+Revises: e3a2cf0b6051
+Create Date: 2026-10-17 10:12:41.503118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7d2c9e1a30"
+down_revision: Union[str, Sequence[str], None] = "e3a2cf0b6051"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "player_gameweek_stats",
+        sa.Column("kickoff_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "player_gameweek_stats", sa.Column("season", sa.Integer(), nullable=True)
+    )
+    # kickoff_time holds ISO 8601 strings in UTC ("2025-04-01T17:00:00Z")
+    op.execute("""
+        UPDATE player_gameweek_stats
+        SET kickoff_at = kickoff_time::timestamptz,
+            season = EXTRACT(YEAR FROM kickoff_time::timestamptz AT TIME ZONE 'UTC')::int
+        WHERE kickoff_time IS NOT NULL AND kickoff_time <> ''
+        """)
+    op.create_index(
+        "ix_player_gameweek_stats_season_element_round",
+        "player_gameweek_stats",
+        ["season", "element", "round"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_player_gameweek_stats_season_element_round",
+        table_name="player_gameweek_stats",
+    )
+    op.drop_column("player_gameweek_stats", "season")
+    op.drop_column("player_gameweek_stats", "kickoff_at")
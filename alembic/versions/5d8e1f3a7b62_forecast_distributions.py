@@ -0,0 +1,42 @@
+"""forecast distribution summaries and stored PMFs
+
+Revision ID: 5d8e1f3a7b62
+Revises: 9c41e7f05b2d
+Create Date: 2026-10-17 19:48:10.227413
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d8e1f3a7b62"
+down_revision: Union[str, Sequence[str], None] = "9c41e7f05b2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name in ("variance", "p_zero", "p_haul"):
+        op.add_column("forecasts", sa.Column(name, sa.Float(), nullable=True))
+    op.create_table(
+        "forecast_distributions",
+        sa.Column("run_id", sa.Integer(), nullable=False),
+        sa.Column("support_min", sa.Integer(), nullable=False),
+        sa.Column("support_size", sa.Integer(), nullable=False),
+        sa.Column("player_ids", sa.LargeBinary(), nullable=False),
+        sa.Column("probs", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["run_id"], ["forecast_runs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("run_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("forecast_distributions")
+    for name in ("p_haul", "p_zero", "variance"):
+        op.drop_column("forecasts", name)
@@ -0,0 +1,38 @@
+"""forecast horizons over upcoming rounds
+
+Revision ID: 7a2e9d4c1f08
+Revises: 5d8e1f3a7b62
+Create Date: 2026-10-17 20:31:42.518920
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a2e9d4c1f08"
+down_revision: Union[str, Sequence[str], None] = "5d8e1f3a7b62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "forecast_horizons",
+        sa.Column("run_id", sa.Integer(), nullable=False),
+        sa.Column("first_round", sa.Integer(), nullable=False),
+        sa.Column("n_rounds", sa.Integer(), nullable=False),
+        sa.Column("player_ids", sa.LargeBinary(), nullable=False),
+        sa.Column("expected", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["run_id"], ["forecast_runs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("run_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("forecast_horizons")
@@ -0,0 +1,89 @@
+"""versioned forecast runs
+
+Revision ID: 9c41e7f05b2d
+Revises: 4b7d2c9e1a30
+Create Date: 2026-10-17 11:03:17.226841
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c41e7f05b2d"
+down_revision: Union[str, Sequence[str], None] = "4b7d2c9e1a30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "forecast_runs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("model_name", sa.String(), nullable=False),
+        sa.Column("model_version", sa.String(), nullable=False),
+        sa.Column("gameweek", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "model_name", "model_version", "gameweek", name="uq_forecast_run"
+        ),
+    )
+
+    # Existing overwrite-in-place forecasts become a single "legacy" run
+    op.execute("""
+        INSERT INTO forecast_runs (model_name, model_version, gameweek, created_at)
+        SELECT 'legacy', '0', 0, max(created_at) FROM forecasts HAVING count(*) > 0
+        """)
+    op.add_column("forecasts", sa.Column("run_id", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE forecasts SET run_id = (SELECT id FROM forecast_runs"
+        " WHERE model_name = 'legacy')"
+    )
+    op.alter_column("forecasts", "run_id", nullable=False)
+    op.drop_constraint("forecasts_pkey", "forecasts", type_="primary")
+    op.create_primary_key("forecasts_pkey", "forecasts", ["run_id", "player_id"])
+    op.create_foreign_key(
+        "forecasts_run_id_fkey",
+        "forecasts",
+        "forecast_runs",
+        ["run_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_index("ix_forecasts_player_run", "forecasts", ["player_id", "run_id"])
+    op.drop_column("forecasts", "created_at")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        "forecasts",
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True
+        ),
+    )
+    # Keep only each player's latest forecast
+    op.execute("""
+        DELETE FROM forecasts f USING (
+            SELECT DISTINCT ON (player_id) player_id, run_id
+            FROM forecasts ORDER BY player_id, run_id DESC
+        ) latest
+        WHERE f.player_id = latest.player_id AND f.run_id <> latest.run_id
+        """)
+    op.execute(
+        "UPDATE forecasts f SET created_at = r.created_at"
+        " FROM forecast_runs r WHERE r.id = f.run_id"
+    )
+    op.drop_index("ix_forecasts_player_run", table_name="forecasts")
+    op.drop_constraint("forecasts_run_id_fkey", "forecasts", type_="foreignkey")
+    op.drop_constraint("forecasts_pkey", "forecasts", type_="primary")
+    op.create_primary_key("forecasts_pkey", "forecasts", ["player_id"])
+    op.drop_column("forecasts", "run_id")
+    op.drop_table("forecast_runs")
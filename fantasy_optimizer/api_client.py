@@ -1,42 +1,166 @@
 # fantasy_optimizer/api_client.py
 import json
-import time
+import os
+import threading
 from pathlib import Path
 
-from fantasy_optimizer.http import fetch_with_retry
+from fantasy_optimizer.bootstrap import BootstrapSnapshot, content_hash
+from fantasy_optimizer.history_store import HistoryStore
+from fantasy_optimizer.http import RateLimiter, Validators, fetch_if_modified
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
+# Legacy per-player JSON cache; only read by scripts/migrate_history_cache.py
 HISTORY_DIR = DATA_DIR / "player_histories"
-HISTORY_DIR.mkdir(exist_ok=True)
 
+# Columnar cache of every element-summary payload
+HISTORY_STORE = HistoryStore(DATA_DIR / "history_store")
 
-def fetch_bootstrap_static(force_refresh: bool = False) -> dict:
+BOOTSTRAP_URL = "https://fantasy.allsvenskan.se/api/bootstrap-static/"
+HISTORY_URL = "https://fantasy.allsvenskan.se/api/element-summary/{player_id}/"
+
+# Default spacing between uncached element-summary requests
+HISTORY_RATE_LIMITER = RateLimiter(min_interval=0.05)
+
+
+def _validators_path(file_path: Path) -> Path:
+    """Sidecar holding the ETag/Last-Modified of a cached file, ``<name>.meta``."""
+    return file_path.with_name(file_path.name + ".meta")
+
+
+def _read_validators(file_path: Path) -> Validators:
+    meta_path = _validators_path(file_path)
+    if not file_path.exists() or not meta_path.exists():
+        return Validators()
+    with open(meta_path) as f:
+        return Validators(**json.load(f))
+
+
+def _revalidate(url: str, file_path: Path) -> tuple[dict, bytes] | None:
+    """Refresh a cached file, sending the stored validators.
+
+    Returns the downloaded payload and the bytes written for it, or None when the
+    server answers 304 and the cached file is still current — in that case nothing
+    is downloaded or re-parsed.
+    """
+    result = fetch_if_modified(url, _read_validators(file_path))
+    if result.data is None:
+        return None
+
+    raw = json.dumps(result.data, indent=2).encode()
+    file_path.write_bytes(raw)
+    meta_path = _validators_path(file_path)
+    if result.validators:
+        with open(meta_path, "w") as f:
+            json.dump(
+                {
+                    "etag": result.validators.etag,
+                    "last_modified": result.validators.last_modified,
+                },
+                f,
+            )
+    else:
+        meta_path.unlink(missing_ok=True)
+    return result.data, raw
+
+
+# The parsed bootstrap of this process, with the (path, mtime, size) it was read at
+_bootstrap: tuple[tuple, BootstrapSnapshot] | None = None
+_bootstrap_lock = threading.Lock()
+
+
+def _stat_key(file_path: Path) -> tuple:
+    st = os.stat(file_path)
+    return (str(file_path), st.st_mtime_ns, st.st_size)
+
+
+def _snapshot_from(
+    raw: bytes, file_path: Path, data: dict | None = None
+) -> BootstrapSnapshot:
+    """Reuse the cached snapshot when ``raw`` hashes the same, otherwise build one.
+
+    ``data`` is ``raw`` already decoded, if the caller has it; else ``raw`` is parsed.
+    """
+    global _bootstrap
+    digest = content_hash(raw)
+    if _bootstrap is not None and _bootstrap[1].content_hash == digest:
+        snapshot = _bootstrap[1]
+    elif data is not None:
+        snapshot = BootstrapSnapshot(data, digest)
+    else:
+        snapshot = BootstrapSnapshot.from_bytes(raw)
+    _bootstrap = (_stat_key(file_path), snapshot)
+    return snapshot
+
+
+def load_bootstrap(force_refresh: bool = False) -> BootstrapSnapshot:
+    """The bootstrap-static payload, parsed at most once per content version.
+
+    Without ``force_refresh`` an unchanged cache file is served from memory; a file
+    that was rewritten is re-hashed and only re-parsed if its content differs. With
+    ``force_refresh`` the file is revalidated against the API first. Pass the
+    snapshot on to later steps rather than refreshing again.
+    """
     file_path = DATA_DIR / "bootstrap-static.json"
+    with _bootstrap_lock:
+        if force_refresh or not file_path.exists():
+            fetched = _revalidate(BOOTSTRAP_URL, file_path)
+            if fetched is not None:
+                data, raw = fetched
+                return _snapshot_from(raw, file_path, data)
 
-    if file_path.exists() and not force_refresh:
-        with open(file_path, "r") as f:
-            return json.load(f)
+        if _bootstrap is not None and _bootstrap[0] == _stat_key(file_path):
+            return _bootstrap[1]
+        return _snapshot_from(file_path.read_bytes(), file_path)
 
-    data = fetch_with_retry("https://fantasy.allsvenskan.se/api/bootstrap-static/")
-    with open(file_path, "w") as f:
-        json.dump(data, f, indent=2)
-    return data
+
+def fetch_bootstrap_static(force_refresh: bool = False) -> dict:
+    return load_bootstrap(force_refresh=force_refresh).data
+
+
+def refresh_player_history(
+    player_id: int, rate_limiter: RateLimiter | None = None
+) -> dict | None:
+    """Revalidate one player's cached history; None means it has not changed.
+
+    New payloads are staged in ``HISTORY_STORE``; call ``HISTORY_STORE.flush()``
+    once the batch of fetches is done to persist them.
+    """
+    limiter = rate_limiter or HISTORY_RATE_LIMITER
+    url = HISTORY_URL.format(player_id=player_id)
+    limiter.wait()
+    result = fetch_if_modified(url, HISTORY_STORE.validators(player_id))
+    if result.data is None and player_id not in HISTORY_STORE:
+        # Validators left over without a payload; a 304 has nothing to point at
+        limiter.wait()
+        result = fetch_if_modified(url, Validators())
+        if result.data is None:
+            raise RuntimeError(f"{url} answered 304 to an unconditional request")
+    if result.data is None:
+        return None
+    HISTORY_STORE.stage(player_id, result.data, result.validators)
+    return result.data
 
 
-def fetch_player_history(player_id: int, force_refresh: bool = False) -> dict:
-    """Fetch and cache per-player gameweek history from the API."""
-    file_path = HISTORY_DIR / f"{player_id}.json"
+def fetch_player_history(
+    player_id: int,
+    force_refresh: bool = False,
+    rate_limiter: RateLimiter | None = None,
+) -> dict:
+    """Fetch and cache per-player gameweek history from the API.
 
-    if file_path.exists() and not force_refresh:
-        with open(file_path) as f:
-            return json.load(f)
+    Safe to call from several threads; cache hits never touch the rate limiter.
+    Downloaded payloads are only staged in ``HISTORY_STORE``, as in
+    ``refresh_player_history``: call ``HISTORY_STORE.flush()`` afterwards, or they
+    are lost when the process exits.
+    """
+    if not force_refresh:
+        cached = HISTORY_STORE.payload(player_id)
+        if cached is not None:
+            return cached
 
-    data = fetch_with_retry(
-        f"https://fantasy.allsvenskan.se/api/element-summary/{player_id}/"
-    )
-    with open(file_path, "w") as f:
-        json.dump(data, f, indent=2)
-    time.sleep(0.05)
+    data = refresh_player_history(player_id, rate_limiter=rate_limiter)
+    if data is None:
+        data = HISTORY_STORE.payload(player_id)
     return data
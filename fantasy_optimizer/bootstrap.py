@@ -0,0 +1,60 @@
+# fantasy_optimizer/bootstrap.py
+"""Parsed bootstrap-static payload with pre-built lookups.
+
+``api_client.load_bootstrap`` returns one shared ``BootstrapSnapshot`` per
+process and only re-parses the cached file when its content hash changes, so
+every ingest step and the optimiser can share one parse.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+class BootstrapSnapshot:
+    """Read-only view of one bootstrap-static payload.
+
+    ``elements``, ``teams`` and ``events`` are the payload lists; the ``*_by_id``
+    dicts index them. Item access (``snapshot["elements"]``) reads the raw payload.
+    """
+
+    def __init__(self, data: dict, content_hash: str):
+        self.data = data
+        self.content_hash = content_hash
+
+        self.elements: list[dict] = data.get("elements", [])
+        self.teams: list[dict] = data.get("teams", [])
+        self.events: list[dict] = data.get("events", [])
+
+        self.element_by_id = {e["id"]: e for e in self.elements}
+        self.team_by_id = {t["id"]: t for t in self.teams}
+        self.team_id_by_name = {t["name"]: t["id"] for t in self.teams}
+        self.event_by_id = {e["id"]: e for e in self.events}
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "BootstrapSnapshot":
+        return cls(json.loads(raw), content_hash(raw))
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __repr__(self) -> str:
+        return (
+            f"BootstrapSnapshot({len(self.elements)} elements, {len(self.teams)} teams,"
+            f" {len(self.events)} events, hash={self.content_hash[:12]})"
+        )
+
+    def _event_where(self, flag: str) -> dict | None:
+        return next((e for e in self.events if e.get(flag)), None)
+
+    @property
+    def current_event(self) -> dict | None:
+        return self._event_where("is_current")
+
+    @property
+    def next_event(self) -> dict | None:
+        return self._event_where("is_next")
@@ -1,9 +1,10 @@
-"""Optimization configuration — loaded from config.toml in the project root."""
+"""Project configuration — loaded from config.toml in the project root."""
 
 from __future__ import annotations
 
+import re
 import tomllib
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
 _CONFIG_PATH = Path(__file__).resolve().parents[1] / "config.toml"
@@ -54,3 +55,162 @@ def load_config(path: Path = _CONFIG_PATH) -> OptimizationConfig:
         excluded_teams=cfg.get("excluded_teams", []),
         max_players_per_team=cfg.get("max_players_per_team", 3),
     )
+
+
+@dataclass
+class IngestConfig:
+    # Player-history fetching
+    concurrency: int = 8
+    request_interval: float = 0.05
+    # Fetch -> validate -> write pipeline
+    queue_size: int = 32  # items buffered between stages before upstream blocks
+    validate_batch_size: int = 500  # gameweek rows per validate_rows call
+    write_batch_size: int = 2000  # gameweek rows per upsert transaction
+    # Database writes
+    bulk_copy: bool = False
+
+
+def load_ingest_config(path: Path = _CONFIG_PATH) -> IngestConfig:
+    if not path.exists():
+        return IngestConfig()
+
+    with path.open("rb") as f:
+        data = tomllib.load(f)
+
+    cfg = data.get("ingest", {})
+    return IngestConfig(
+        concurrency=cfg.get("concurrency", 8),
+        request_interval=cfg.get("request_interval", 0.05),
+        queue_size=cfg.get("queue_size", 32),
+        validate_batch_size=cfg.get("validate_batch_size", 500),
+        write_batch_size=cfg.get("write_batch_size", 2000),
+        bulk_copy=cfg.get("bulk_copy", False),
+    )
+
+
+@dataclass
+class DatabaseConfig:
+    # "postgresql" reads DATABASE_URL; "sqlite" is an embedded file, no server needed
+    backend: str = "postgresql"
+    sqlite_path: str = "data/fantasy.db"  # relative to the project root
+
+    # Connection pool
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0  # seconds to wait for a free connection
+    pool_pre_ping: bool = True
+    statement_timeout_ms: int = 0  # PostgreSQL only; 0 disables
+
+    @property
+    def url(self) -> str | None:
+        """SQLAlchemy URL for the sqlite backend; None means use DATABASE_URL."""
+        if self.backend == "sqlite":
+            path = Path(self.sqlite_path)
+            if not path.is_absolute():
+                path = _CONFIG_PATH.parent / path
+            return f"sqlite:///{path}"
+        return None
+
+
+def load_database_config(path: Path = _CONFIG_PATH) -> DatabaseConfig:
+    if not path.exists():
+        return DatabaseConfig()
+
+    with path.open("rb") as f:
+        data = tomllib.load(f)
+
+    cfg = data.get("database", {})
+    backend = cfg.get("backend", "postgresql")
+    if backend not in ("postgresql", "sqlite"):
+        raise ValueError(
+            f"Unknown database backend {backend!r}; expected 'postgresql' or 'sqlite'"
+        )
+    return DatabaseConfig(
+        backend=backend,
+        sqlite_path=cfg.get("sqlite_path", "data/fantasy.db"),
+        pool_size=cfg.get("pool_size", 5),
+        max_overflow=cfg.get("max_overflow", 10),
+        pool_timeout=cfg.get("pool_timeout", 30.0),
+        pool_pre_ping=cfg.get("pool_pre_ping", True),
+        statement_timeout_ms=cfg.get("statement_timeout_ms", 0),
+    )
+
+
+@dataclass
+class SimulationConfig:
+    # Monte Carlo squad scoring (fantasy_optimizer.forecasting.simulate)
+    n_scenarios: int = 100_000  # sampled gameweeks per squad
+    batch_size: int = 4096  # scenarios held in memory at once
+    seed: int | None = None  # fixed seed for reproducible results; None draws fresh
+
+
+def load_simulation_config(path: Path = _CONFIG_PATH) -> SimulationConfig:
+    if not path.exists():
+        return SimulationConfig()
+
+    with path.open("rb") as f:
+        data = tomllib.load(f)
+
+    cfg = data.get("simulation", {})
+    return SimulationConfig(
+        n_scenarios=cfg.get("n_scenarios", 100_000),
+        batch_size=cfg.get("batch_size", 4096),
+        seed=cfg.get("seed"),
+    )
+
+
+@dataclass
+class ForecastConfig:
+    # Simulation forecast (build_forecasts.py); tuned by scripts/tune_forecasts.py
+    decay: float = 0.9  # weight of a player's point k matches ago is decay ** k
+    mix_with_pool: float = 0.20  # share of the position pool in each PMF
+    smooth_sigma: float = 0.4  # Gaussian smoothing of the PMF, in points
+    zero_window: int = 6  # recent matches behind the extra P(0)
+
+
+def load_forecast_config(path: Path = _CONFIG_PATH) -> ForecastConfig:
+    if not path.exists():
+        return ForecastConfig()
+
+    with path.open("rb") as f:
+        data = tomllib.load(f)
+
+    cfg = data.get("forecast", {})
+    return ForecastConfig(
+        decay=cfg.get("decay", 0.9),
+        mix_with_pool=cfg.get("mix_with_pool", 0.20),
+        smooth_sigma=cfg.get("smooth_sigma", 0.4),
+        zero_window=cfg.get("zero_window", 6),
+    )
+
+
+def save_forecast_config(cfg: ForecastConfig, path: Path = _CONFIG_PATH) -> None:
+    """Write ``cfg`` into the ``[forecast]`` section of ``path``, keeping comments.
+
+    Existing ``key = value`` lines are updated in place; missing keys, or the whole
+    section, are appended.
+    """
+    lines = path.read_text().splitlines() if path.exists() else []
+    values = {k: repr(v) for k, v in asdict(cfg).items()}
+
+    start = next(
+        (i for i, line in enumerate(lines) if line.strip() == "[forecast]"), None
+    )
+    if start is None:
+        lines += ["", "[forecast]", ""] if lines else ["[forecast]", ""]
+        start = len(lines) - 2
+    end = next(
+        (i for i in range(start + 1, len(lines)) if lines[i].lstrip().startswith("[")),
+        len(lines),
+    )
+    for i in range(start + 1, end):
+        match = re.match(r"(\s*)(\w+)(\s*=\s*)(\S+)(.*)", lines[i])
+        if match and match.group(2) in values:
+            indent, key, eq, _, rest = match.groups()
+            lines[i] = f"{indent}{key}{eq}{values.pop(key)}{rest}"
+    # Append before the section's trailing blank lines
+    insert = end
+    while insert > start + 1 and not lines[insert - 1].strip():
+        insert -= 1
+    lines[insert:insert] = [f"{key} = {value}" for key, value in values.items()]
+    path.write_text("\n".join(lines) + "\n")
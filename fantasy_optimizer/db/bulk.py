@@ -0,0 +1,91 @@
+"""COPY-based bulk upserts for PostgreSQL.
+
+Rows are streamed as CSV into a session-private staging table (a TEMP table, which
+PostgreSQL never WAL-logs) and merged into the target with one
+``INSERT ... SELECT ... ON CONFLICT DO UPDATE``. This skips per-batch parameter
+binding and statement compilation entirely.
+"""
+
+import io
+from collections.abc import Sequence
+from datetime import date, datetime
+
+from sqlalchemy import Connection, Table
+
+
+def _csv_field(value) -> str:
+    if value is None:
+        return ""  # unquoted empty field is NULL in COPY's CSV format
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def rows_to_csv(rows: Sequence[dict], columns: Sequence[str]) -> io.StringIO:
+    buf = io.StringIO()
+    for row in rows:
+        buf.write(",".join(_csv_field(row.get(c)) for c in columns))
+        buf.write("\n")
+    buf.seek(0)
+    return buf
+
+
+def _dedupe(rows: Sequence[dict], conflict_cols: Sequence[str]) -> list[dict]:
+    """Keep the last row per conflict key; ON CONFLICT cannot touch a row twice."""
+    return list({tuple(r[c] for c in conflict_cols): r for r in rows}.values())
+
+
+def copy_upsert(
+    conn: Connection,
+    table: Table,
+    rows: Sequence[dict],
+    conflict_cols: Sequence[str],
+    update_cols: Sequence[str] | None = None,
+) -> int:
+    """Upsert ``rows`` into ``table`` via COPY into a staging table.
+
+    Runs inside the caller's transaction; the staging table is dropped on commit.
+    Returns the number of rows merged.
+    """
+    if not rows:
+        return 0
+    rows = _dedupe(rows, conflict_cols)
+    columns = list(rows[0])
+    if update_cols is None:
+        update_cols = [c for c in columns if c not in conflict_cols]
+
+    quote = conn.dialect.identifier_preparer.quote
+    target = quote(table.name)
+    staging = quote(f"_stage_{table.name}")
+    col_list = ", ".join(quote(c) for c in columns)
+    conflict = ", ".join(quote(c) for c in conflict_cols)
+    if update_cols:
+        action = "DO UPDATE SET " + ", ".join(
+            f"{quote(c)} = EXCLUDED.{quote(c)}" for c in update_cols
+        )
+    else:
+        action = "DO NOTHING"
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS"
+            f" SELECT {col_list} FROM {target} WITH NO DATA"
+        )
+        cursor.copy_expert(
+            f"COPY {staging} ({col_list}) FROM STDIN WITH (FORMAT csv)",
+            rows_to_csv(rows, columns),
+        )
+        cursor.execute(
+            f"INSERT INTO {target} ({col_list}) SELECT {col_list} FROM {staging}"
+            f" ON CONFLICT ({conflict}) {action}"
+        )
+        cursor.execute(f"DROP TABLE {staging}")
+    finally:
+        cursor.close()
+    return len(rows)
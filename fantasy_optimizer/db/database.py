@@ -1,20 +1,193 @@
+"""Engine construction.
+
+Nothing connects, reads ``.env`` or even checks ``DATABASE_URL`` until the first
+``get_engine()`` call, so modules that merely import the db layer work without a
+database. Engines are cached per process: one for the primary and, when
+``DATABASE_REPLICA_URL`` is set, one for a read-only replica.
+"""
+
+import hashlib
 import os
+import threading
+import time
+from dataclasses import dataclass
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import QueuePool
 
-load_dotenv()
-
-DATABASE_URL = os.environ["DATABASE_URL"]
+from fantasy_optimizer.config import DatabaseConfig, load_database_config
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine)
+REPLICA_URL_ENV = "DATABASE_REPLICA_URL"
 
 
 class Base(DeclarativeBase):
     pass
 
 
+def database_url() -> str:
+    """The [database] backend from config.toml; PostgreSQL reads DATABASE_URL."""
+    load_dotenv()
+    return load_database_config().url or os.environ["DATABASE_URL"]
+
+
+def database_key() -> str:
+    """Short digest of ``database_url()``, for per-database state files.
+
+    Credentials in the URL never reach the file this way.
+    """
+    return hashlib.sha256(database_url().encode()).hexdigest()[:16]
+
+
+def replica_url() -> str | None:
+    load_dotenv()
+    if load_database_config().backend != "postgresql":
+        return None
+    return os.environ.get(REPLICA_URL_ENV) or None
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    checkouts: int
+    connections_opened: int
+    peak_checked_out: int
+    wait_seconds: float
+    max_wait_seconds: float
+
+    def __str__(self) -> str:
+        return (
+            f"{self.checkouts} checkouts, {self.connections_opened} connections opened,"
+            f" peak {self.peak_checked_out} in use,"
+            f" waited {self.wait_seconds:.2f}s (max {self.max_wait_seconds:.2f}s)"
+        )
+
+
+class PoolMetrics:
+    """Thread-safe counters fed by the pool.
+
+    Wait time covers queueing for a free connection plus opening new ones; a large
+    total with ``peak_checked_out`` at pool_size + max_overflow means contention.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._connections_opened = 0
+        self._peak_checked_out = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def on_connect(self, *_args) -> None:
+        with self._lock:
+            self._connections_opened += 1
+
+    def on_checkout(self, waited: float, checked_out: int) -> None:
+        with self._lock:
+            self._checkouts += 1
+            self._peak_checked_out = max(self._peak_checked_out, checked_out)
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+    def snapshot(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                self._checkouts,
+                self._connections_opened,
+                self._peak_checked_out,
+                self._wait_seconds,
+                self._max_wait_seconds,
+            )
+
+
+def _metered_pool(metrics: PoolMetrics) -> type:
+    class MeteredQueuePool(QueuePool):
+        def _do_get(self):
+            start = time.perf_counter()
+            conn = super()._do_get()
+            metrics.on_checkout(time.perf_counter() - start, self.checkedout())
+            return conn
+
+    # On the class, so pools recreated by engine.dispose() keep counting
+    MeteredQueuePool.metrics = metrics  # type: ignore[attr-defined]
+    return MeteredQueuePool
+
+
+def _sqlite_pragmas(dbapi_connection, _record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys = ON")  # needed for ON DELETE CASCADE
+    cursor.execute("PRAGMA journal_mode = WAL")  # readers don't block the ingest
+    cursor.execute("PRAGMA synchronous = NORMAL")
+    cursor.close()
+
+
+def make_engine(url: str, cfg: DatabaseConfig | None = None) -> Engine:
+    """Create an engine with the pool settings from ``cfg`` (config.toml by default)."""
+    cfg = cfg or load_database_config()
+    metrics = PoolMetrics()
+    connect_args = {}
+    if url.startswith("postgresql") and cfg.statement_timeout_ms:
+        connect_args["options"] = f"-c statement_timeout={cfg.statement_timeout_ms}"
+
+    engine = create_engine(
+        url,
+        poolclass=_metered_pool(metrics),
+        pool_size=cfg.pool_size,
+        max_overflow=cfg.max_overflow,
+        pool_timeout=cfg.pool_timeout,
+        pool_pre_ping=cfg.pool_pre_ping,
+        connect_args=connect_args,
+    )
+    event.listen(engine, "connect", metrics.on_connect)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _sqlite_pragmas)
+    return engine
+
+
+_engines: dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(replica: bool = False) -> Engine:
+    """Process-wide engine, created on first use.
+
+    ``replica=True`` is for heavy read-only queries; it falls back to the primary
+    when no ``DATABASE_REPLICA_URL`` is configured.
+    """
+    key = "replica" if replica else "primary"
+    engine = _engines.get(key)
+    if engine is not None:
+        return engine
+    with _engines_lock:
+        if "primary" not in _engines:
+            _engines["primary"] = make_engine(database_url())
+        if replica and "replica" not in _engines:
+            url = replica_url()
+            _engines["replica"] = make_engine(url) if url else _engines["primary"]
+        return _engines[key]
+
+
+def pool_stats(engine: Engine | None = None) -> PoolStats:
+    engine = engine or get_engine()
+    return engine.pool.metrics.snapshot()  # type: ignore[attr-defined]
+
+
+def dispose_engines() -> None:
+    """Close every pooled connection and forget the cached engines."""
+    with _engines_lock:
+        for engine in set(_engines.values()):
+            engine.dispose()
+        _engines.clear()
+
+
 def get_session():
-    return SessionLocal()
+    return sessionmaker(bind=get_engine())()
+
+
+def __getattr__(name: str):
+    # Keep ``from fantasy_optimizer.db.database import engine`` working for notebooks
+    if name == "engine":
+        return get_engine()
+    if name == "DATABASE_URL":
+        return database_url()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
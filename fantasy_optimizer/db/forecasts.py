@@ -0,0 +1,276 @@
+"""Versioned forecast storage.
+
+Every build is stored as a run, keyed by (model name, model version, gameweek) in
+``forecast_runs``. The per-player numbers sit in ``forecasts``, keyed by
+(run_id, player_id). The model metadata is written once per run rather than on
+every row, so a run costs a few narrow columns per player. Re-running the same
+model version for the same gameweek replaces that run's forecasts.
+
+Models with a full points PMF also store it in ``forecast_distributions``: one
+row per run holding the shared support and a float32 players x support matrix,
+so the whole league's distributions load with a single read. A run's expected
+points over the upcoming rounds are kept the same way in ``forecast_horizons``.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Connection, delete, func, text
+
+from fantasy_optimizer.db.database import get_engine
+from fantasy_optimizer.db.models import (
+    ForecastDistributionRow,
+    ForecastHorizonRow,
+    ForecastRow,
+    ForecastRunRow,
+)
+from fantasy_optimizer.db.upsert import upsert_forecasts, upsert_insert
+from fantasy_optimizer.forecasting.horizon import HorizonForecast
+from fantasy_optimizer.forecasting.pmf import PointsDistributions
+
+# Optional per-player summaries of the points distribution
+STAT_COLUMNS = ("variance", "p_zero", "p_haul")
+
+
+def _forecast_row(run_id: int, f: dict) -> dict:
+    row = {
+        "run_id": run_id,
+        "player_id": int(f["player_id"]),
+        "expected_points": float(f["expected_points"]),
+    }
+    for col in STAT_COLUMNS:
+        if col in f:
+            row[col] = None if pd.isna(f[col]) else float(f[col])
+    return row
+
+
+def _distribution_row(run_id: int, dists: PointsDistributions) -> dict:
+    return {
+        "run_id": run_id,
+        "support_min": int(dists.grid[0]),
+        "support_size": int(dists.grid.size),
+        "player_ids": np.asarray(dists.player_ids, dtype="<i4").tobytes(),
+        "probs": np.ascontiguousarray(dists.probs, dtype="<f4").tobytes(),
+    }
+
+
+def _horizon_row(run_id: int, horizon: HorizonForecast) -> dict:
+    return {
+        "run_id": run_id,
+        "first_round": int(horizon.rounds[0]),
+        "n_rounds": int(horizon.rounds.size),
+        "player_ids": np.asarray(horizon.player_ids, dtype="<i4").tobytes(),
+        "expected": np.ascontiguousarray(horizon.expected, dtype="<f4").tobytes(),
+    }
+
+
+def _replace_run_arrays(conn: Connection, model, run_id: int, row: dict | None):
+    """Store (or, without ``row``, drop) a run's single row in ``model``'s table."""
+    if row is None:
+        conn.execute(delete(model).where(model.run_id == run_id))
+        return
+    stmt = upsert_insert(conn, model).values(**row)
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["run_id"],
+            set_={c: stmt.excluded[c] for c in row if c != "run_id"},
+        )
+    )
+
+
+def save_forecast_run(
+    forecasts: Sequence[dict],
+    model_name: str,
+    model_version: str,
+    gameweek: int,
+    use_copy: bool = False,
+    distributions: PointsDistributions | None = None,
+    horizon: HorizonForecast | None = None,
+) -> int:
+    """Store ``forecasts`` (``player_id``/``expected_points`` dicts) as one run.
+
+    The dicts may also carry ``variance``, ``p_zero`` and ``p_haul``. With
+    ``distributions`` the run's full PMFs are stored too, and with ``horizon`` its
+    expected points over the upcoming rounds. Runs in a single transaction and
+    returns the run id.
+    """
+    with get_engine().begin() as conn:
+        stmt = (
+            upsert_insert(conn, ForecastRunRow)
+            .values(
+                model_name=model_name, model_version=model_version, gameweek=gameweek
+            )
+            .on_conflict_do_update(
+                index_elements=["model_name", "model_version", "gameweek"],
+                set_={"created_at": func.now()},
+            )
+            .returning(ForecastRunRow.id)
+        )
+        run_id = conn.execute(stmt).scalar_one()
+
+        conn.execute(delete(ForecastRow).where(ForecastRow.run_id == run_id))
+        upsert_forecasts(
+            [_forecast_row(run_id, f) for f in forecasts],
+            use_copy=use_copy,
+            conn=conn,
+        )
+        _replace_run_arrays(
+            conn,
+            ForecastDistributionRow,
+            run_id,
+            None if distributions is None else _distribution_row(run_id, distributions),
+        )
+        _replace_run_arrays(
+            conn,
+            ForecastHorizonRow,
+            run_id,
+            None if horizon is None else _horizon_row(run_id, horizon),
+        )
+    return run_id
+
+
+def _newest_first(alias: str = "") -> str:
+    """ORDER BY terms putting the newest run first: highest gameweek, latest built."""
+    prefix = f"{alias}." if alias else ""
+    return f"{prefix}gameweek DESC, {prefix}created_at DESC, {prefix}id DESC"
+
+
+def _run_query(
+    model_name: str | None, model_version: str | None, gameweek: int | None
+) -> tuple[str, dict]:
+    """SQL selecting one run's id: the newest run matching the given filters."""
+    filters, params = [], {}
+    for col, value in (
+        ("model_name", model_name),
+        ("model_version", model_version),
+        ("gameweek", gameweek),
+    ):
+        if value is not None:
+            filters.append(f"{col} = :{col}")
+            params[col] = value
+    where = f" WHERE {' AND '.join(filters)}" if filters else ""
+    return (
+        f"SELECT id FROM forecast_runs{where} ORDER BY {_newest_first()} LIMIT 1",
+        params,
+    )
+
+
+def load_forecasts(
+    conn: Connection,
+    model_name: str | None = None,
+    model_version: str | None = None,
+    gameweek: int | None = None,
+    with_stats: bool = False,
+) -> pd.DataFrame:
+    """Return ``player_id``/``expected_points`` for one run.
+
+    Without arguments this is the newest run: highest gameweek, most recently built.
+    Narrow it with ``model_name``, ``model_version`` and ``gameweek``.
+    ``with_stats`` adds the ``variance``, ``p_zero`` and ``p_haul`` columns.
+    """
+    run, params = _run_query(model_name, model_version, gameweek)
+    columns = ["player_id", "expected_points"]
+    if with_stats:
+        columns += STAT_COLUMNS
+    return pd.read_sql(
+        text(f"SELECT {', '.join(columns)} FROM forecasts WHERE run_id = ({run})"),
+        conn,
+        params=params,
+    )
+
+
+def load_distributions(
+    conn: Connection,
+    model_name: str | None = None,
+    model_version: str | None = None,
+    gameweek: int | None = None,
+) -> PointsDistributions | None:
+    """The stored PMFs of one run, chosen as in ``load_forecasts``.
+
+    Returns None when the run has no distributions (or there is no run).
+    """
+    run, params = _run_query(model_name, model_version, gameweek)
+    dist = conn.execute(
+        text(
+            "SELECT support_min, support_size, player_ids, probs"
+            f" FROM forecast_distributions WHERE run_id = ({run})"
+        ),
+        params,
+    ).first()
+    if dist is None:
+        return None
+    player_ids = np.frombuffer(dist.player_ids, dtype="<i4").astype(np.int64)
+    probs = np.frombuffer(dist.probs, dtype="<f4").reshape(
+        len(player_ids), dist.support_size
+    )
+    grid = np.arange(dist.support_min, dist.support_min + dist.support_size)
+    return PointsDistributions(player_ids, grid, probs)
+
+
+def load_horizon(
+    conn: Connection,
+    model_name: str | None = None,
+    model_version: str | None = None,
+    gameweek: int | None = None,
+) -> HorizonForecast | None:
+    """The stored upcoming-rounds matrix of one run, chosen as in ``load_forecasts``.
+
+    Returns None when the run has no horizon (or there is no run).
+    """
+    run, params = _run_query(model_name, model_version, gameweek)
+    row = conn.execute(
+        text(
+            "SELECT first_round, n_rounds, player_ids, expected"
+            f" FROM forecast_horizons WHERE run_id = ({run})"
+        ),
+        params,
+    ).first()
+    if row is None:
+        return None
+    player_ids = np.frombuffer(row.player_ids, dtype="<i4").astype(np.int64)
+    expected = np.frombuffer(row.expected, dtype="<f4").reshape(
+        len(player_ids), row.n_rounds
+    )
+    rounds = np.arange(row.first_round, row.first_round + row.n_rounds)
+    return HorizonForecast(player_ids, rounds, expected)
+
+
+def latest_forecast_per_player(
+    conn: Connection, model_name: str | None = None
+) -> pd.DataFrame:
+    """Each player's forecast from the newest run that has one.
+
+    Runs are ordered as in ``load_forecasts``: highest gameweek, most recently built.
+    """
+    # Correlated lookup through ix_forecasts_player_run, one probe per player
+    model_filter = " AND lr.model_name = :model_name" if model_name is not None else ""
+    latest = (
+        "SELECT l.run_id FROM forecasts l"
+        " JOIN forecast_runs lr ON lr.id = l.run_id"
+        f" WHERE l.player_id = f.player_id{model_filter}"
+        f" ORDER BY {_newest_first('lr')} LIMIT 1"
+    )
+    return pd.read_sql(
+        text(
+            "SELECT f.player_id, f.expected_points,"
+            " r.model_name, r.model_version, r.gameweek"
+            " FROM forecasts f JOIN forecast_runs r ON r.id = f.run_id"
+            f" WHERE f.run_id = ({latest})"
+            " ORDER BY f.player_id"
+        ),
+        conn,
+        params={"model_name": model_name} if model_name is not None else {},
+    )
+
+
+def list_forecast_runs(conn: Connection) -> pd.DataFrame:
+    return pd.read_sql(
+        text(
+            "SELECT r.id, r.model_name, r.model_version, r.gameweek, r.created_at,"
+            " count(f.player_id) AS players"
+            " FROM forecast_runs r LEFT JOIN forecasts f ON f.run_id = r.id"
+            " GROUP BY r.id ORDER BY r.created_at DESC"
+        ),
+        conn,
+    )
@@ -3,7 +3,10 @@ from sqlalchemy import (
     Column,
     DateTime,
     Float,
+    ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     UniqueConstraint,
     func,
@@ -66,7 +69,9 @@ class PlayerGameweekStatRow(Base):
     opponent_team = Column(Integer, nullable=False)
     total_points = Column(Integer, nullable=False)
     was_home = Column(Boolean, nullable=False)
-    kickoff_time = Column(String, nullable=True)
+    kickoff_time = Column(String, nullable=True)  # raw API string
+    kickoff_at = Column(DateTime(timezone=True), nullable=True)
+    season = Column(Integer, nullable=True)  # year of kickoff_at
     team_h_score = Column(Integer, nullable=True)
     team_a_score = Column(Integer, nullable=True)
     minutes = Column(Integer, nullable=False)
@@ -83,7 +88,15 @@ class PlayerGameweekStatRow(Base):
     bonus = Column(Integer, nullable=True)
     round = Column(Integer, nullable=False)
 
-    __table_args__ = (UniqueConstraint("element", "fixture", name="uq_player_fixture"),)
+    __table_args__ = (
+        UniqueConstraint("element", "fixture", name="uq_player_fixture"),
+        Index(
+            "ix_player_gameweek_stats_season_element_round",
+            "season",
+            "element",
+            "round",
+        ),
+    )
 
 
 class FixtureRow(Base):
@@ -105,12 +118,75 @@ class FixtureRow(Base):
     )
 
 
+class ForecastRunRow(Base):
+    """One forecast run: a model version's predictions for one gameweek."""
+
+    __tablename__ = "forecast_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    model_name = Column(String, nullable=False)
+    model_version = Column(String, nullable=False)
+    gameweek = Column(Integer, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "model_name", "model_version", "gameweek", name="uq_forecast_run"
+        ),
+    )
+
+
 class ForecastRow(Base):
     __tablename__ = "forecasts"
 
+    run_id = Column(
+        Integer, ForeignKey("forecast_runs.id", ondelete="CASCADE"), primary_key=True
+    )
     player_id = Column(Integer, primary_key=True)
     expected_points = Column(Float, nullable=False)
-    created_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Summaries of the points distribution; NULL for models without one
+    variance = Column(Float, nullable=True)
+    p_zero = Column(Float, nullable=True)
+    p_haul = Column(Float, nullable=True)
+
+    # Latest forecast per player: highest run_id first
+    __table_args__ = (Index("ix_forecasts_player_run", "player_id", "run_id"),)
+
+
+class ForecastDistributionRow(Base):
+    """A run's full points PMFs: one support grid and a float32 players x grid matrix.
+
+    ``player_ids`` (int32) and ``probs`` (float32, row-major) are little-endian
+    arrays; see ``fantasy_optimizer.db.forecasts.load_distributions``.
+    """
+
+    __tablename__ = "forecast_distributions"
+
+    run_id = Column(
+        Integer, ForeignKey("forecast_runs.id", ondelete="CASCADE"), primary_key=True
+    )
+    support_min = Column(Integer, nullable=False)
+    support_size = Column(Integer, nullable=False)
+    player_ids = Column(LargeBinary, nullable=False)
+    probs = Column(LargeBinary, nullable=False)
+
+
+class ForecastHorizonRow(Base):
+    """A run's expected points over upcoming rounds: a float32 players x rounds matrix.
+
+    Rounds run from ``first_round`` for ``n_rounds``; ``player_ids`` (int32) and
+    ``expected`` (float32, row-major) are little-endian arrays.
+    """
+
+    __tablename__ = "forecast_horizons"
+
+    run_id = Column(
+        Integer, ForeignKey("forecast_runs.id", ondelete="CASCADE"), primary_key=True
+    )
+    first_round = Column(Integer, nullable=False)
+    n_rounds = Column(Integer, nullable=False)
+    player_ids = Column(LargeBinary, nullable=False)
+    expected = Column(LargeBinary, nullable=False)
 
 
 class EnhancedStatRow(Base):
@@ -1,6 +1,10 @@
-from sqlalchemy.dialects.postgresql import insert
+from collections.abc import Iterator, Sequence
 
-from fantasy_optimizer.db.database import engine
+from sqlalchemy import Connection
+from sqlalchemy.dialects import postgresql, sqlite
+
+from fantasy_optimizer.db.bulk import copy_upsert
+from fantasy_optimizer.db.database import get_engine
 from fantasy_optimizer.db.models import (
     EnhancedStatRow,
     FixtureRow,
@@ -9,73 +13,129 @@ from fantasy_optimizer.db.models import (
     PlayerRow,
     TeamRow,
 )
+from fantasy_optimizer.metrics import record_rows
+
+# PostgreSQL's wire protocol numbers bind parameters with an Int16
+MAX_BIND_PARAMS = 65_535
+
+# Upper bound on rows per statement, so wide batches never build one huge SQL string
+MAX_ROWS_PER_STATEMENT = 1_000
+
+
+# Both dialects accept INSERT ... ON CONFLICT (...) DO UPDATE / DO NOTHING
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def upsert_insert(conn: Connection, model):
+    """INSERT construct with ``on_conflict_do_*`` for the connection's backend."""
+    try:
+        return _INSERTS[conn.dialect.name](model)
+    except KeyError:
+        raise NotImplementedError(
+            f"Upserts are not supported on {conn.dialect.name!r}"
+        ) from None
+
+
+def rows_per_statement(n_columns: int) -> int:
+    """Largest batch of ``n_columns``-wide rows that stays under the parameter limit."""
+    return max(1, min(MAX_ROWS_PER_STATEMENT, MAX_BIND_PARAMS // max(1, n_columns)))
+
+
+def _chunks(rows: Sequence[dict], size: int) -> Iterator[Sequence[dict]]:
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]
+
+
+def upsert_rows(
+    model,
+    rows: Sequence[dict],
+    conflict_cols: Sequence[str],
+    update_cols: Sequence[str] | None = None,
+    use_copy: bool = False,
+    conn: Connection | None = None,
+) -> int:
+    """Insert ``rows`` into ``model``'s table, updating on a ``conflict_cols`` clash.
+
+    Rows are sent in chunks sized from the column count, each as one executemany
+    (which SQLAlchemy turns into multi-row VALUES pages), all inside a single
+    transaction. ``update_cols`` defaults to every non-key column of the rows;
+    an empty list means conflicting rows are left untouched. ``use_copy`` streams
+    the rows through COPY instead, see ``fantasy_optimizer.db.bulk``; it is ignored
+    on SQLite, where executemany is already in-process. Pass ``conn`` to run inside
+    the caller's transaction.
+
+    Returns the number of rows written; an empty ``rows`` is a no-op.
+    """
+    if not rows:
+        return 0
+    if conn is None:
+        with get_engine().begin() as conn:
+            return upsert_rows(
+                model, rows, conflict_cols, update_cols, use_copy, conn=conn
+            )
+
+    columns = list(rows[0])
+    if update_cols is None:
+        update_cols = [c for c in columns if c not in conflict_cols]
+
+    if use_copy and conn.dialect.name == "postgresql":
+        written = copy_upsert(conn, model.__table__, rows, conflict_cols, update_cols)
+    else:
+        stmt = upsert_insert(conn, model)
+        if update_cols:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(conflict_cols),
+                set_={c: stmt.excluded[c] for c in update_cols},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_cols))
+
+        for chunk in _chunks(rows, rows_per_statement(len(columns))):
+            conn.execute(stmt, list(chunk))
+        written = len(rows)
+    record_rows(written)
+    return written
+
+
+def upsert_teams(teams: list[dict], use_copy: bool = False) -> int:
+    return upsert_rows(TeamRow, teams, ["id"], use_copy=use_copy)
+
+
+def upsert_players(players: list[dict], use_copy: bool = False) -> int:
+    return upsert_rows(PlayerRow, players, ["id"], use_copy=use_copy)
+
+
+def upsert_gameweek_stats(stats: list[dict], use_copy: bool = False) -> int:
+    """Upsert on (element, fixture) — one row per player per match.
+
+    ``use_copy`` streams the rows through COPY and merges them in one statement,
+    which is much faster for large batches.
+    """
+    return upsert_rows(
+        PlayerGameweekStatRow, stats, ["element", "fixture"], use_copy=use_copy
+    )
+
+
+def upsert_forecasts(
+    forecasts: list[dict], use_copy: bool = False, conn: Connection | None = None
+) -> int:
+    """Upsert on (run_id, player_id); see ``db.forecasts.save_forecast_run``."""
+    return upsert_rows(
+        ForecastRow,
+        forecasts,
+        ["run_id", "player_id"],
+        use_copy=use_copy,
+        conn=conn,
+    )
 
 
-def upsert_teams(teams: list[dict]):
-    with engine.begin() as conn:
-        stmt = insert(TeamRow).values(teams)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["id"],
-            set_={c: stmt.excluded[c] for c in teams[0] if c != "id"},
-        )
-        conn.execute(stmt)
-
-
-def upsert_players(players: list[dict]):
-    with engine.begin() as conn:
-        stmt = insert(PlayerRow).values(players)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["id"],
-            set_={c: stmt.excluded[c] for c in players[0] if c != "id"},
-        )
-        conn.execute(stmt)
-
-
-def upsert_gameweek_stats(stats: list[dict]):
-    """Upsert on (element, fixture) — one row per player per match."""
-    with engine.begin() as conn:
-        stmt = insert(PlayerGameweekStatRow).values(stats)
-        stmt = stmt.on_conflict_do_update(
-            constraint="uq_player_fixture",
-            set_={
-                c: stmt.excluded[c] for c in stats[0] if c not in ("element", "fixture")
-            },
-        )
-        conn.execute(stmt)
-
-
-def upsert_forecasts(forecasts: list[dict]):
-    """Upsert on player_id — replaces the forecast each run."""
-    with engine.begin() as conn:
-        stmt = insert(ForecastRow).values(forecasts)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["player_id"],
-            set_={"expected_points": stmt.excluded.expected_points},
-        )
-        conn.execute(stmt)
-
-
-def upsert_enhanced_stats(stats: list[dict]):
+def upsert_enhanced_stats(stats: list[dict], use_copy: bool = False) -> int:
     """Upsert on name — replaces all stats each weekly import."""
-    with engine.begin() as conn:
-        stmt = insert(EnhancedStatRow).values(stats)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["name"],
-            set_={c: stmt.excluded[c] for c in stats[0] if c != "name"},
-        )
-        conn.execute(stmt)
+    return upsert_rows(EnhancedStatRow, stats, ["name"], use_copy=use_copy)
 
 
-def upsert_fixtures(fixtures: list[dict]):
+def upsert_fixtures(fixtures: list[dict], use_copy: bool = False) -> int:
     """Upsert on (season, round, team, was_home)."""
-    with engine.begin() as conn:
-        stmt = insert(FixtureRow).values(fixtures)
-        stmt = stmt.on_conflict_do_update(
-            constraint="uq_fixture_team_round",
-            set_={
-                c: stmt.excluded[c]
-                for c in fixtures[0]
-                if c not in ("season", "round", "team", "was_home")
-            },
-        )
-        conn.execute(stmt)
+    return upsert_rows(
+        FixtureRow, fixtures, ["season", "round", "team", "was_home"], use_copy=use_copy
+    )
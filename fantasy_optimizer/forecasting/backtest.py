@@ -0,0 +1,239 @@
+"""Walk-forward backtests of the simulation forecast against realised points.
+
+For every round, the forecast is built from the rows of earlier rounds only and
+scored on the round's own rows. Each match is scored separately, so a double
+gameweek contributes two outcomes. The scores are:
+
+- MAE of the expected points,
+- log-loss of the PMF at the realised score,
+- Spearman rank correlation of expected and realised points.
+
+The season is read once. Walking it forward with ``DecayedPointStats`` gives
+each round's features: the decayed value counts, the zero boosts and the
+position pools. These are cached per decay and zero window, so scoring
+another mix or smoothing setting only rebuilds the PMFs.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+
+from fantasy_optimizer.forecasting.incremental import ZERO_WINDOW, DecayedPointStats
+from fantasy_optimizer.forecasting.pmf import (
+    PmfBatch,
+    PoolPmf,
+    PoolPmfCache,
+    counts_points_pmf,
+    player_positions,
+    zero_boosts,
+)
+
+# Row order a Backtest keeps the season in
+ROUND_ORDER = ["round", "element", "fixture"]
+
+# Probability floor for log-loss, so a score outside a PMF's support is finite
+LOG_LOSS_FLOOR = 1e-9
+
+
+@dataclass(frozen=True)
+class RoundFeatures:
+    """What a forecast for ``round`` may know: the rows of earlier rounds."""
+
+    round: int
+    player_ids: np.ndarray  # players with history, ascending
+    value_min: int
+    counts: np.ndarray  # players x values decayed counts, from value_min
+    zero_boost: np.ndarray  # per player
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    rounds: pd.DataFrame  # one row per scored round
+
+    @property
+    def mae(self) -> float:
+        return float(np.average(self.rounds["mae"], weights=self.rounds["n"]))
+
+    @property
+    def log_loss(self) -> float:
+        return float(np.average(self.rounds["log_loss"], weights=self.rounds["n"]))
+
+    @property
+    def spearman(self) -> float:
+        """Mean of the per-round rank correlations."""
+        return float(self.rounds["spearman"].mean())
+
+    def summary(self) -> dict:
+        return {
+            "rounds": len(self.rounds),
+            "n": int(self.rounds["n"].sum()),
+            "mae": self.mae,
+            "log_loss": self.log_loss,
+            "spearman": self.spearman,
+        }
+
+
+def score_round(
+    pmfs: PmfBatch, rows: np.ndarray, actual: np.ndarray
+) -> dict[str, float]:
+    """Scores of ``pmfs`` rows ``rows`` against the realised points ``actual``."""
+    expected = pmfs.expected[rows]
+    col = actual - pmfs.grid[0]
+    on_grid = (col >= 0) & (col < len(pmfs.grid))
+    p = np.full(len(rows), LOG_LOSS_FLOOR)
+    p[on_grid] = np.maximum(pmfs.probs[rows[on_grid], col[on_grid]], LOG_LOSS_FLOOR)
+    both_vary = np.ptp(expected) > 0 and np.ptp(actual) > 0
+    return {
+        "n": len(rows),
+        "mae": float(np.abs(expected - actual).mean()),
+        "log_loss": float(-np.log(p).mean()),
+        "spearman": float(spearmanr(expected, actual)[0]) if both_vary else np.nan,
+    }
+
+
+def is_sorted(rows: pd.DataFrame, columns: list[str]) -> bool:
+    """Whether ``rows`` is in lexicographic order of ``columns``, without copying it."""
+    if len(rows) < 2:
+        return True
+    ahead = np.zeros(len(rows) - 1, dtype=bool)  # decided: strictly increasing
+    for col in columns:
+        values = rows[col].to_numpy()
+        if (~ahead & (values[1:] < values[:-1])).any():
+            return False
+        ahead |= values[1:] > values[:-1]
+    return True
+
+
+class Backtest:
+    """Walk-forward evaluation over one season of ``player_gameweek_stats`` rows.
+
+    ``rows`` needs ``element``, ``round`` and ``total_points``, plus ``fixture``
+    and a ``position``/``element_type`` column if present. It is kept in
+    ``ROUND_ORDER``, so each round is a contiguous slice and the rows before a
+    round are a prefix. Rows already in that order are used as they are, not
+    copied. Rounds from ``first_round`` on are scored; earlier ones only provide
+    history.
+    """
+
+    def __init__(
+        self,
+        rows: pd.DataFrame,
+        first_round: int = 2,
+        pool_cache: PoolPmfCache | None = None,
+    ):
+        self.order = [c for c in ROUND_ORDER if c in rows.columns]
+        if not is_sorted(rows, self.order):
+            rows = rows.sort_values(self.order, kind="stable")
+        self.rows = rows
+        self.position_col = next(
+            (c for c in ["position", "element_type"] if c in rows.columns), None
+        )
+        self.first_round = first_round
+        # Pools are keyed by the target round of this one season, so the default
+        # cache need not hash their points
+        self.pool_cache = (
+            pool_cache if pool_cache is not None else PoolPmfCache(verify=False)
+        )
+        rounds = rows["round"].to_numpy()
+        starts = np.flatnonzero(np.r_[True, rounds[1:] != rounds[:-1]])
+        ends = np.r_[starts[1:], len(rounds)]
+        # Round -> (first row, one past its last row)
+        self._spans = {int(rounds[a]): (int(a), int(b)) for a, b in zip(starts, ends)}
+        self._features: dict[tuple[float, int], list[RoundFeatures]] = {}
+        self._pools: dict[int, list[PoolPmf | None] | None] = {}
+
+    def round_rows(self, round_: int) -> pd.DataFrame:
+        start, end = self._spans[round_]
+        return self.rows.iloc[start:end]
+
+    def features(
+        self, decay: float = 0.9, zero_window: int = ZERO_WINDOW
+    ) -> list[RoundFeatures]:
+        """Each scored round's features, built in one pass and cached."""
+        key = (decay, zero_window)
+        if key not in self._features:
+            stats = DecayedPointStats(season=0, decay=decay, window=zero_window)
+            out = []
+            for r in self._spans:
+                if r >= self.first_round and len(stats):
+                    out.append(
+                        RoundFeatures(
+                            r,
+                            stats.player_ids.copy(),
+                            stats.value_min,
+                            stats.counts.copy(),
+                            zero_boosts(stats.recent_points(), window=zero_window),
+                        )
+                    )
+                stats.fold(self.round_rows(r))
+            self._features[key] = out
+        return self._features[key]
+
+    def clear_features(self) -> None:
+        """Drop the cached round features; position pools are kept."""
+        self._features.clear()
+
+    def pools(self, features: RoundFeatures) -> list[PoolPmf | None] | None:
+        """Position-pool PMFs for the players in ``features``, as the forecast build."""
+        if self.position_col is None:
+            return None
+        if features.round not in self._pools:
+            before = self.rows.iloc[: self._spans[features.round][0]]
+            # The forecast build decays pool points in element, round, fixture order
+            keys = ["element", "round"] + (["fixture"] if "fixture" in before else [])
+            by_element = np.lexsort([before[c].to_numpy() for c in reversed(keys)])
+            points = before["total_points"].to_numpy(dtype=np.int64)[by_element]
+            position = before[self.position_col].to_numpy()[by_element]
+            by_pos = {
+                pos: self.pool_cache.get(pos, features.round, points[position == pos])
+                for pos in pd.unique(position[~pd.isna(position)])
+            }
+            positions = player_positions(before, self.position_col).reindex(
+                features.player_ids
+            )
+            self._pools[features.round] = [by_pos.get(p) for p in positions]
+        return self._pools[features.round]
+
+    def pmfs(
+        self,
+        features: RoundFeatures,
+        mix_with_pool: float = 0.20,
+        smooth_sigma: float = 0.4,
+    ) -> PmfBatch:
+        return counts_points_pmf(
+            features.counts,
+            features.value_min,
+            self.pools(features),
+            mix_with_pool=mix_with_pool,
+            zero_boost=features.zero_boost,
+            smooth_sigma=smooth_sigma,
+        )
+
+    def run(
+        self,
+        decay: float = 0.9,
+        mix_with_pool: float = 0.20,
+        smooth_sigma: float = 0.4,
+        zero_window: int = ZERO_WINDOW,
+    ) -> BacktestResult:
+        """Score the forecast with these parameters on every round.
+
+        Players without earlier rows have no forecast and are left out of their
+        first round; a round with none of its players forecast is not scored.
+        """
+        records = []
+        for features in self.features(decay, zero_window):
+            target = self.round_rows(features.round)
+            elements = target["element"].to_numpy(dtype=np.int64)
+            idx = np.searchsorted(features.player_ids, elements)
+            idx = np.minimum(idx, len(features.player_ids) - 1)
+            known = features.player_ids[idx] == elements
+            if not known.any():
+                continue
+            pmfs = self.pmfs(features, mix_with_pool, smooth_sigma)
+            actual = target["total_points"].to_numpy(dtype=np.int64)[known]
+            scores = score_round(pmfs, idx[known], actual)
+            records.append({"round": features.round, **scores})
+        return BacktestResult(pd.DataFrame.from_records(records))
@@ -0,0 +1,92 @@
+"""Expected points over the next few rounds, from a per-match forecast and fixtures.
+
+A forecast gives each player's expected points for one match. Over a horizon, a
+round's expectation is that value times the number of matches the player's team
+plays in the round: 0 in a blank gameweek, 2 in a double. The per-match forecast is
+built once, and the players x rounds matrix is then a single gather from a
+teams x rounds fixture-weight matrix. A longer horizon costs one more column,
+not another forecast build.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class HorizonForecast:
+    player_ids: np.ndarray  # int, one per row
+    rounds: np.ndarray  # consecutive round numbers, one per column
+    expected: np.ndarray  # players x rounds expected points
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    @property
+    def total(self) -> np.ndarray:
+        """Each player's expected points summed over the horizon."""
+        return self.expected.sum(axis=1)
+
+    def frame(self) -> pd.DataFrame:
+        """Players x rounds as a DataFrame indexed by player id."""
+        return pd.DataFrame(
+            self.expected,
+            index=pd.Index(self.player_ids, name="player_id"),
+            columns=pd.Index(self.rounds, name="round"),
+        )
+
+
+def horizon_rounds(next_round: int, horizon: int, total_rounds: int) -> np.ndarray:
+    """Up to ``horizon`` rounds from ``next_round``, stopping at the season's end."""
+    return np.arange(next_round, min(next_round + horizon - 1, total_rounds) + 1)
+
+
+def fixture_weights(
+    fixtures: pd.DataFrame,
+    teams: np.ndarray,
+    rounds: np.ndarray,
+    weight_col: str | None = None,
+) -> np.ndarray:
+    """Teams x rounds sum of fixture weights; by default each match counts 1.
+
+    ``fixtures`` has one row per team per match (``team``, ``round``), as in the
+    ``fixtures`` table. Fixtures outside ``teams`` or ``rounds`` are ignored.
+    """
+    team_idx = pd.Index(teams).get_indexer(fixtures["team"])
+    round_idx = fixtures["round"].to_numpy(dtype=float) - rounds[0]
+    keep = (team_idx >= 0) & (round_idx >= 0) & (round_idx < len(rounds))
+    weights = (
+        np.ones(len(fixtures))
+        if weight_col is None
+        else fixtures[weight_col].to_numpy(dtype=float)
+    )
+    out = np.zeros((len(teams), len(rounds)))
+    np.add.at(out, (team_idx[keep], round_idx[keep].astype(np.int64)), weights[keep])
+    return out
+
+
+def build_horizon(
+    player_ids: np.ndarray,
+    player_teams: np.ndarray,
+    per_match: np.ndarray,
+    fixtures: pd.DataFrame,
+    rounds: np.ndarray,
+    weights: Callable[..., np.ndarray] = fixture_weights,
+) -> HorizonForecast:
+    """Players x ``rounds`` expected points from each player's per-match forecast.
+
+    A player whose team has no fixture in a round (or who has no team) gets 0.
+    ``weights(fixtures, teams, rounds)`` gives the teams x rounds matrix the
+    forecast is scaled by; by default each match counts 1 (see
+    ``strength.StrengthModel.difficulty`` for opponent-adjusted weights).
+    """
+    rounds = np.asarray(rounds, dtype=np.int64)
+    player_teams = np.asarray(player_teams)
+    teams = pd.unique(player_teams[~pd.isna(player_teams)])
+    # A trailing all-zero row for players without a team
+    matrix = np.vstack([weights(fixtures, teams, rounds), np.zeros((1, len(rounds)))])
+    team_idx = pd.Index(teams).get_indexer(player_teams)
+    expected = np.asarray(per_match, dtype=float)[:, None] * matrix[team_idx]
+    return HorizonForecast(np.asarray(player_ids, dtype=np.int64), rounds, expected)
@@ -0,0 +1,210 @@
+"""Per-player decayed sufficient statistics, updated one round at a time.
+
+A player's empirical PMF weights each point ``decay ** age`` and normalises. When
+``k`` new points arrive, every old weight ages by ``k``: the stored counts are
+scaled by ``decay ** k`` and the new points added with weights
+``decay ** (k - 1), ..., 1``. So the weighted count of each points value, plus
+the last few points for the zero boost, is all a forecast needs. Folding in a
+round touches only that round's rows. ``counts_points_pmf`` turns the counts into
+the same PMFs a full rebuild would give.
+
+A round can land in parts (its matches span several days) or be corrected after
+it was folded in. The state therefore also keeps a snapshot from before its last
+round. When rows of that round come again, the state goes back to the snapshot
+and folds the whole round anew. Corrections to earlier rounds need a rebuild.
+
+The state is saved as one ``.npz`` file together with the season, the last
+round folded in and the decay it was built with.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from fantasy_optimizer.forecasting.pmf import (
+    PmfBatch,
+    PoolPmf,
+    counts_points_pmf,
+    zero_boosts,
+)
+
+ZERO_WINDOW = 6  # points kept per player for zero_boosts
+
+# What a snapshot holds; the state before its last round was folded in
+_STATE_FIELDS = (
+    "last_round",
+    "player_ids",
+    "value_min",
+    "counts",
+    "recent",
+    "n_recent",
+)
+
+
+class DecayedPointStats:
+    """Decay-weighted counts per points value for every player seen so far.
+
+    ``counts[i, j]`` is player ``player_ids[i]``'s weighted count of
+    ``value_min + j`` points, and ``recent[i]`` holds their last ``window`` points
+    (newest last, ``n_recent[i]`` of them valid).
+    """
+
+    def __init__(
+        self,
+        season: int,
+        decay: float = 0.9,
+        window: int = ZERO_WINDOW,
+    ):
+        self.season = season
+        self.decay = decay
+        self.window = window
+        self.last_round = 0
+        self.player_ids = np.zeros(0, dtype=np.int64)
+        self.value_min = 0
+        self.counts = np.zeros((0, 1))
+        self.recent = np.zeros((0, window), dtype=np.int64)
+        self.n_recent = np.zeros(0, dtype=np.int64)
+        self._base: dict | None = None
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def _grow(self, new_ids: np.ndarray, values: np.ndarray) -> None:
+        """Add rows for unseen players and columns for unseen points values."""
+        unseen = np.setdiff1d(new_ids, self.player_ids)
+        if unseen.size:
+            ids = np.concatenate([self.player_ids, unseen])
+            order = np.argsort(ids, kind="stable")
+            pad = len(unseen)
+            self.player_ids = ids[order]
+            self.counts = np.vstack(
+                [self.counts, np.zeros((pad, self.counts.shape[1]))]
+            )[order]
+            self.recent = np.vstack(
+                [self.recent, np.zeros((pad, self.window), dtype=np.int64)]
+            )[order]
+            self.n_recent = np.concatenate(
+                [self.n_recent, np.zeros(pad, dtype=np.int64)]
+            )[order]
+
+        if not values.size:
+            return
+        value_max = self.value_min + self.counts.shape[1] - 1
+        below = max(self.value_min - int(values.min()), 0)
+        above = max(int(values.max()) - value_max, 0)
+        if below or above:
+            self.counts = np.pad(self.counts, ((0, 0), (below, above)))
+            self.value_min -= below
+
+    def fold(self, rows: pd.DataFrame) -> int:
+        """Fold in ``rows`` (``element``, ``round``, ``total_points``) from ``last_round`` on.
+
+        Rows of ``last_round`` replace the ones folded in before, so pass that
+        round whole. Rows of earlier rounds are ignored. Returns the number of rows
+        folded in.
+        """
+        if self._base is not None and (rows["round"] == self.last_round).any():
+            self._restore()
+        new = rows[rows["round"] > self.last_round]
+        if new.empty:
+            return 0
+        latest = int(new["round"].max())
+        self._fold(new[new["round"] < latest])
+        self._base = self._snapshot()
+        self._fold(new[new["round"] == latest])
+        self.last_round = latest
+        return len(new)
+
+    def _snapshot(self) -> dict:
+        fields = {name: getattr(self, name) for name in _STATE_FIELDS}
+        return {
+            k: v.copy() if isinstance(v, np.ndarray) else v for k, v in fields.items()
+        }
+
+    def _restore(self) -> None:
+        assert self._base is not None
+        for name in _STATE_FIELDS:
+            setattr(self, name, self._base[name])
+        self._base = None
+
+    def _fold(self, new: pd.DataFrame) -> None:
+        if new.empty:
+            return
+        sort_cols = ["element", "round"] + (["fixture"] if "fixture" in new else [])
+        new = new.sort_values(sort_cols, kind="stable")
+        elements = new["element"].to_numpy(dtype=np.int64)
+        values = new["total_points"].to_numpy(dtype=np.int64)
+        self._grow(np.unique(elements), values)
+
+        player = np.searchsorted(self.player_ids, elements)
+        touched, starts, k = np.unique(player, return_index=True, return_counts=True)
+        # Position of each row from the end of its player's new rows: newest is 0
+        age = np.repeat(starts + k, k) - 1 - np.arange(len(player))
+        weights = self.decay ** age.astype(float)
+
+        self.counts[touched] *= (self.decay ** k.astype(float))[:, None]
+        np.add.at(self.counts, (player, values - self.value_min), weights)
+
+        # Append each player's new points to their window and keep the newest
+        row = np.repeat(np.arange(len(touched)), k)
+        combined = np.zeros((len(touched), self.window + k.max()), dtype=np.int64)
+        combined[:, : self.window] = self.recent[touched]
+        combined[row, self.window + np.arange(len(player)) - np.repeat(starts, k)] = (
+            values
+        )
+        keep = k[:, None] + np.arange(self.window)
+        self.recent[touched] = np.take_along_axis(combined, keep, axis=1)
+        self.n_recent[touched] = np.minimum(self.n_recent[touched] + k, self.window)
+
+        self.last_round = int(new["round"].max())
+
+    def recent_points(self) -> list[np.ndarray]:
+        return [r[self.window - n :] for r, n in zip(self.recent, self.n_recent)]
+
+    def pmfs(
+        self,
+        pools: list[np.ndarray | PoolPmf | None] | None = None,
+        mix_with_pool: float = 0.20,
+        smooth_sigma: float = 0.4,
+    ) -> PmfBatch:
+        """Every player's points PMF, as ``batch_points_pmf`` on their full history."""
+        return counts_points_pmf(
+            self.counts,
+            self.value_min,
+            pools,
+            mix_with_pool=mix_with_pool,
+            zero_boost=zero_boosts(self.recent_points(), window=self.window),
+            smooth_sigma=smooth_sigma,
+        )
+
+    def save(self, path: Path) -> None:
+        np.savez(
+            path,
+            season=self.season,
+            decay=self.decay,
+            window=self.window,
+            last_round=self.last_round,
+            value_min=self.value_min,
+            player_ids=self.player_ids,
+            counts=self.counts,
+            recent=self.recent,
+            n_recent=self.n_recent,
+            **{f"base_{k}": v for k, v in (self._base or {}).items()},
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "DecayedPointStats":
+        with np.load(path) as data:
+            stats = cls(int(data["season"]), float(data["decay"]), int(data["window"]))
+            stats.last_round = int(data["last_round"])
+            stats.value_min = int(data["value_min"])
+            stats.player_ids = data["player_ids"]
+            stats.counts = data["counts"]
+            stats.recent = data["recent"]
+            stats.n_recent = data["n_recent"]
+            if "base_last_round" in data:
+                stats._base = {name: data[f"base_{name}"] for name in _STATE_FIELDS}
+                stats._base["last_round"] = int(stats._base["last_round"])
+                stats._base["value_min"] = int(stats._base["value_min"])
+        return stats
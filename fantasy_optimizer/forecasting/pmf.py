@@ -0,0 +1,431 @@
+"""Points PMFs for the whole league in a handful of array operations.
+
+``batch_points_pmf`` is the vectorised counterpart of
+``scripts/build_forecasts.build_points_pmf``. Every player's decayed history is
+scattered into one players x support matrix on a grid shared by the league, and
+mixing, zero inflation and smoothing then run on all rows at once.
+
+Each row remembers the support its per-player PMF would have had (``lo``/``hi``):
+the per-player smoothing replicates the edge values of that support (scipy's
+``mode="nearest"``), so the batch smoothing clamps to the same bounds and the
+results agree to floating-point rounding.
+"""
+
+import hashlib
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Geometric prior used when a player has no position pool
+DEFAULT_POOL_MAX = 20
+DEFAULT_POOL_RATIO = 0.20
+
+# scipy.ndimage.gaussian_filter1d's default kernel radius, in sigmas
+GAUSSIAN_TRUNCATE = 4.0
+
+# Decay applied across a position pool's points, oldest first
+POOL_DECAY = 0.995
+
+# A gameweek score of at least this many points counts as a haul
+HAUL_POINTS = 10
+
+
+@dataclass(frozen=True)
+class PmfBatch:
+    grid: np.ndarray  # shared integer support, ascending
+    probs: np.ndarray  # players x len(grid); zero outside each row's support
+    lo: np.ndarray  # per-row index of the first support point in ``grid``
+    hi: np.ndarray  # per-row index of the last support point in ``grid``
+
+    @property
+    def expected(self) -> np.ndarray:
+        return self.probs @ self.grid
+
+    def __len__(self) -> int:
+        return len(self.probs)
+
+    def row(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        """Player ``i``'s PMF on its own support, as ``build_points_pmf`` returns it."""
+        sl = slice(self.lo[i], self.hi[i] + 1)
+        return self.grid[sl], self.probs[i, sl]
+
+
+@dataclass(frozen=True)
+class PointsDistributions:
+    """Points PMFs for a set of players on one shared support grid.
+
+    This is what a forecast run stores (``db.forecasts.save_forecast_run``), where
+    ``probs`` is written as float32; loaded distributions therefore hold float32
+    rows. The summaries are always computed in float64.
+    """
+
+    player_ids: np.ndarray  # int, one per row
+    grid: np.ndarray  # shared integer support, ascending and contiguous
+    probs: np.ndarray  # players x len(grid)
+
+    @classmethod
+    def from_batch(cls, player_ids: np.ndarray, batch: PmfBatch):
+        if len(player_ids) != len(batch):
+            raise ValueError(f"Got {len(player_ids)} ids for {len(batch)} PMFs")
+        return cls(
+            np.asarray(player_ids, dtype=np.int64),
+            batch.grid.astype(np.int64),
+            batch.probs,
+        )
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    @property
+    def expected(self) -> np.ndarray:
+        return self.probs.astype(float) @ self.grid
+
+    @property
+    def variance(self) -> np.ndarray:
+        probs = self.probs.astype(float)
+        mean = probs @ self.grid
+        return np.clip(probs @ self.grid.astype(float) ** 2 - mean**2, 0.0, None)
+
+    @property
+    def p_zero(self) -> np.ndarray:
+        zero = np.flatnonzero(self.grid == 0)
+        if not zero.size:
+            return np.zeros(len(self))
+        return self.probs[:, zero[0]].astype(float)
+
+    def p_at_least(self, points: int) -> np.ndarray:
+        return self.probs[:, self.grid >= points].astype(float).sum(axis=1)
+
+    def summary(self) -> pd.DataFrame:
+        """One row per player: expected points, variance, P(0) and P(haul)."""
+        return pd.DataFrame(
+            {
+                "player_id": self.player_ids,
+                "expected_points": self.expected,
+                "variance": self.variance,
+                "p_zero": self.p_zero,
+                "p_haul": self.p_at_least(HAUL_POINTS),
+            }
+        )
+
+
+@dataclass(frozen=True)
+class PoolPmf:
+    """A position pool's decayed PMF on its own support."""
+
+    support: np.ndarray
+    probs: np.ndarray
+
+
+def pool_pmf(points: np.ndarray, decay: float = POOL_DECAY) -> PoolPmf:
+    points = np.asarray(points, dtype=np.int64)
+    support, inverse = np.unique(points, return_inverse=True)
+    w = decay ** np.arange(len(points))[::-1]
+    w = w / w.sum()
+    probs = np.bincount(inverse, weights=w, minlength=len(support))
+    return PoolPmf(support, probs / probs.sum())
+
+
+class PoolPmfCache:
+    """Pool PMFs memoised per (position, round).
+
+    A pool holds thousands of points but is shared by every player in the position,
+    so it is built once per position and round. By default each lookup hashes the
+    points and rebuilds an entry whose content changed, so a cache reused across
+    frames never serves another frame's pool. A cache owned by one fixed frame can
+    pass ``verify=False`` to skip the hash, making a lookup a dict access.
+    """
+
+    def __init__(self, decay: float = POOL_DECAY, verify: bool = True):
+        self.decay = decay
+        self.verify = verify
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[tuple, tuple[bytes | None, PoolPmf]] = {}
+
+    @staticmethod
+    def _digest(points: np.ndarray) -> bytes:
+        return hashlib.blake2b(points.tobytes(), digest_size=16).digest()
+
+    def get(self, position: Hashable, round_: int, points: np.ndarray) -> PoolPmf:
+        key = (position, round_)
+        entry = self._entries.get(key)
+        if entry is not None and not self.verify:
+            self.hits += 1
+            return entry[1]
+        points = np.ascontiguousarray(points, dtype=np.int64)
+        digest = self._digest(points) if self.verify else None
+        if entry is not None and entry[0] == digest:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        pmf = pool_pmf(points, self.decay)
+        self._entries[key] = (digest, pmf)
+        return pmf
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def player_positions(df: pd.DataFrame, position_col: str) -> pd.Series:
+    """Each player's most frequent position, ties to the lowest, by ``element``."""
+    counts = df.groupby(["element", position_col]).size().rename("n").reset_index()
+    counts = counts.sort_values(
+        ["element", "n", position_col], ascending=[True, False, True]
+    )
+    return counts.drop_duplicates("element").set_index("element")[position_col]
+
+
+def _decayed_counts(
+    histories: Sequence[np.ndarray], decay: float, grid_min: int, width: int
+) -> np.ndarray:
+    """Rows of decay-weighted value frequencies; an empty history is a spike at 0."""
+    lengths = np.fromiter((len(h) for h in histories), dtype=np.int64)
+    rows = np.repeat(np.arange(len(histories)), lengths)
+    if rows.size:
+        values = np.concatenate([np.asarray(h, dtype=np.int64) for h in histories])
+        # Position from the end of each history: the newest point has age 0
+        ends = np.cumsum(lengths)
+        age = np.repeat(ends, lengths) - 1 - np.arange(rows.size)
+        w = decay ** age.astype(float)
+        w /= np.bincount(rows, weights=w, minlength=len(histories))[rows]
+    else:
+        values = np.zeros(0, dtype=np.int64)
+        w = np.zeros(0)
+
+    counts = np.bincount(
+        rows * width + (values - grid_min),
+        weights=w,
+        minlength=len(histories) * width,
+    ).reshape(len(histories), width)
+    counts[lengths == 0, -grid_min] = 1.0
+    return counts / counts.sum(axis=1, keepdims=True)
+
+
+def _default_pool(grid_min: int, width: int) -> np.ndarray:
+    support = np.arange(0, DEFAULT_POOL_MAX + 1)
+    probs = (1 - DEFAULT_POOL_RATIO) * (DEFAULT_POOL_RATIO**support)
+    out = np.zeros(width)
+    out[support - grid_min] = probs / probs.sum()
+    return out
+
+
+def _gaussian_weights(sigma: float) -> tuple[np.ndarray, np.ndarray]:
+    radius = int(GAUSSIAN_TRUNCATE * sigma + 0.5)
+    offsets = np.arange(-radius, radius + 1)
+    w = np.exp(-0.5 / (sigma * sigma) * offsets**2)
+    return offsets, w / w.sum()
+
+
+def _shift_left(probs: np.ndarray, rows: np.ndarray, by: np.ndarray) -> None:
+    """Move each of ``rows`` ``by`` columns towards the start of the grid."""
+    cols = np.arange(probs.shape[1])
+    src = np.clip(cols[None, :] + by[:, None], 0, probs.shape[1] - 1)
+    moved = np.take_along_axis(probs[rows], src, axis=1)
+    moved[cols[None, :] + by[:, None] >= probs.shape[1]] = 0.0
+    probs[rows] = moved
+
+
+def zero_boosts(
+    histories: Sequence[np.ndarray],
+    window: int = 6,
+    decay: float = 0.8,
+    scale: float = 0.5,
+    cap: float = 0.06,
+) -> np.ndarray:
+    """Extra P(0) per player from the decay-weighted share of recent blanks."""
+    out = np.zeros(len(histories))
+    w_full = decay ** np.arange(window)[::-1]
+    recent = np.zeros((len(histories), window))
+    mask = np.zeros((len(histories), window), dtype=bool)
+    for i, h in enumerate(histories):
+        tail = np.asarray(h)[-window:]
+        if tail.size:
+            recent[i, window - tail.size :] = tail == 0
+            mask[i, window - tail.size :] = True
+    # The per-player weights are decay ** arange(n)[::-1] for the last n <= window
+    # points, i.e. the newest ``n`` entries of ``w_full``
+    weights = np.where(mask, w_full, 0.0)
+    totals = weights.sum(axis=1)
+    has = totals > 0
+    out[has] = (weights[has] * recent[has]).sum(axis=1) / totals[has]
+    return np.clip(scale * out, 0.0, cap)
+
+
+def batch_points_pmf(
+    histories: Sequence[np.ndarray],
+    pools: Sequence[np.ndarray | PoolPmf | None] | None = None,
+    decay: float = 0.9,
+    mix_with_pool: float = 0.20,
+    zero_boost: float | np.ndarray = 0.0,
+    smooth_sigma: float = 0.4,
+    pool_decay: float = POOL_DECAY,
+) -> PmfBatch:
+    """Build every player's points PMF at once.
+
+    ``histories`` holds each player's points, oldest first. ``pools`` gives each
+    player's position pool: its points, a prebuilt ``PoolPmf`` (e.g. from a
+    ``PoolPmfCache``), or None for the geometric prior. Players sharing the same
+    object share one pool PMF. ``zero_boost`` is a scalar or one value per player.
+    Row ``i`` equals ``build_points_pmf(histories[i], decay, pools[i], ...)``.
+    """
+    hist_arrays = [np.asarray(h, dtype=np.int64) for h in histories]
+    h_lo = np.array([h.min() if len(h) else 0 for h in hist_arrays], dtype=np.int64)
+    h_hi = np.array([h.max() if len(h) else 0 for h in hist_arrays], dtype=np.int64)
+    return _build_batch(
+        lambda grid_min, width: _decayed_counts(hist_arrays, decay, grid_min, width),
+        h_lo,
+        h_hi,
+        pools,
+        mix_with_pool,
+        zero_boost,
+        smooth_sigma,
+        pool_decay,
+    )
+
+
+def counts_points_pmf(
+    counts: np.ndarray,
+    value_min: int,
+    pools: Sequence[np.ndarray | PoolPmf | None] | None = None,
+    mix_with_pool: float = 0.20,
+    zero_boost: float | np.ndarray = 0.0,
+    smooth_sigma: float = 0.4,
+    pool_decay: float = POOL_DECAY,
+) -> PmfBatch:
+    """``batch_points_pmf`` starting from decayed value counts instead of histories.
+
+    Row ``i`` of ``counts`` holds player ``i``'s decay-weighted count of each
+    points value from ``value_min`` upwards. Any positive scale works, since rows
+    are normalised. A row of zeros is a player without history. Given the counts
+    of a history, the result equals ``batch_points_pmf`` on that history.
+    """
+    counts = np.asarray(counts, dtype=float)
+    seen = counts > 0
+    has = seen.any(axis=1)
+    first = np.where(has, seen.argmax(axis=1), 0)
+    last = np.where(has, counts.shape[1] - 1 - seen[:, ::-1].argmax(axis=1), 0)
+    h_lo = np.where(has, value_min + first, 0)
+    h_hi = np.where(has, value_min + last, 0)
+
+    def empirical(grid_min: int, width: int) -> np.ndarray:
+        out = np.zeros((len(counts), width))
+        # Every positive count lies on the grid; columns beyond it are all zero
+        first_val = max(value_min, grid_min)
+        last_val = min(value_min + counts.shape[1], grid_min + width) - 1
+        src = counts[:, first_val - value_min : last_val - value_min + 1]
+        totals = counts.sum(axis=1, keepdims=True)
+        out[:, first_val - grid_min : last_val - grid_min + 1] = np.divide(
+            src, totals, out=np.zeros_like(src), where=totals > 0
+        )
+        out[~has, -grid_min] = 1.0
+        return out
+
+    return _build_batch(
+        empirical,
+        h_lo,
+        h_hi,
+        pools,
+        mix_with_pool,
+        zero_boost,
+        smooth_sigma,
+        pool_decay,
+    )
+
+
+def _build_batch(
+    empirical: Callable[[int, int], np.ndarray],
+    h_lo: np.ndarray,
+    h_hi: np.ndarray,
+    pools: Sequence[np.ndarray | PoolPmf | None] | None,
+    mix_with_pool: float,
+    zero_boost: float | np.ndarray,
+    smooth_sigma: float,
+    pool_decay: float,
+) -> PmfBatch:
+    """Mixing, zero inflation and smoothing shared by the two entry points.
+
+    ``empirical(grid_min, width)`` returns the players' normalised empirical PMFs
+    on the grid; ``h_lo``/``h_hi`` bound each player's empirical support.
+    """
+    n = len(h_lo)
+    if pools is None:
+        pools = [None] * n
+    if len(pools) != n:
+        raise ValueError(f"Got {len(pools)} pools for {n} histories")
+
+    # One PMF per distinct pool object
+    pool_ids: dict[int, int] = {}
+    unique_pools: list[PoolPmf] = []
+    pool_index = np.empty(n, dtype=np.int64)
+    for i, pool in enumerate(pools):
+        if pool is None or (not isinstance(pool, PoolPmf) and len(pool) == 0):
+            pool_index[i] = -1
+            continue
+        key = id(pool)
+        if key not in pool_ids:
+            pool_ids[key] = len(unique_pools)
+            unique_pools.append(
+                pool if isinstance(pool, PoolPmf) else pool_pmf(pool, pool_decay)
+            )
+        pool_index[i] = pool_ids[key]
+
+    # Trailing entry is the geometric prior, picked by pool_index -1
+    u_lo = np.array([p.support[0] for p in unique_pools] + [0], dtype=np.int64)
+    u_hi = np.array(
+        [p.support[-1] for p in unique_pools] + [DEFAULT_POOL_MAX], dtype=np.int64
+    )
+    lo_val = np.minimum(h_lo, u_lo[pool_index])
+    hi_val = np.maximum(h_hi, u_hi[pool_index])
+
+    grid_min = int(min(lo_val.min(initial=0), 0))
+    grid_max = int(max(hi_val.max(initial=0), 0))
+    width = grid_max - grid_min + 1
+    grid = np.arange(grid_min, grid_max + 1)
+
+    emp = empirical(grid_min, width)
+    # The grid only reaches the prior's support when some player uses it
+    pool_rows = np.zeros((len(unique_pools) + 1, width))
+    for row, pool in zip(pool_rows, unique_pools):
+        row[pool.support - grid_min] = pool.probs
+    if (pool_index < 0).any():
+        pool_rows[-1] = _default_pool(grid_min, width)
+    probs = (1 - mix_with_pool) * emp + mix_with_pool * pool_rows[pool_index]
+    probs /= probs.sum(axis=1, keepdims=True)
+    lo = lo_val - grid_min
+    hi = hi_val - grid_min
+
+    zb = np.broadcast_to(np.asarray(zero_boost, dtype=float), (n,))
+    boosted = np.flatnonzero(zb > 0)
+    if boosted.size:
+        zero = -grid_min
+        # build_points_pmf extends a support without 0 down to 0 and places the
+        # PMF at the start of the extended grid; mirror that shift
+        shifted = boosted[lo[boosted] > zero]
+        if shifted.size:
+            _shift_left(probs, shifted, lo[shifted] - zero)
+            lo[shifted] = zero
+        hi[boosted] = np.maximum(hi[boosted], zero)
+        sub = probs[boosted]
+        zb_b = zb[boosted]
+        non_zero = sub.sum(axis=1) - sub[:, zero]
+        # A PMF that is all zeros already has nothing to move
+        share = np.divide(zb_b, non_zero, out=np.zeros_like(zb_b), where=non_zero > 0)
+        sub -= share[:, None] * sub
+        sub[:, zero] = probs[boosted, zero] + zb_b
+        probs[boosted] = sub / sub.sum(axis=1, keepdims=True)
+
+    if smooth_sigma > 0:
+        cols = np.arange(width)
+        offsets, weights = _gaussian_weights(smooth_sigma)
+        smoothed = np.zeros_like(probs)
+        for k, wk in zip(offsets, weights):
+            src = np.clip(cols[None, :] + k, lo[:, None], hi[:, None])
+            smoothed += wk * np.take_along_axis(probs, src, axis=1)
+        smoothed[(cols[None, :] < lo[:, None]) | (cols[None, :] > hi[:, None])] = 0.0
+        np.clip(smoothed, 0, None, out=smoothed)
+        probs = smoothed / smoothed.sum(axis=1, keepdims=True)
+
+    return PmfBatch(grid, probs, lo, hi)
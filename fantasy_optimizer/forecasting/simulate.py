@@ -0,0 +1,297 @@
+"""Monte Carlo scoring of whole squads from the players' points PMFs.
+
+``SquadSimulator`` draws every player's gameweek points from a
+``PointsDistributions`` by inverse-CDF sampling. It does this for a batch of
+scenarios at a time, so memory stays bounded however many scenarios run. Each
+scenario is then scored for every squad at once. All squads in one ``simulate``
+call see the same sampled scenarios, so their differences are not sampling noise.
+
+A squad scores like the game does. The starting XI counts, and the captain's
+points count twice. Bench players come on in bench order for starters who did
+not play, provided the formation stays valid. If the captain did not play, the
+vice-captain's points are doubled instead. The PMFs carry no minutes, so a score
+of exactly 0 stands in for "did not play": appearing is worth points, so a 0 is
+almost always a missed game.
+
+Totals are integers, so each squad's results are kept as an exact histogram of
+its totals rather than one value per scenario.
+"""
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fantasy_optimizer.forecasting.pmf import PointsDistributions
+
+POSITIONS = ("GK", "DEF", "MID", "FWD")
+SQUAD_SIZE = {"GK": 2, "DEF": 5, "MID": 5, "FWD": 3}
+# Starting XI formation limits, in POSITIONS order
+MIN_STARTERS = np.array([1, 3, 2, 1])
+MAX_STARTERS = np.array([1, 5, 5, 3])
+
+
+@dataclass(frozen=True)
+class Squad:
+    starters: tuple[int, ...]  # 11 player ids
+    bench: tuple[int, ...]  # 4 player ids, in substitution order
+    captain: int
+    vice_captain: int
+
+    def __post_init__(self):
+        if len(self.starters) != 11 or len(self.bench) != 4:
+            raise ValueError(
+                f"A squad needs 11 starters and 4 on the bench, got"
+                f" {len(self.starters)} and {len(self.bench)}"
+            )
+        if len(set(self.starters) | set(self.bench)) != 15:
+            raise ValueError("A squad cannot list the same player twice")
+        if self.captain == self.vice_captain or not {
+            self.captain,
+            self.vice_captain,
+        } <= set(self.starters):
+            raise ValueError("Captain and vice-captain must be two different starters")
+
+    @property
+    def player_ids(self) -> tuple[int, ...]:
+        return self.starters + self.bench
+
+    @classmethod
+    def from_expected(
+        cls,
+        player_ids: Sequence[int],
+        positions: Sequence[str],
+        expected: Sequence[float],
+    ) -> "Squad":
+        """The highest-expected valid XI of a 15-player squad, captained by its top two.
+
+        The bench keeps the spare goalkeeper first, then outfielders by expected
+        points.
+        """
+        order = np.argsort(-np.asarray(expected, dtype=float), kind="stable")
+        ranked = [(int(player_ids[i]), positions[i]) for i in order]
+        counts = {p: sum(pos == p for _, pos in ranked) for p in POSITIONS}
+        if counts != SQUAD_SIZE:
+            raise ValueError(f"Squad positions {counts} differ from {SQUAD_SIZE}")
+
+        starters: list[tuple[int, str]] = []
+        # Formation minimums first, then the best of the rest up to the maximums
+        for pos, need in zip(POSITIONS, MIN_STARTERS):
+            starters += [p for p in ranked if p[1] == pos][:need]
+        limit = dict(zip(POSITIONS, MAX_STARTERS))
+        for player in ranked:
+            if len(starters) == 11:
+                break
+            taken = sum(pos == player[1] for _, pos in starters)
+            if player not in starters and taken < limit[player[1]]:
+                starters.append(player)
+
+        starter_set = set(starters)
+        bench = [p for p in ranked if p not in starter_set and p[1] == "GK"]
+        bench += [p for p in ranked if p not in starter_set and p[1] != "GK"]
+        xi = [pid for pid, pos in ranked if (pid, pos) in starter_set]
+        return cls(tuple(xi), tuple(pid for pid, _ in bench), xi[0], xi[1])
+
+
+@dataclass(frozen=True)
+class SquadOutcomes:
+    """Histograms of simulated totals, one row per squad.
+
+    ``counts[q, k]`` is how many scenarios gave squad ``q`` a total of
+    ``offset + k`` points.
+    """
+
+    counts: np.ndarray
+    offset: int
+    labels: tuple
+
+    @property
+    def n_scenarios(self) -> int:
+        return int(self.counts[0].sum()) if len(self.counts) else 0
+
+    @property
+    def points(self) -> np.ndarray:
+        return np.arange(self.offset, self.offset + self.counts.shape[1])
+
+    def mean(self) -> np.ndarray:
+        return self.counts @ self.points / self.n_scenarios
+
+    def std(self) -> np.ndarray:
+        second = self.counts @ self.points.astype(float) ** 2 / self.n_scenarios
+        return np.sqrt(np.clip(second - self.mean() ** 2, 0.0, None))
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Squads x ``qs`` totals: the smallest total with at least ``q`` of the mass."""
+        cdf = np.cumsum(self.counts, axis=1)
+        targets = np.ceil(np.asarray(qs, dtype=float) * self.n_scenarios)
+        targets = np.clip(targets, 1, None)
+        idx = np.array([np.searchsorted(row, targets) for row in cdf])
+        return self.points[idx]
+
+    def prob_at_least(self, total: int) -> np.ndarray:
+        return self.counts[:, self.points >= total].sum(axis=1) / self.n_scenarios
+
+    def summary(self, qs: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95)):
+        out = pd.DataFrame(
+            {"mean": self.mean(), "std": self.std()}, index=list(self.labels)
+        )
+        for q, col in zip(qs, self.quantiles(qs).T):
+            out[f"q{round(q * 100):02d}"] = col
+        return out
+
+
+class SquadSimulator:
+    """Samples gameweeks from ``distributions`` and scores squads on them.
+
+    ``positions`` maps player ids to "GK"/"DEF"/"MID"/"FWD". ``batch_size``
+    scenarios are held in memory at once, roughly
+    ``batch_size * (players + 15 * squads) * 10`` bytes. A given ``seed`` and
+    ``batch_size`` always reproduce the same results.
+    """
+
+    def __init__(
+        self,
+        distributions: PointsDistributions,
+        positions: Mapping[int, str],
+        seed: int | None = None,
+        batch_size: int = 4096,
+    ):
+        self.distributions = distributions
+        self.positions = positions
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self._row = {int(pid): i for i, pid in enumerate(distributions.player_ids)}
+
+    def _index(self, squads: Sequence[Squad]):
+        missing = {
+            pid
+            for s in squads
+            for pid in s.player_ids
+            if pid not in self._row or pid not in self.positions
+        }
+        if missing:
+            raise ValueError(
+                f"No distribution or position for players {sorted(missing)}"
+            )
+        union = sorted({pid for s in squads for pid in s.player_ids})
+        column = {pid: i for i, pid in enumerate(union)}
+        slots = np.array([[column[p] for p in s.player_ids] for s in squads])
+        pos = np.array(
+            [[POSITIONS.index(self.positions[p]) for p in s.player_ids] for s in squads]
+        )
+        for q, s in enumerate(squads):
+            xi = np.bincount(pos[q, :11], minlength=4)
+            if (xi < MIN_STARTERS).any() or (xi > MAX_STARTERS).any():
+                raise ValueError(f"Squad {q} starts an invalid formation {xi.tolist()}")
+        captain = np.array([s.starters.index(s.captain) for s in squads])
+        vice = np.array([s.starters.index(s.vice_captain) for s in squads])
+        return union, slots, pos, captain, vice
+
+    def _sample(self, cdf: np.ndarray, n: int) -> np.ndarray:
+        """``n`` scenarios x players of grid indices."""
+        u = self.rng.random((n, len(cdf)))
+        idx = np.zeros(u.shape, dtype=np.int16)
+        for k in range(cdf.shape[1] - 1):
+            idx += u > cdf[:, k]
+        return idx
+
+    def simulate(
+        self,
+        squads: Sequence[Squad],
+        n_scenarios: int = 100_000,
+        n_gameweeks: int = 1,
+        labels: Sequence | None = None,
+    ) -> SquadOutcomes:
+        """Each squad's total over ``n_gameweeks`` independent gameweeks.
+
+        With more than one gameweek every gameweek is drawn from the same PMFs.
+        """
+        if not squads:
+            raise ValueError("No squads to simulate")
+        union, slots, pos, captain, vice = self._index(squads)
+        dists = self.distributions
+        probs = dists.probs[[self._row[p] for p in union]].astype(float)
+        cdf = np.cumsum(probs / probs.sum(axis=1, keepdims=True), axis=1)
+        grid = dists.grid.astype(np.int16)
+
+        # 11 starters plus the captain's second share, at the grid's extremes
+        lo = n_gameweeks * 12 * min(int(dists.grid[0]), 0)
+        hi = n_gameweeks * 12 * max(int(dists.grid[-1]), 0)
+        width = hi - lo + 1
+        counts = np.zeros(len(squads) * width, dtype=np.int64)
+        rows = np.arange(len(squads))[:, None] * width
+
+        done = 0
+        while done < n_scenarios:
+            n = min(self.batch_size, n_scenarios - done)
+            totals = np.zeros((len(squads), n), dtype=np.int64)
+            for _ in range(n_gameweeks):
+                points = grid[self._sample(cdf, n)]
+                totals += _score(points, slots, pos, captain, vice)
+            counts += np.bincount((rows + totals - lo).ravel(), minlength=counts.size)
+            done += n
+
+        if labels is None:
+            labels = range(len(squads))
+        return SquadOutcomes(counts.reshape(len(squads), width), lo, tuple(labels))
+
+
+def _formation_table() -> np.ndarray:
+    """Whether an XI with ``d`` defenders and ``m`` midfielders is valid, at [d, m]."""
+    d, m = np.meshgrid(np.arange(6), np.arange(6), indexing="ij")
+    xi = np.stack([np.ones_like(d), d, m, 10 - d - m], axis=-1)
+    return ((xi >= MIN_STARTERS) & (xi <= MAX_STARTERS)).all(axis=-1)
+
+
+# An XI always has one goalkeeper, so (defenders, midfielders) fixes the formation;
+# it is tracked as the flat index into this table. One swap moves the index by at
+# most 6 either way, so the table is padded with invalid entries on both sides.
+_FORMATION_PAD = 6
+VALID_FORMATION = np.pad(_formation_table().ravel(), _FORMATION_PAD)
+_FORMATION_STEP = np.array([0, 6, 1, 0], dtype=np.int8)  # index change per position
+
+
+def _score(
+    points: np.ndarray,
+    slots: np.ndarray,
+    pos: np.ndarray,
+    captain: np.ndarray,
+    vice: np.ndarray,
+) -> np.ndarray:
+    """Squads x scenarios gameweek totals from scenarios x players ``points``."""
+    # 15 x squads x scenarios, starters first: each slot is one contiguous block
+    pts = np.ascontiguousarray(points[:, slots].transpose(2, 1, 0))
+    played = pts != 0
+    in_xi = np.zeros(pts.shape, dtype=bool)
+    in_xi[:11] = True
+    step = _FORMATION_STEP[pos].T[:, :, None]  # 15 x squads x 1
+    formation = np.repeat(step[:11].sum(axis=0) + _FORMATION_PAD, pts.shape[2], axis=1)
+    is_gk = (pos == 0).T[:, :, None]
+
+    for b in range(11, 15):
+        waiting = played[b].copy()
+        for s in range(11):
+            # A goalkeeper only ever swaps with a goalkeeper
+            allowed = is_gk[b] == is_gk[s]
+            if not allowed.any():
+                continue
+            delta = step[b] - step[s]
+            swap = (
+                waiting
+                & allowed
+                & in_xi[s]
+                & ~played[s]
+                & VALID_FORMATION[formation + delta]
+            )
+            in_xi[s] &= ~swap
+            in_xi[b] |= swap
+            formation += swap * delta
+            waiting &= ~swap
+
+    total = (pts * in_xi).sum(axis=0, dtype=np.int64)
+    q = np.arange(len(slots))
+    cap_pts = pts[captain, q]
+    vice_pts = pts[vice, q]
+    total += np.where(played[captain, q], cap_pts, vice_pts)
+    return total
@@ -0,0 +1,167 @@
+"""Grid search over the simulation forecast's parameters, scored by backtest.
+
+Each trial is a ``ForecastConfig`` scored by ``backtest.Backtest`` on one season.
+Trials that share a decay and zero window share their round features. They are
+therefore sent to the process pool as one task, and a worker builds the features
+once and rebuilds only the PMFs per trial.
+
+The season is sorted once, in the order ``Backtest`` keeps it, and its columns
+are copied into shared memory. Every worker's ``Backtest`` works on those pages
+directly, read-only, so the history is not pickled per task or copied per
+process.
+"""
+
+import itertools
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from fantasy_optimizer.config import ForecastConfig
+from fantasy_optimizer.forecasting.backtest import ROUND_ORDER, Backtest
+
+# Values tried per parameter: 4 x 4 x 4 x 3 = 192 trials
+SEARCH_SPACE: dict[str, list] = {
+    "decay": [0.8, 0.85, 0.9, 0.95],
+    "mix_with_pool": [0.1, 0.2, 0.3, 0.4],
+    "smooth_sigma": [0.0, 0.2, 0.4, 0.6],
+    "zero_window": [3, 6, 9],
+}
+
+# Lower is better except for rank correlation
+METRICS = {"log_loss": True, "mae": True, "spearman": False}
+
+
+def grid(space: dict[str, Sequence] = SEARCH_SPACE) -> list[ForecastConfig]:
+    """Every combination of ``space``; missing parameters keep their defaults."""
+    names = [f.name for f in fields(ForecastConfig) if f.name in space]
+    return [
+        ForecastConfig(**dict(zip(names, values)))
+        for values in itertools.product(*(space[n] for n in names))
+    ]
+
+
+class SharedFrame:
+    """Numeric DataFrame columns held in shared memory, one block per column."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.spec: list[tuple[str, str, str, int]] = []
+        self._blocks: list[SharedMemory] = []
+        for col in frame.columns:
+            arr = np.ascontiguousarray(frame[col].to_numpy())
+            block = SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, arr.dtype, buffer=block.buf)[:] = arr
+            self._blocks.append(block)
+            self.spec.append((col, block.name, arr.dtype.str, len(arr)))
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_frame(spec) -> tuple[pd.DataFrame, list[SharedMemory]]:
+    """The DataFrame described by ``SharedFrame.spec``, backed by its shared blocks.
+
+    Keep the returned blocks alive as long as the frame is used.
+    """
+    blocks, columns = [], {}
+    for col, name, dtype, n in spec:
+        block = SharedMemory(name=name)
+        arr = np.ndarray((n,), np.dtype(dtype), buffer=block.buf)
+        arr.flags.writeable = False
+        blocks.append(block)
+        columns[col] = arr
+    return pd.DataFrame(columns, copy=False), blocks
+
+
+# Per-worker state, set up once by _init_worker
+_BACKTEST: Backtest | None = None
+_BLOCKS: list[SharedMemory] = []
+
+
+def _init_worker(spec, first_round: int) -> None:
+    global _BACKTEST, _BLOCKS
+    rows, _BLOCKS = attach_frame(spec)
+    _BACKTEST = Backtest(rows, first_round)
+
+
+def _run_group(configs: list[ForecastConfig]) -> list[dict]:
+    """Score configs sharing one decay and zero window on this worker's season."""
+    assert _BACKTEST is not None
+    out = [{**asdict(cfg), **_BACKTEST.run(**asdict(cfg)).summary()} for cfg in configs]
+    _BACKTEST.clear_features()
+    return out
+
+
+def _groups(configs: Sequence[ForecastConfig]) -> list[list[ForecastConfig]]:
+    groups: dict[tuple, list[ForecastConfig]] = {}
+    for cfg in configs:
+        groups.setdefault((cfg.decay, cfg.zero_window), []).append(cfg)
+    return list(groups.values())
+
+
+def tune(
+    rows: pd.DataFrame,
+    configs: Sequence[ForecastConfig] | None = None,
+    processes: int | None = None,
+    first_round: int = 2,
+    metric: str = "log_loss",
+) -> pd.DataFrame:
+    """Backtest every config on ``rows`` in parallel, best ``metric`` first.
+
+    ``rows`` is one season of ``player_gameweek_stats`` as ``Backtest`` takes it.
+    A string ``position`` column is shared as integer codes, which give the same
+    pools. One trial per row, with the config's parameters and its scores.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric!r}; expected one of {list(METRICS)}")
+    configs = grid() if configs is None else list(configs)
+    processes = processes or os.cpu_count() or 1
+
+    order = [c for c in ROUND_ORDER if c in rows.columns]
+    numeric = rows.sort_values(order, kind="stable").reset_index(drop=True)
+    for col in numeric.columns:
+        if not pd.api.types.is_numeric_dtype(numeric[col]):
+            codes = pd.factorize(numeric[col], sort=True)[0]
+            # Missing values stay missing, so they join no pool
+            numeric[col] = np.where(codes < 0, np.nan, codes)
+
+    groups = _groups(configs)
+    with (
+        SharedFrame(numeric) as shared,
+        ProcessPoolExecutor(
+            max_workers=min(processes, len(groups)),
+            initializer=_init_worker,
+            initargs=(shared.spec, first_round),
+        ) as pool,
+    ):
+        results = [r for group in pool.map(_run_group, groups) for r in group]
+
+    return (
+        pd.DataFrame.from_records(results)
+        .sort_values(metric, ascending=METRICS[metric], kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def best_config(trials: pd.DataFrame) -> ForecastConfig:
+    """The config of the first (best) row of ``tune``'s output."""
+    best = trials.iloc[0]
+    return ForecastConfig(
+        **{
+            f.name: type(getattr(ForecastConfig(), f.name))(best[f.name])
+            for f in fields(ForecastConfig)
+        }
+    )
@@ -0,0 +1,556 @@
+"""Columnar on-disk store for element-summary payloads.
+
+Replaces the per-player ``data/player_histories/<id>.json`` files with one set of
+NumPy arrays per table (``history``, ``history_past``, ``fixtures``). Layout::
+
+    <root>/manifest.json              # generation, column kinds, HTTP validators
+    <root>/gen-<n>/elements.npy       # every element with a stored payload
+    <root>/gen-<n>/<table>/<col>.npy  # one array per column, rows sorted by element
+    <root>/gen-<n>/<table>/<col>.mask.npy  # True where the value was null
+    <root>/gen-<n>/<table>/<col>.absent.npy  # True where the record had no such key
+    <root>/gen-<n>/<table>/<col>.ints.npy  # True where a float column held an int
+
+Arrays are opened with ``mmap_mode="r"``: loading one player reads only that
+player's rows, and numeric columns are handed to pandas without copying. Writes go
+to a new generation directory and only become visible once the manifest is
+replaced, so readers never see a half-written store.
+
+``HistoryStore.payload`` rebuilds the stored dicts exactly: keys a record lacked
+stay absent, and ints in a float column come back as ints. Columns mixing other
+types are kept as JSON, so each value keeps its own type.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from fantasy_optimizer.http import Validators
+
+TABLES = ("history", "history_past", "fixtures")
+KEY = "element"
+
+
+def _infer_kind(values: list) -> str:
+    kinds = set()
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, bool):
+            kinds.add("bool")
+        elif isinstance(v, int):
+            kinds.add("int")
+        elif isinstance(v, float):
+            kinds.add("float")
+        elif isinstance(v, str):
+            kinds.add("str")
+        else:
+            kinds.add("json")
+    return _promote(kinds)
+
+
+def _promote(kinds: set[str]) -> str:
+    if not kinds:
+        return "str"
+    if len(kinds) == 1:
+        return next(iter(kinds))
+    if kinds <= {"int", "float"}:
+        return "float"
+    return "json"
+
+
+@dataclass
+class _Column:
+    kind: str
+    values: np.ndarray
+    mask: np.ndarray | None = None  # True = null; None when nothing is null
+    absent: np.ndarray | None = None  # True = key missing from the record
+    ints: np.ndarray | None = None  # float kind only: True = value was an int
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @classmethod
+    def from_values(
+        cls, values: list, kind: str | None = None, absent: np.ndarray | None = None
+    ) -> _Column:
+        kind = kind or _infer_kind(values)
+        mask = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+        ints = None
+        if kind == "float":
+            ints = np.fromiter(
+                (type(v) is int for v in values), dtype=bool, count=len(values)
+            )
+        if kind == "bool":
+            arr = np.array([bool(v) if v is not None else False for v in values])
+        elif kind == "int":
+            arr = np.array([v if v is not None else 0 for v in values], dtype=np.int64)
+        elif kind == "float":
+            arr = np.array(
+                [v if v is not None else np.nan for v in values], dtype=np.float64
+            )
+        elif kind == "str":
+            arr = np.array(
+                [str(v).encode() if v is not None else b"" for v in values],
+                dtype=np.bytes_,
+            )
+        else:
+            arr = np.array(
+                [json.dumps(v).encode() if v is not None else b"" for v in values],
+                dtype=np.bytes_,
+            )
+        if arr.size == 0:
+            arr = arr.astype(_EMPTY_DTYPES[kind])
+        return cls(kind, arr, _any(mask), _any(absent), _any(ints))
+
+    @classmethod
+    def nulls(cls, kind: str, n: int) -> _Column:
+        """``n`` rows of records that never had this column."""
+        flags = np.ones(n, dtype=bool)
+        return cls(kind, np.zeros(n, dtype=_EMPTY_DTYPES[kind]), flags, flags)
+
+    def null_mask(self) -> np.ndarray:
+        return self.mask if self.mask is not None else np.zeros(len(self), dtype=bool)
+
+    def absent_mask(self) -> np.ndarray:
+        if self.absent is not None:
+            return self.absent
+        return np.zeros(len(self), dtype=bool)
+
+    def int_mask(self) -> np.ndarray:
+        if self.ints is not None:
+            return self.ints
+        if self.kind == "int":
+            return ~self.null_mask()
+        return np.zeros(len(self), dtype=bool)
+
+    def to_pylist(self) -> list:
+        if self.kind in ("str", "json"):
+            decoded = [b.decode() for b in self.values.tolist()]
+            if self.kind == "json":
+                decoded = [json.loads(s) if s else None for s in decoded]
+        else:
+            decoded = self.values.tolist()
+        if self.ints is not None:
+            for i in np.flatnonzero(self.ints).tolist():
+                decoded[i] = int(decoded[i])
+        if self.mask is None:
+            return decoded
+        return [None if null else v for v, null in zip(decoded, self.mask.tolist())]
+
+    def to_pandas(self):
+        if self.kind == "int":
+            if self.mask is None:
+                return self.values
+            return pd.arrays.IntegerArray(np.asarray(self.values), self.mask)
+        if self.kind == "bool":
+            if self.mask is None:
+                return self.values
+            return pd.arrays.BooleanArray(np.asarray(self.values), self.mask)
+        if self.kind == "float":
+            return self.values  # nulls are already NaN
+        return np.array(self.to_pylist(), dtype=object)
+
+    def take(self, idx: np.ndarray | slice) -> _Column:
+        """Rows ``idx``; a slice keeps the arrays as views."""
+        return _Column(
+            self.kind,
+            self.values[idx],
+            *(
+                flags[idx] if flags is not None else None
+                for flags in (self.mask, self.absent, self.ints)
+            ),
+        )
+
+    @staticmethod
+    def concat(a: _Column, b: _Column) -> _Column:
+        kind = _promote({a.kind, b.kind})
+        absent = None
+        if a.absent is not None or b.absent is not None:
+            absent = np.concatenate([a.absent_mask(), b.absent_mask()])
+        if a.kind != kind or b.kind != kind:
+            if kind == "float" and {a.kind, b.kind} <= {"int", "float"}:
+                values = np.concatenate(
+                    [a.values.astype(np.float64), b.values.astype(np.float64)]
+                )
+                mask = np.concatenate([a.null_mask(), b.null_mask()])
+                values[mask] = np.nan
+                ints = np.concatenate([a.int_mask(), b.int_mask()])
+                return _Column(kind, values, _any(mask), absent, _any(ints))
+            return _Column.from_values(a.to_pylist() + b.to_pylist(), kind, absent)
+        mask = ints = None
+        if a.mask is not None or b.mask is not None:
+            mask = np.concatenate([a.null_mask(), b.null_mask()])
+        if a.ints is not None or b.ints is not None:
+            ints = np.concatenate([a.int_mask(), b.int_mask()])
+        return _Column(kind, np.concatenate([a.values, b.values]), mask, absent, ints)
+
+
+def _any(flags: np.ndarray | None) -> np.ndarray | None:
+    """``flags``, or None when no flag is set."""
+    return flags if flags is not None and flags.any() else None
+
+
+_EMPTY_DTYPES = {
+    "bool": bool,
+    "int": np.int64,
+    "float": np.float64,
+    "str": "S1",
+    "json": "S1",
+}
+
+
+# (file suffix, manifest field) of each optional per-column flag array
+_FLAG_FILES = (("mask", "nullable"), ("absent", "absent"), ("ints", "ints"))
+
+
+@dataclass
+class _Table:
+    columns: dict[str, _Column]
+
+    def __len__(self) -> int:
+        return len(self.columns[KEY]) if KEY in self.columns else 0
+
+    @classmethod
+    def empty(cls) -> _Table:
+        return cls({KEY: _Column("int", np.zeros(0, dtype=np.int64))})
+
+    @classmethod
+    def from_payloads(cls, payloads: dict[int, dict], table: str) -> _Table:
+        records, pids = [], []
+        for pid, payload in payloads.items():
+            for record in payload.get(table) or []:
+                records.append(record)
+                pids.append(pid)
+        if not records:
+            return cls.empty()
+
+        names: dict[str, None] = {KEY: None}
+        for record in records:
+            names.update(dict.fromkeys(record))
+        columns = {}
+        for name in names:
+            absent = np.fromiter(
+                (name not in r for r in records), dtype=bool, count=len(records)
+            )
+            if name == KEY:
+                # Every row is keyed by its element, whatever the record said
+                columns[name] = _Column(
+                    "int", np.array(pids, dtype=np.int64), absent=_any(absent)
+                )
+            else:
+                values = [r.get(name) for r in records]
+                columns[name] = _Column.from_values(values, absent=absent)
+        return cls(columns)
+
+    def take(self, idx: np.ndarray | slice) -> _Table:
+        return _Table({name: col.take(idx) for name, col in self.columns.items()})
+
+    @staticmethod
+    def concat(a: _Table, b: _Table) -> _Table:
+        if not len(a):
+            return b
+        if not len(b):
+            return a
+        names = dict.fromkeys([*a.columns, *b.columns])
+        columns = {}
+        for name in names:
+            if name in a.columns:
+                ca = a.columns[name]
+            else:
+                ca = _Column.nulls(b.columns[name].kind, len(a))
+            cb = (
+                b.columns[name] if name in b.columns else _Column.nulls(ca.kind, len(b))
+            )
+            columns[name] = _Column.concat(ca, cb)
+        return _Table(columns)
+
+
+def _merge(current: _Table, payloads: dict[int, dict], table: str) -> _Table:
+    """``current`` with the rows of every element in ``payloads`` replaced."""
+    replaced = np.fromiter(payloads, dtype=np.int64)
+    keep = ~np.isin(current.columns[KEY].values, replaced)
+    merged = _Table.concat(
+        current.take(np.flatnonzero(keep)), _Table.from_payloads(payloads, table)
+    )
+    order = np.argsort(merged.columns[KEY].values, kind="stable")
+    return merged.take(order)
+
+
+class HistoryStore:
+    """Columnar store of element-summary payloads keyed by element.
+
+    ``stage`` buffers freshly fetched payloads (thread-safe) and ``flush`` merges
+    them into the store in one write; ``payload`` and ``load`` see staged data too.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = threading.RLock()
+        self._manifest: dict | None = None
+        self._tables: dict[str, _Table] = {}
+        self._record_cache: dict[str, list[dict]] = {}
+        self._elements: np.ndarray | None = None
+        self._pending: dict[int, tuple[dict, Validators]] = {}
+
+    # --- reading ---
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def _read_manifest(self) -> dict:
+        if self._manifest is None:
+            if self.exists():
+                with open(self.manifest_path) as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {"generation": 0, "tables": {}, "validators": {}}
+        return self._manifest
+
+    def _generation_dir(self, generation: int) -> Path:
+        return self.root / f"gen-{generation}"
+
+    def _table(self, table: str) -> _Table:
+        if table not in TABLES:
+            raise ValueError(f"Unknown table {table!r}; expected one of {TABLES}")
+        with self._lock:
+            if table in self._tables:
+                return self._tables[table]
+            manifest = self._read_manifest()
+            spec = manifest["tables"].get(table)
+            if spec is None or spec["rows"] == 0:
+                loaded = _Table.empty()
+            else:
+                base = self._generation_dir(manifest["generation"]) / table
+                columns = {}
+                for name, col in spec["columns"].items():
+                    values = np.load(base / f"{name}.npy", mmap_mode="r")
+                    # Stores written before absent/ints were tracked lack the keys
+                    flags = [
+                        (
+                            np.load(base / f"{name}.{suffix}.npy", mmap_mode="r")
+                            if col.get(field, False)
+                            else None
+                        )
+                        for suffix, field in _FLAG_FILES
+                    ]
+                    columns[name] = _Column(col["kind"], values, *flags)
+                loaded = _Table(columns)
+            self._tables[table] = loaded
+            return loaded
+
+    def elements(self) -> np.ndarray:
+        """Sorted IDs of every element with a stored (or staged) payload."""
+        with self._lock:
+            if self._elements is None:
+                manifest = self._read_manifest()
+                path = self._generation_dir(manifest["generation"]) / "elements.npy"
+                self._elements = (
+                    np.load(path) if path.exists() else np.zeros(0, dtype=np.int64)
+                )
+            if not self._pending:
+                return self._elements
+            return np.union1d(self._elements, list(self._pending))
+
+    def __contains__(self, element: int) -> bool:
+        with self._lock:
+            if element in self._pending:
+                return True
+        stored = self.elements()
+        i = np.searchsorted(stored, element)
+        return bool(i < len(stored) and stored[i] == element)
+
+    def _slice(self, table: _Table, element: int) -> _Table:
+        keys = table.columns[KEY].values
+        lo = int(np.searchsorted(keys, element, side="left"))
+        hi = int(np.searchsorted(keys, element, side="right"))
+        return table.take(slice(lo, hi))
+
+    def load(self, table: str = "history", element: int | None = None) -> pd.DataFrame:
+        """Load one table for the whole league, or for a single element."""
+        with self._lock:
+            if element is None:
+                data = self._table(table)
+                if self._pending:
+                    staged = {
+                        pid: payload for pid, (payload, _) in self._pending.items()
+                    }
+                    data = _merge(data, staged, table)
+            elif element in self._pending:
+                data = _Table.from_payloads({element: self._pending[element][0]}, table)
+            else:
+                data = self._slice(self._table(table), element)
+        return pd.DataFrame(
+            {name: col.to_pandas() for name, col in data.columns.items()}, copy=False
+        )
+
+    def payload(self, element: int) -> dict | None:
+        """Rebuild the element-summary dict for one element; None if not stored."""
+        with self._lock:
+            if element in self._pending:
+                return self._pending[element][0]
+        if element not in self:
+            return None
+        with self._lock:
+            payload = {}
+            for table in TABLES:
+                keys = self._table(table).columns[KEY].values
+                lo = int(np.searchsorted(keys, element, side="left"))
+                hi = int(np.searchsorted(keys, element, side="right"))
+                payload[table] = self._records(table)[lo:hi]
+            return payload
+
+    def _records(self, table: str) -> list[dict]:
+        """Whole table decoded to dicts once, so per-player payloads are slices."""
+        if table not in self._record_cache:
+            data = self._table(table)
+            names = list(data.columns)
+            columns = [col.to_pylist() for col in data.columns.values()]
+            records = [dict(zip(names, row)) for row in zip(*columns)]
+            for name, col in data.columns.items():
+                if col.absent is not None:
+                    for i in np.flatnonzero(col.absent).tolist():
+                        del records[i][name]
+            self._record_cache[table] = records
+        return self._record_cache[table]
+
+    def validators(self, element: int) -> Validators:
+        with self._lock:
+            if element in self._pending:
+                return self._pending[element][1]
+            stored = self._read_manifest()["validators"].get(str(element))
+        return Validators(**stored) if stored else Validators()
+
+    # --- writing ---
+
+    def stage(
+        self, element: int, payload: dict, validators: Validators = Validators()
+    ) -> None:
+        with self._lock:
+            self._pending[element] = (payload, validators)
+
+    def flush(self) -> int:
+        """Write every staged payload to disk; returns how many were written."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            self.upsert(
+                {pid: payload for pid, (payload, _) in pending.items()},
+                {pid: validators for pid, (_, validators) in pending.items()},
+            )
+            return len(pending)
+
+    def upsert(
+        self,
+        payloads: dict[int, dict],
+        validators: dict[int, Validators] | None = None,
+    ) -> None:
+        """Replace the stored rows of every element in ``payloads`` and rewrite."""
+        if not payloads:
+            return
+        with self._lock:
+            manifest = self._read_manifest()
+            replaced = np.fromiter(payloads, dtype=np.int64)
+
+            tables = {
+                table: _merge(self._table(table), payloads, table) for table in TABLES
+            }
+
+            elements = np.union1d(self.elements(), replaced)
+            stored_validators = dict(manifest["validators"])
+            for pid, v in (validators or {}).items():
+                if v:
+                    stored_validators[str(pid)] = {
+                        "etag": v.etag,
+                        "last_modified": v.last_modified,
+                    }
+                else:
+                    stored_validators.pop(str(pid), None)
+
+            self._write(tables, elements, stored_validators)
+
+    def _write(
+        self, tables: dict[str, _Table], elements: np.ndarray, validators: dict
+    ) -> None:
+        generation = self._read_manifest()["generation"] + 1
+        gen_dir = self._generation_dir(generation)
+        if gen_dir.exists():
+            shutil.rmtree(gen_dir)
+        gen_dir.mkdir(parents=True)
+        np.save(gen_dir / "elements.npy", elements.astype(np.int64))
+
+        spec = {}
+        for table, data in tables.items():
+            table_dir = gen_dir / table
+            table_dir.mkdir()
+            columns = {}
+            for name, col in data.columns.items():
+                np.save(table_dir / f"{name}.npy", np.ascontiguousarray(col.values))
+                columns[name] = {"kind": col.kind}
+                for (suffix, field), flags in zip(
+                    _FLAG_FILES, (col.mask, col.absent, col.ints)
+                ):
+                    columns[name][field] = flags is not None and bool(flags.any())
+                    if columns[name][field]:
+                        np.save(table_dir / f"{name}.{suffix}.npy", np.asarray(flags))
+            spec[table] = {"rows": len(data), "columns": columns}
+
+        manifest = {
+            "version": 1,
+            "generation": generation,
+            "tables": spec,
+            "validators": validators,
+        }
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self.manifest_path)
+
+        self._manifest = manifest
+        self._tables = {}
+        self._record_cache = {}
+        self._elements = None
+        self._remove_stale_generations(generation)
+
+    def _remove_stale_generations(self, current: int) -> None:
+        for path in self.root.glob("gen-*"):
+            if path.name != f"gen-{current}":
+                # Another process may still have old arrays mapped; retry next write
+                shutil.rmtree(path, ignore_errors=True)
+
+    def disk_usage(self) -> int:
+        """Bytes used by the current generation and manifest."""
+        manifest = self._read_manifest()
+        gen_dir = self._generation_dir(manifest["generation"])
+        files = [self.manifest_path, *gen_dir.rglob("*.npy")]
+        return sum(p.stat().st_size for p in files if p.exists())
+
+
+def migrate_json_cache(json_dir: Path, store: HistoryStore) -> int:
+    """One-shot import of legacy ``<id>.json`` (+ ``.json.meta``) files into ``store``."""
+    payloads: dict[int, dict] = {}
+    validators: dict[int, Validators] = {}
+    for path in sorted(Path(json_dir).glob("*.json")):
+        if not path.stem.isdigit():
+            continue
+        pid = int(path.stem)
+        with open(path) as f:
+            payloads[pid] = json.load(f)
+        meta = path.with_name(path.name + ".meta")
+        if meta.exists():
+            with open(meta) as f:
+                validators[pid] = Validators(**json.load(f))
+    store.upsert(payloads, validators)
+    return len(payloads)
@@ -1,9 +1,238 @@
-"""Shared HTTP utilities with exponential backoff retry."""
+"""Shared HTTP utilities: a pooled keep-alive client with retry and revalidation."""
 
+import threading
 import time
+from dataclasses import dataclass
 
 import requests
 from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import make_headers
+
+from fantasy_optimizer.metrics import record_fetch
+
+# Comfortably above the [ingest] concurrency so worker threads never queue for a socket
+DEFAULT_POOL_MAXSIZE = 32
+
+
+class RateLimiter:
+    """Thread-safe politeness limit: request starts are spaced ``min_interval`` apart.
+
+    Shared between worker threads so that concurrent fetching never hits the API
+    faster than the serial loop with a fixed sleep would.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+@dataclass(frozen=True)
+class ConnectionStats:
+    requests: int
+    connections_opened: int
+    not_modified: int = 0
+
+    @property
+    def connections_reused(self) -> int:
+        return max(0, self.requests - self.connections_opened)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.requests} requests, {self.connections_opened} connections opened,"
+            f" {self.connections_reused} reused, {self.not_modified} not modified"
+        )
+
+
+@dataclass(frozen=True)
+class Validators:
+    """Cache validators returned by the server for a resource."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def request_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> "Validators":
+        return cls(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+
+@dataclass(frozen=True)
+class ConditionalResult:
+    """Outcome of a conditional GET; ``data`` is None when the server answered 304."""
+
+    data: dict | None
+    validators: Validators
+
+    @property
+    def not_modified(self) -> bool:
+        return self.data is None
+
+
+def _counting_pool(base: type, on_new_connection) -> type:
+    class CountingPool(base):
+        def _new_conn(self):
+            on_new_connection()
+            return super()._new_conn()
+
+    return CountingPool
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose urllib3 pools report every new TCP/TLS connection."""
+
+    def __init__(self, on_new_connection, **kwargs):
+        self._on_new_connection = on_new_connection
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, self._on_new_connection),
+            "https": _counting_pool(HTTPSConnectionPool, self._on_new_connection),
+        }
+
+
+class HttpClient:
+    """Pooled keep-alive HTTP client shared by every API fetcher.
+
+    Connections are reused across calls and threads. With ``compression`` on, the
+    client advertises every content encoding urllib3 can decode (gzip, deflate,
+    plus brotli/zstd when those packages are installed).
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        compression: bool = True,
+    ):
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._connections_opened = 0
+        self._not_modified = 0
+
+        self.session = requests.Session()
+        adapter = _CountingAdapter(
+            self._on_new_connection, pool_connections=4, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept-Encoding"] = (
+            make_headers(accept_encoding=True)["accept-encoding"]
+            if compression
+            else "identity"
+        )
+
+    def _on_new_connection(self) -> None:
+        with self._lock:
+            self._connections_opened += 1
+
+    @property
+    def stats(self) -> ConnectionStats:
+        with self._lock:
+            return ConnectionStats(
+                self._requests, self._connections_opened, self._not_modified
+            )
+
+    def get(
+        self,
+        url: str,
+        max_attempts: int = 4,
+        backoff_base: float = 2.0,
+        timeout: int = 15,
+        headers: dict[str, str] | None = None,
+    ) -> requests.Response:
+        """GET a URL, retrying with exponential backoff on failure.
+
+        A 304 Not Modified answer is returned as-is rather than treated as an error.
+        """
+        last_exc: Exception = RuntimeError("No attempts made")
+        for attempt in range(max_attempts):
+            try:
+                with self._lock:
+                    self._requests += 1
+                response = self.session.get(url, timeout=timeout, headers=headers)
+                response.raise_for_status()
+                record_fetch(len(response.content))
+                return response
+            except (
+                requests.exceptions.HTTPError,
+                requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError,
+            ) as e:
+                last_exc = e
+                if attempt < max_attempts - 1:
+                    wait = backoff_base**attempt
+                    logger.warning(
+                        "Request to {} failed (attempt {}/{}): {} — retrying in {:.0f}s",
+                        url,
+                        attempt + 1,
+                        max_attempts,
+                        e,
+                        wait,
+                    )
+                    time.sleep(wait)
+                else:
+                    logger.error(
+                        "Request to {} failed after {} attempts: {}",
+                        url,
+                        max_attempts,
+                        e,
+                    )
+        raise last_exc
+
+    def get_json(self, url: str, **kwargs) -> dict:
+        return self.get(url, **kwargs).json()
+
+    def get_json_if_modified(
+        self, url: str, validators: Validators = Validators(), **kwargs
+    ) -> ConditionalResult:
+        """GET a URL with If-None-Match/If-Modified-Since; skip the body on 304."""
+        response = self.get(url, headers=validators.request_headers(), **kwargs)
+        if response.status_code == 304:
+            with self._lock:
+                self._not_modified += 1
+            return ConditionalResult(None, validators)
+        return ConditionalResult(response.json(), Validators.from_response(response))
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_default_client: HttpClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Return the process-wide client shared by api_client and the fetch scripts."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
 
 
 def fetch_with_retry(
@@ -13,34 +242,13 @@ def fetch_with_retry(
     timeout: int = 15,
 ) -> dict:
     """GET a URL and return parsed JSON, retrying with exponential backoff on failure."""
-    last_exc: Exception = RuntimeError("No attempts made")
-    for attempt in range(max_attempts):
-        try:
-            response = requests.get(url, timeout=timeout)
-            response.raise_for_status()
-            return response.json()
-        except (
-            requests.exceptions.HTTPError,
-            requests.exceptions.Timeout,
-            requests.exceptions.ConnectionError,
-        ) as e:
-            last_exc = e
-            if attempt < max_attempts - 1:
-                wait = backoff_base**attempt
-                logger.warning(
-                    "Request to %s failed (attempt %d/%d): %s — retrying in %.0fs",
-                    url,
-                    attempt + 1,
-                    max_attempts,
-                    e,
-                    wait,
-                )
-                time.sleep(wait)
-            else:
-                logger.error(
-                    "Request to %s failed after %d attempts: %s",
-                    url,
-                    max_attempts,
-                    e,
-                )
-    raise last_exc
+    return get_client().get_json(
+        url, max_attempts=max_attempts, backoff_base=backoff_base, timeout=timeout
+    )
+
+
+def fetch_if_modified(
+    url: str, validators: Validators = Validators()
+) -> ConditionalResult:
+    """Conditional variant of fetch_with_retry; ``data`` is None when unchanged."""
+    return get_client().get_json_if_modified(url, validators)
@@ -0,0 +1,49 @@
+"""I/O counters attributed to whichever ingest stage is running.
+
+``counting()`` installs a fresh ``IOCounters`` in a context variable; the HTTP
+client adds the bytes of every response and the upsert helpers add every row they
+write. Threads started through ``fantasy_optimizer.pipeline`` inherit the caller's
+context, so a stage's worker threads count towards the same stage.
+"""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class IOCounters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bytes_fetched = 0
+        self.rows_written = 0
+
+    def add(self, bytes_fetched: int = 0, rows_written: int = 0) -> None:
+        with self._lock:
+            self.bytes_fetched += bytes_fetched
+            self.rows_written += rows_written
+
+
+_current: ContextVar[IOCounters | None] = ContextVar("io_counters", default=None)
+
+
+@contextmanager
+def counting() -> Iterator[IOCounters]:
+    counters = IOCounters()
+    token = _current.set(counters)
+    try:
+        yield counters
+    finally:
+        _current.reset(token)
+
+
+def record_fetch(n_bytes: int) -> None:
+    counters = _current.get()
+    if counters is not None:
+        counters.add(bytes_fetched=n_bytes)
+
+
+def record_rows(n_rows: int) -> None:
+    counters = _current.get()
+    if counters is not None:
+        counters.add(rows_written=n_rows)
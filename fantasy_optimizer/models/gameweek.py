@@ -1,7 +1,8 @@
 # fantasy_optimizer/models/gameweek.py
-from typing import Optional
+from datetime import datetime
+from typing import Annotated, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, BeforeValidator, Field, computed_field
 
 
 class PlayerGameweekStat(BaseModel):
@@ -11,6 +12,10 @@ class PlayerGameweekStat(BaseModel):
     total_points: int
     was_home: bool
     kickoff_time: Optional[str]
+    # Same input parsed as a timestamp by pydantic-core; "" (no date yet) is None
+    kickoff_at: Annotated[Optional[datetime], BeforeValidator(lambda v: v or None)] = (
+        Field(default=None, validation_alias="kickoff_time")
+    )
     team_h_score: Optional[int] = None
     team_a_score: Optional[int] = None
 
@@ -28,3 +33,9 @@ class PlayerGameweekStat(BaseModel):
     bonus: Optional[int] = 0
 
     round: int  # Gameweek number
+
+    @computed_field
+    @property
+    def season(self) -> Optional[int]:
+        # Allsvenskan seasons run within a calendar year
+        return self.kickoff_at.year if self.kickoff_at else None
@@ -0,0 +1,166 @@
+# fantasy_optimizer/models/validation.py
+"""Validate whole API payloads at once instead of one model per row.
+
+``validate_rows`` validates a list of raw dicts in a single call into
+pydantic-core, against a TypedDict row schema derived from the model. Rows come
+out as plain dicts, so no model instances are built and there is no
+``model_dump`` afterwards. Invalid rows are dropped and collected into a
+``ValidationReport`` rather than logged one by one.
+"""
+
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Annotated, Any, NotRequired
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from typing_extensions import TypedDict
+
+# How many row errors a report prints before summarising the rest
+MAX_REPORTED_ERRORS = 10
+
+
+@dataclass(frozen=True)
+class RowError:
+    index: int  # position in the validated payload
+    key: Any  # the row's identifying field, e.g. the player ID
+    field: str  # dotted location inside the row
+    message: str
+
+
+@dataclass
+class ValidationReport:
+    model: str
+    total: int = 0
+    errors: list[RowError] = field(default_factory=list)
+
+    @property
+    def invalid_rows(self) -> int:
+        return len({e.index for e in self.errors})
+
+    @property
+    def valid_rows(self) -> int:
+        return self.total - self.invalid_rows
+
+    def __bool__(self) -> bool:
+        """True when at least one row failed validation."""
+        return bool(self.errors)
+
+    def __iadd__(self, other: "ValidationReport") -> "ValidationReport":
+        offset = self.total
+        self.total += other.total
+        self.errors.extend(
+            RowError(e.index + offset, e.key, e.field, e.message) for e in other.errors
+        )
+        return self
+
+    def __str__(self) -> str:
+        lines = [
+            f"{self.model}: {self.valid_rows}/{self.total} rows valid,"
+            f" {self.invalid_rows} rejected"
+        ]
+        for e in self.errors[:MAX_REPORTED_ERRORS]:
+            lines.append(f"  row {e.index} (key {e.key}): {e.field}: {e.message}")
+        if len(self.errors) > MAX_REPORTED_ERRORS:
+            lines.append(f"  ... and {len(self.errors) - MAX_REPORTED_ERRORS} more")
+        return "\n".join(lines)
+
+
+class _RowAttrs:
+    """Attribute view of a validated row, for evaluating computed fields."""
+
+    __slots__ = ("_row",)
+
+    def __init__(self, row: dict):
+        self._row = row
+
+    def __getattr__(self, name: str):
+        return self._row[name]
+
+
+@dataclass(frozen=True)
+class _RowSchema:
+    adapter: TypeAdapter
+    n_fields: int
+    defaults: dict[str, Any]  # filled in when a row omits an optional field
+    computed: dict[str, Any]  # name -> property getter
+
+
+@cache
+def _row_schema(model: type[BaseModel]) -> _RowSchema:
+    decorators = model.__pydantic_decorators__
+    if (
+        decorators.field_validators
+        or decorators.model_validators
+        or decorators.field_serializers
+        or decorators.model_serializers
+    ):
+        # Custom hooks only run on the model itself; validate and dump through it
+        return _RowSchema(TypeAdapter(list[model]), 0, {}, {})  # type: ignore[valid-type]
+
+    fields, defaults = {}, {}
+    for name, info in model.model_fields.items():
+        annotation: Any = info.annotation
+        if info.metadata:
+            # Annotated validators/constraints, which FieldInfo keeps apart
+            annotation = Annotated[(annotation, *info.metadata)]
+        if info.validation_alias:
+            annotation = Annotated[
+                annotation, Field(validation_alias=info.validation_alias)
+            ]
+        if not info.is_required():
+            annotation = NotRequired[annotation]
+            defaults[name] = info.get_default(call_default_factory=True)
+        fields[name] = annotation
+    row_type = TypedDict(f"{model.__name__}Row", fields)  # type: ignore[misc]
+    computed = {name: getattr(model, name).fget for name in model.model_computed_fields}
+    return _RowSchema(TypeAdapter(list[row_type]), len(fields), defaults, computed)
+
+
+def _finish(schema: _RowSchema, validated: list) -> list[dict]:
+    if validated and isinstance(validated[0], BaseModel):
+        return schema.adapter.dump_python(validated)
+    if schema.defaults:
+        validated = [
+            row if len(row) == schema.n_fields else {**schema.defaults, **row}
+            for row in validated
+        ]
+    view = _RowAttrs({})
+    for name, getter in schema.computed.items():
+        for row in validated:
+            view._row = row
+            row[name] = getter(view)
+    return validated
+
+
+def validate_rows(
+    model: type[BaseModel], raw: list[dict], key: str = "id"
+) -> tuple[list[dict], ValidationReport]:
+    """Validate ``raw`` against ``model`` and return the valid rows as dicts.
+
+    The rows match ``model(**r).model_dump()``, computed fields included, and keep
+    payload order. The report lists every rejected row, identified by ``key``.
+    """
+    schema = _row_schema(model)
+    report = ValidationReport(model.__name__, total=len(raw))
+    try:
+        validated = schema.adapter.validate_python(raw)
+    except ValidationError as exc:
+        bad: set[int] = set()
+        for err in exc.errors(include_url=False):
+            index, *loc = err["loc"]
+            assert isinstance(index, int)
+            bad.add(index)
+            row = raw[index]
+            report.errors.append(
+                RowError(
+                    index=index,
+                    key=row.get(key) if isinstance(row, dict) else None,
+                    field=".".join(str(part) for part in loc) or "<row>",
+                    message=err["msg"],
+                )
+            )
+        # Every remaining row is known to be valid, so this cannot raise
+        validated = schema.adapter.validate_python(
+            [row for i, row in enumerate(raw) if i not in bad]
+        )
+    return _finish(schema, validated), report
@@ -0,0 +1,172 @@
+"""Match free-text player names (e.g. from enhanced stats) to player ids.
+
+Names are compared after folding: lower case, accents stripped (å/ä/ö -> a/a/o),
+punctuation turned into spaces. ``NameIndex`` keeps every folded name by whole
+token and by character trigram. A lookup is a dictionary hit for an exact folded
+name. Otherwise only names that share a token or the most trigrams with it are
+scored with ``difflib``, instead of every player in the league.
+
+``NameMap`` persists the resolved name -> player id mapping as JSON, along with
+the names that matched nobody. A weekly import only builds an index for names it
+has not seen before, and reports each unmatched name once.
+"""
+
+import difflib
+import json
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Letters NFKD does not decompose into a base letter and an accent
+_FOLD = str.maketrans({"ø": "o", "æ": "ae", "ß": "ss", "đ": "d", "ł": "l", "ð": "d"})
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def fold_name(name: str) -> str:
+    """Lower-case ``name`` without accents or punctuation: "Åström-Öhman" -> "astrom ohman"."""
+    decomposed = unicodedata.normalize("NFKD", name.lower().translate(_FOLD))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", stripped).strip()
+
+
+def trigrams(folded: str) -> set[str]:
+    padded = f"  {folded} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Token and trigram index over (player id, name) pairs.
+
+    A player may appear under several names (full name, web name). Earlier
+    entries win exact-match ties, so pass the preferred names first.
+    """
+
+    def __init__(
+        self,
+        player_ids: Sequence[int],
+        names: Sequence[str],
+        max_candidates: int = 25,
+    ):
+        if len(player_ids) != len(names):
+            raise ValueError("player_ids and names must have the same length")
+        self.max_candidates = max_candidates
+        self._ids = [int(pid) for pid in player_ids]
+        self._names = [fold_name(str(name)) for name in names]
+        self._exact: dict[str, int] = {}
+        self._by_token: dict[str, list[int]] = defaultdict(list)
+        self._by_trigram: dict[str, list[int]] = defaultdict(list)
+        for entry, name in enumerate(self._names):
+            if not name:
+                continue
+            self._exact.setdefault(name, entry)
+            for token in set(name.split()):
+                self._by_token[token].append(entry)
+            for gram in trigrams(name):
+                self._by_trigram[gram].append(entry)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def candidates(self, folded: str) -> set[int]:
+        """Entries sharing a token with ``folded``, plus those sharing most trigrams."""
+        found = {e for t in folded.split() for e in self._by_token.get(t, ())}
+        shared: Counter = Counter()
+        for gram in trigrams(folded):
+            shared.update(self._by_trigram.get(gram, ()))
+        found.update(e for e, _ in shared.most_common(self.max_candidates))
+        return found
+
+    def match(self, name: str, cutoff: float = 0.6) -> int | None:
+        """Player id whose name best matches ``name``, or None below ``cutoff``.
+
+        Similarity is ``difflib.SequenceMatcher.ratio`` on folded names, as in
+        ``difflib.get_close_matches``.
+        """
+        folded = fold_name(name)
+        if not folded:
+            return None
+        if folded in self._exact:
+            return self._ids[self._exact[folded]]
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(folded)
+        best, best_entry = cutoff, None
+        for entry in sorted(self.candidates(folded)):
+            matcher.set_seq1(self._names[entry])
+            if (
+                matcher.real_quick_ratio() >= best
+                and matcher.quick_ratio() >= best
+                and (ratio := matcher.ratio()) >= best
+                and (best_entry is None or ratio > best)
+            ):
+                best, best_entry = ratio, entry
+        return None if best_entry is None else self._ids[best_entry]
+
+
+@dataclass
+class NameMap:
+    """Resolved name -> player id mapping, and the names that matched nobody."""
+
+    matched: dict[str, int] = field(default_factory=dict)
+    unmatched: set[str] = field(default_factory=set)
+
+    @classmethod
+    def load(cls, path: Path) -> "NameMap":
+        if not path.exists():
+            return cls()
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            {name: int(pid) for name, pid in data.get("matched", {}).items()},
+            set(data.get("unmatched", [])),
+        )
+
+    def save(self, path: Path) -> None:
+        with open(path, "w") as f:
+            json.dump(
+                {"matched": self.matched, "unmatched": sorted(self.unmatched)},
+                f,
+                indent=2,
+                ensure_ascii=False,
+                sort_keys=True,
+            )
+
+    def resolve(
+        self,
+        names: Iterable[str],
+        build_index: Callable[[], NameIndex],
+        valid_ids: Iterable[int] | None = None,
+        cutoff: float = 0.6,
+    ) -> list[str]:
+        """Add every new name in ``names`` to the mapping.
+
+        Mappings to ids outside ``valid_ids`` are dropped and matched again. Names
+        left unmatched are kept and not retried until removed from ``unmatched``.
+        ``build_index`` is only called when some name has not been seen yet.
+        Returns the names that are newly unmatched, so each one is reported once.
+        """
+        if valid_ids is not None:
+            valid = set(valid_ids)
+            self.matched = {n: pid for n, pid in self.matched.items() if pid in valid}
+        self.unmatched -= self.matched.keys()
+        seen = self.matched.keys() | self.unmatched
+        todo = sorted({n for n in names if n not in seen})
+        if not todo:
+            return []
+
+        index = build_index()
+        new = []
+        for name in todo:
+            player_id = index.match(name, cutoff)
+            if player_id is None:
+                new.append(name)
+            else:
+                self.matched[name] = player_id
+        self.unmatched.update(new)
+        return new
+
+    def lookup(self, names: Iterable[str]) -> list[int | None]:
+        return [self.matched.get(name) for name in names]
@@ -0,0 +1,196 @@
+"""Producer/consumer pipeline: stages on threads, joined by bounded queues.
+
+Each stage is a generator function that consumes an iterator of inputs and yields
+outputs, so a stage can batch (yield once per N inputs) or filter freely. A stage
+may run on several worker threads that share its input queue. Queues hold at most
+``queue_size`` items, so a slow stage blocks the ones upstream of it (backpressure)
+instead of letting work pile up in memory, and the whole pipeline runs at the pace
+of its slowest stage.
+
+Every thread runs in a copy of the caller's context, so context variables (such
+as the I/O counters in ``fantasy_optimizer.metrics``) follow the work.
+
+If any stage raises, the other stages stop at their next queue operation and
+``Pipeline.run`` re-raises the original exception.
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+# Seconds between checks for a failed stage while blocked on a queue
+_POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+class _Aborted(Exception):
+    """Unwinds a worker once another stage has failed."""
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int = 1
+    items_in: int = 0
+    items_out: int = 0
+    busy_seconds: float = 0.0  # summed over workers
+    starved_seconds: float = 0.0  # waiting for upstream
+    blocked_seconds: float = 0.0  # waiting for room downstream (backpressure)
+
+    @property
+    def throughput(self) -> float:
+        """Input items per second the stage sustains while busy."""
+        if self.busy_seconds <= 0:
+            return float("inf") if self.items_in else 0.0
+        return self.items_in * self.workers / self.busy_seconds
+
+    def __iadd__(self, other: "StageStats") -> "StageStats":
+        self.items_in += other.items_in
+        self.items_out += other.items_out
+        self.busy_seconds += other.busy_seconds
+        self.starved_seconds += other.starved_seconds
+        self.blocked_seconds += other.blocked_seconds
+        return self
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name} (x{self.workers}): {self.items_in} in, {self.items_out} out,"
+            f" busy {self.busy_seconds:.2f}s ({self.throughput:.1f}/s),"
+            f" starved {self.starved_seconds:.2f}s, blocked {self.blocked_seconds:.2f}s"
+        )
+
+
+@dataclass
+class _Stage:
+    fn: Callable[[Iterator], Iterable]
+    stats: StageStats
+    remaining: int  # workers still running
+
+
+def _thread(target, *args) -> threading.Thread:
+    return threading.Thread(target=contextvars.copy_context().run, args=(target, *args))
+
+
+class Pipeline:
+    """Stages added with ``add_stage`` run in order; a pipeline is run once."""
+
+    def __init__(self, queue_size: int = 32):
+        self.queue_size = max(1, queue_size)
+        self._stages: list[_Stage] = []
+        self._lock = threading.Lock()
+        self._failed = threading.Event()
+        self._error: BaseException | None = None
+
+    def add_stage(
+        self, name: str, fn: Callable[[Iterator], Iterable], workers: int = 1
+    ) -> "Pipeline":
+        workers = max(1, workers)
+        self._stages.append(_Stage(fn, StageStats(name, workers), workers))
+        return self
+
+    @property
+    def stats(self) -> list[StageStats]:
+        return [stage.stats for stage in self._stages]
+
+    def run(self, items: Iterable) -> list:
+        """Feed ``items`` through every stage; returns the last stage's outputs."""
+        queues = [queue.Queue(self.queue_size) for _ in range(len(self._stages) + 1)]
+        threads = [_thread(self._feed, items, queues[0])]
+        for i, stage in enumerate(self._stages):
+            threads += [
+                _thread(self._work, stage, queues[i], queues[i + 1])
+                for _ in range(stage.stats.workers)
+            ]
+        for t in threads:
+            t.start()
+
+        results = []
+        try:
+            while (item := self._get(queues[-1])) is not _DONE:
+                results.append(item)
+        except _Aborted:
+            pass
+        for t in threads:
+            t.join()
+        if self._error is not None:
+            raise self._error
+        return results
+
+    def _fail(self, exc: BaseException) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = exc
+        self._failed.set()
+
+    def _get(self, q: queue.Queue, stats: StageStats | None = None):
+        start = time.perf_counter()
+        while True:
+            if self._failed.is_set():
+                raise _Aborted
+            try:
+                item = q.get(timeout=_POLL_INTERVAL)
+                break
+            except queue.Empty:
+                continue
+        if stats is not None:
+            stats.starved_seconds += time.perf_counter() - start
+        return item
+
+    def _put(self, q: queue.Queue, item, stats: StageStats | None = None) -> None:
+        start = time.perf_counter()
+        while True:
+            if self._failed.is_set():
+                raise _Aborted
+            try:
+                q.put(item, timeout=_POLL_INTERVAL)
+                break
+            except queue.Full:
+                continue
+        if stats is not None:
+            stats.blocked_seconds += time.perf_counter() - start
+
+    def _feed(self, items: Iterable, out: queue.Queue) -> None:
+        try:
+            for item in items:
+                self._put(out, item)
+            self._put(out, _DONE)
+        except _Aborted:
+            pass
+        except BaseException as exc:
+            self._fail(exc)
+
+    def _inputs(self, q: queue.Queue, stats: StageStats) -> Iterator:
+        while (item := self._get(q, stats)) is not _DONE:
+            stats.items_in += 1
+            yield item
+        # Hand the end marker on to this stage's other workers
+        self._put(q, _DONE)
+
+    def _work(self, stage: _Stage, inq: queue.Queue, outq: queue.Queue) -> None:
+        local = StageStats(stage.stats.name)
+        start = time.perf_counter()
+        try:
+            for item in stage.fn(self._inputs(inq, local)):
+                local.items_out += 1
+                self._put(outq, item, local)
+        except _Aborted:
+            pass
+        except BaseException as exc:
+            self._fail(exc)
+
+        local.busy_seconds = (
+            time.perf_counter() - start - local.starved_seconds - local.blocked_seconds
+        )
+        with self._lock:
+            stage.stats += local
+            stage.remaining -= 1
+            last = stage.remaining == 0
+        if last:
+            try:
+                self._put(outq, _DONE)
+            except _Aborted:
+                pass
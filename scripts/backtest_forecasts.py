@@ -0,0 +1,64 @@
+"""Walk-forward backtest of the simulation forecast on one season.
+
+Every round is forecast from earlier rounds only and scored against its realised
+points (MAE, PMF log-loss, rank correlation). The season is read from the
+database once.
+
+Usage:
+    uv run python scripts/backtest_forecasts.py
+    uv run python scripts/backtest_forecasts.py --season 2025 --decay 0.85 --mix 0.3
+"""
+
+import argparse
+import time
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import text
+
+from fantasy_optimizer.db.database import get_engine
+from fantasy_optimizer.forecasting.backtest import Backtest
+from fantasy_optimizer.forecasting.incremental import ZERO_WINDOW
+
+
+def load_season(season: int) -> pd.DataFrame:
+    with get_engine(replica=True).connect() as conn:
+        return pd.read_sql(
+            text(
+                "SELECT element, round, fixture, total_points"
+                " FROM player_gameweek_stats WHERE season = :season"
+                " ORDER BY element, round, fixture"
+            ),
+            conn,
+            params={"season": season},
+        )
+
+
+def main(season: int, decay: float, mix: float, sigma: float, zero_window: int):
+    rows = load_season(season)
+    if rows.empty:
+        print(f"No gameweek stats for season {season}. Run ingest.py first.")
+        raise SystemExit(1)
+
+    start = time.perf_counter()
+    result = Backtest(rows).run(decay, mix, sigma, zero_window)
+    elapsed = time.perf_counter() - start
+
+    print(result.rounds.to_string(index=False, float_format="%.3f"))
+    summary = result.summary()
+    print(
+        f"Season {season}: {summary['rounds']} rounds, {summary['n']} outcomes in"
+        f" {elapsed:.2f} s; MAE {summary['mae']:.3f},"
+        f" log-loss {summary['log_loss']:.3f}, Spearman {summary['spearman']:.3f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--season", type=int, default=date.today().year)
+    parser.add_argument("--decay", type=float, default=0.9)
+    parser.add_argument("--mix", type=float, default=0.20, help="Pool mix weight")
+    parser.add_argument("--sigma", type=float, default=0.4, help="Smoothing sigma")
+    parser.add_argument("--zero-window", type=int, default=ZERO_WINDOW)
+    args = parser.parse_args()
+    main(args.season, args.decay, args.mix, args.sigma, args.zero_window)
@@ -0,0 +1,80 @@
+"""Compare the per-player PMF loop against the batch PMF engine.
+
+Builds a synthetic league (by default 10x a real one: 3000 players, 30 rounds)
+with four position pools, times ``build_points_pmf`` called once per player as
+``build_simulation_forecasts`` used to, then ``batch_points_pmf`` over the whole
+league, and checks that both give the same PMFs.
+
+Usage:
+    PYTHONPATH=. uv run python scripts/benchmarks/bench_pmf.py --players 3000 --rounds 30
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from fantasy_optimizer.forecasting.pmf import batch_points_pmf, zero_boosts
+from scripts.build_forecasts import build_points_pmf
+
+
+def synthetic_league(players: int, rounds: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    # Zero-heavy points, with the odd -1 and a long right tail like the real game
+    histories = []
+    for _ in range(players):
+        n = int(rng.integers(0, rounds + 1))
+        pts = rng.poisson(rng.uniform(0.5, 5.0), n) - (rng.random(n) < 0.05)
+        pts[rng.random(n) < 0.3] = 0
+        histories.append(pts.astype(int))
+    position = rng.integers(0, 4, players)
+    pools = [
+        np.concatenate([h for h, p in zip(histories, position) if p == k])
+        for k in range(4)
+    ]
+    return histories, [pools[p] for p in position]
+
+
+def _best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def per_player(histories, pools, boosts):
+    return [
+        build_points_pmf(h, pool_points=p, zero_boost=float(z))
+        for h, p, z in zip(histories, pools, boosts)
+    ]
+
+
+def main(players: int, rounds: int, repeats: int):
+    histories, pools = synthetic_league(players, rounds)
+    boosts = zero_boosts(histories)
+
+    reference = per_player(histories, pools, boosts)
+    batch = batch_points_pmf(histories, pools, zero_boost=boosts)
+    diff = max(
+        np.abs(pmf - batch.row(i)[1]).max() for i, (_, pmf) in enumerate(reference)
+    )
+
+    before = _best_of(lambda: per_player(histories, pools, boosts), repeats)
+    after = _best_of(
+        lambda: batch_points_pmf(histories, pools, zero_boost=boosts), repeats
+    )
+    print(f"{players} players x up to {rounds} rounds, grid {batch.grid.size} points")
+    print(f"  per-player build_points_pmf {before * 1e3:9.1f} ms")
+    print(f"  batch_points_pmf            {after * 1e3:9.1f} ms")
+    print(f"  speedup: {before / after:.1f}x, max abs difference {diff:.1e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    main(args.players, args.rounds, args.repeats)
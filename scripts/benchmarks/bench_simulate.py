@@ -0,0 +1,79 @@
+"""Time the Monte Carlo squad simulator on a synthetic league.
+
+Builds batch PMFs for a synthetic league (see ``bench_pmf.synthetic_league``), draws
+random valid squads and scores them all on the same sampled gameweeks, reporting
+player-gameweek outcomes sampled per second and the simulator's working memory.
+
+Usage:
+    PYTHONPATH=. uv run python scripts/benchmarks/bench_simulate.py --squads 50 --scenarios 200000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from fantasy_optimizer.forecasting.pmf import (
+    PointsDistributions,
+    batch_points_pmf,
+    zero_boosts,
+)
+from fantasy_optimizer.forecasting.simulate import (
+    POSITIONS,
+    SQUAD_SIZE,
+    Squad,
+    SquadSimulator,
+)
+from scripts.benchmarks.bench_pmf import synthetic_league
+
+
+def random_squads(dists: PointsDistributions, positions: dict, n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    by_pos = {p: [i for i, q in positions.items() if q == p] for p in POSITIONS}
+    squads = []
+    for _ in range(n):
+        ids, pos = [], []
+        for p, count in SQUAD_SIZE.items():
+            ids += rng.choice(by_pos[p], count, replace=False).tolist()
+            pos += [p] * count
+        squads.append(Squad.from_expected(ids, pos, dists.expected[ids]))
+    return squads
+
+
+def main(players: int, squads: int, scenarios: int, batch_size: int):
+    histories, pools = synthetic_league(players, 30)
+    batch = batch_points_pmf(histories, pools, zero_boost=zero_boosts(histories))
+    dists = PointsDistributions.from_batch(np.arange(players), batch)
+    positions = {i: POSITIONS[i % 4] for i in range(players)}
+    lineups = random_squads(dists, positions, squads, seed=1)
+    n_players = len({p for s in lineups for p in s.player_ids})
+
+    simulator = SquadSimulator(dists, positions, seed=0, batch_size=batch_size)
+    tracemalloc.start()
+    start = time.perf_counter()
+    outcomes = simulator.simulate(lineups, scenarios)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(
+        f"{squads} squads ({n_players} distinct players) x {scenarios} scenarios,"
+        f" batches of {batch_size}"
+    )
+    print(
+        f"  {elapsed:.2f} s, {n_players * scenarios / elapsed / 1e6:.1f}M player"
+        f" outcomes/s, {squads * scenarios / elapsed / 1e6:.2f}M squad-gameweeks/s"
+    )
+    print(f"  peak traced memory {peak / 1e6:.0f} MB")
+    print(outcomes.summary().head())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--squads", type=int, default=50)
+    parser.add_argument("--scenarios", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=4096)
+    args = parser.parse_args()
+    main(args.players, args.squads, args.scenarios, args.batch_size)
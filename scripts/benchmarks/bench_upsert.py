@@ -0,0 +1,93 @@
+"""Compare rows/sec of the VALUES upsert path against the COPY bulk path.
+
+Writes synthetic rows for negative element IDs into player_gameweek_stats and
+deletes them afterwards, so it is safe to run against the real database.
+
+Usage:
+    uv run python scripts/benchmarks/bench_upsert.py --players 300 --rounds 30
+"""
+
+import argparse
+import time
+
+from sqlalchemy import text
+
+from fantasy_optimizer.db.database import get_engine
+from fantasy_optimizer.db.upsert import upsert_gameweek_stats
+from fantasy_optimizer.models.gameweek import PlayerGameweekStat
+
+
+def synthetic_rows(players: int, rounds: int) -> list[dict]:
+    return [
+        PlayerGameweekStat(
+            **{
+                "element": -pid,
+                "fixture": rnd,
+                "opponent_team": 1 + rnd % 16,
+                "total_points": (pid * rnd) % 12,
+                "was_home": rnd % 2 == 0,
+                "kickoff_time": f"2025-{4 + rnd // 5:02d}-{1 + rnd % 28:02d}T17:00:00Z",
+                "team_h_score": 1,
+                "team_a_score": None,
+                "minutes": 90,
+                "goals_scored": 0,
+                "assists": 0,
+                "clean_sheets": 0,
+                "goals_conceded": 1,
+                "own_goals": 0,
+                "penalties_saved": 0,
+                "penalties_missed": 0,
+                "yellow_cards": 0,
+                "red_cards": 0,
+                "saves": 0,
+                "bonus": 0,
+                "round": rnd,
+            }
+        ).model_dump()
+        for pid in range(1, players + 1)
+        for rnd in range(1, rounds + 1)
+    ]
+
+
+def _cleanup():
+    with get_engine().begin() as conn:
+        conn.execute(text("DELETE FROM player_gameweek_stats WHERE element < 0"))
+
+
+def _time(label: str, rows: list[dict], batch_size: int, use_copy: bool) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        upsert_gameweek_stats(rows[i : i + batch_size], use_copy=use_copy)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:7.2f}s  {len(rows) / elapsed:10.0f} rows/s")
+    return elapsed
+
+
+def main(players: int, rounds: int, batch_size: int):
+    rows = synthetic_rows(players, rounds)
+    print(f"{len(rows)} rows, batch size {batch_size}")
+    try:
+        for phase in ("insert", "update"):
+            print(f"{phase}:")
+            if phase == "insert":
+                _cleanup()
+            values = _time("VALUES ... ON CONFLICT", rows, batch_size, use_copy=False)
+            if phase == "insert":
+                _cleanup()
+            copy = _time("COPY + merge", rows, batch_size, use_copy=True)
+            copy_all = _time("COPY + merge (one batch)", rows, len(rows), True)
+            print(
+                f"  speedup: {values / copy:.1f}x per batch,"
+                f" {values / copy_all:.1f}x single batch"
+            )
+    finally:
+        _cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+    main(args.players, args.rounds, args.batch_size)
@@ -0,0 +1,149 @@
+"""Compare per-row pydantic parsing against batch validation of whole payloads.
+
+Times the old ingest loop (``Model(**raw).model_dump()`` per row inside
+try/except) against ``validate_rows`` on synthetic bootstrap elements and
+gameweek histories shaped like the API's, extra fields included.
+
+Usage:
+    uv run python scripts/benchmarks/bench_validation.py --players 300 --rounds 30
+"""
+
+import argparse
+import time
+
+from fantasy_optimizer.models.gameweek import PlayerGameweekStat
+from fantasy_optimizer.models.player import Player
+from fantasy_optimizer.models.validation import validate_rows
+
+
+def raw_gameweek(element: int, rnd: int) -> dict:
+    return {
+        "element": element,
+        "fixture": rnd,
+        "opponent_team": 1 + rnd % 16,
+        "total_points": (element * rnd) % 12,
+        "was_home": rnd % 2 == 0,
+        "kickoff_time": f"2025-{4 + rnd // 5:02d}-{1 + rnd % 28:02d}T17:00:00Z",
+        "team_h_score": 1,
+        "team_a_score": 0,
+        "round": rnd,
+        "minutes": 90,
+        "goals_scored": 0,
+        "assists": 0,
+        "clean_sheets": 1,
+        "goals_conceded": 0,
+        "own_goals": 0,
+        "penalties_saved": 0,
+        "penalties_missed": 0,
+        "yellow_cards": 0,
+        "red_cards": 0,
+        "saves": 0,
+        "bonus": 0,
+        # Fields the API sends that the model ignores
+        "bps": 12,
+        "influence": "10.2",
+        "creativity": "4.0",
+        "threat": "2.0",
+        "ict_index": "1.6",
+        "value": 55,
+        "transfers_balance": 0,
+        "selected": 1200,
+        "transfers_in": 10,
+        "transfers_out": 4,
+    }
+
+
+def raw_element(pid: int) -> dict:
+    return {
+        "id": pid,
+        "web_name": f"Player{pid}",
+        "first_name": "Erik",
+        "second_name": f"Svensson{pid}",
+        "team": 1 + pid % 16,
+        "element_type": 1 + pid % 4,
+        "now_cost": 55,
+        "status": "a",
+        "total_points": 40,
+        "minutes": 900,
+        "goals_scored": 2,
+        "assists": 1,
+        "clean_sheets": 3,
+        "goals_conceded": 9,
+        "own_goals": 0,
+        "penalties_saved": 0,
+        "penalties_missed": 0,
+        "yellow_cards": 1,
+        "red_cards": 0,
+        "saves": 0,
+        "bonus": 0,
+        "form": "4.1",
+        "selected_by_percent": "7.8",
+        "points_per_game": "4.0",
+        "ep_next": "4.5",
+        "ep_this": "4.0",
+        "event_points": 2,
+        "news": "",
+        "photo": f"{pid}.jpg",
+        "can_select": True,
+    }
+
+
+def per_row(model, raw: list[dict]) -> list[dict]:
+    rows = []
+    for r in raw:
+        try:
+            rows.append(model(**r).model_dump())
+        except Exception:
+            pass
+    return rows
+
+
+def _best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(label: str, model, raw: list[dict], repeats: int):
+    assert per_row(model, raw) == validate_rows(model, raw)[0]
+    before = _best_of(lambda: per_row(model, raw), repeats)
+    after = _best_of(lambda: validate_rows(model, raw), repeats)
+    print(f"{label} ({len(raw)} rows)")
+    print(
+        f"  per-row model + model_dump {before * 1e3:8.1f} ms  {len(raw) / before:10.0f} rows/s"
+    )
+    print(
+        f"  validate_rows              {after * 1e3:8.1f} ms  {len(raw) / after:10.0f} rows/s"
+    )
+    print(f"  speedup: {before / after:.1f}x")
+
+
+def main(players: int, rounds: int, repeats: int):
+    compare(
+        "Bootstrap elements",
+        Player,
+        [raw_element(p) for p in range(1, players + 1)],
+        repeats,
+    )
+    compare(
+        "Gameweek histories",
+        PlayerGameweekStat,
+        [
+            raw_gameweek(p, r)
+            for p in range(1, players + 1)
+            for r in range(1, rounds + 1)
+        ],
+        repeats,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    main(args.players, args.rounds, args.repeats)
@@ -1,10 +1,45 @@
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 from scipy.ndimage import gaussian_filter1d
-from tqdm import tqdm
+from sqlalchemy import text
+
+from fantasy_optimizer.config import ForecastConfig, load_forecast_config
+from fantasy_optimizer.forecasting.horizon import (
+    HorizonForecast,
+    build_horizon,
+    fixture_weights,
+    horizon_rounds,
+)
+from fantasy_optimizer.forecasting.incremental import DecayedPointStats
+from fantasy_optimizer.forecasting.pmf import (
+    PointsDistributions,
+    PoolPmfCache,
+    batch_points_pmf,
+    player_positions,
+    zero_boosts,
+)
+from fantasy_optimizer.forecasting.strength import StrengthModel
+from fantasy_optimizer.names import NameIndex, NameMap
 
 TOTAL_ROUNDS = 30
 
+# Upcoming rounds covered by each run's horizon forecast
+HORIZON = 5
+
+# Decayed per-player statistics for --incremental builds
+STATE_PATH = Path(__file__).resolve().parents[1] / "data" / "forecast_state.npz"
+
+# Enhanced-stats name -> player id mapping, extended as new names appear
+NAMES_PATH = Path(__file__).resolve().parents[1] / "data" / "enhanced_stats_names.json"
+
+# Stored with every forecast run; bump when the model changes so runs stay comparable
+MODEL_VERSION = "1"
+
+# Team ratings and fixture difficulty, refitted only when results change
+STRENGTH = StrengthModel()
+
 
 def _empirical_decay_pmf(points: np.ndarray, decay: float = 0.9):
     if len(points) == 0:
@@ -101,71 +136,139 @@ def build_points_pmf(
     return grid, pmf
 
 
-def build_simulation_forecasts(df: pd.DataFrame) -> pd.DataFrame:
+def build_simulation_distributions(
+    df: pd.DataFrame,
+    pool_cache: PoolPmfCache | None = None,
+    config: ForecastConfig | None = None,
+) -> PointsDistributions:
+    """Every player's points PMF for the round after the latest one in ``df``.
+
+    Position pools come from ``pool_cache`` if given, else from a fresh cache.
+    """
     latest_round = int(df["round"].max())  # type: ignore[arg-type]
+    if pool_cache is None:
+        pool_cache = PoolPmfCache()
+    if config is None:
+        config = ForecastConfig()
 
     position_col = next(
         (c for c in ["position", "element_type"] if c in df.columns), None
     )
 
-    pool_points_by_pos: dict = {}
+    grouped = df.groupby("element")["total_points"].apply(list)
+    print(f"Building pmf (GW {latest_round}) for {len(grouped)} players")
+
+    pools: list = [None] * len(grouped)
     if position_col is not None:
-        for pos_val, sub in df.groupby(position_col):
-            pool_points_by_pos[pos_val] = sub["total_points"].astype(int).to_numpy()
-
-    def get_player_pool_points(player_id: int) -> np.ndarray | None:
-        if position_col is None:
-            return None
-        sub = df.loc[df["element"] == player_id, position_col]
-        if sub.empty:
-            return None
-        pos_val = sub.mode(dropna=True).iloc[0]
-        return pool_points_by_pos.get(pos_val)
+        # One PMF per position, shared by its players
+        pool_by_pos = {
+            pos: pool_cache.get(
+                pos, latest_round, sub["total_points"].astype(int).to_numpy()
+            )
+            for pos, sub in df.groupby(position_col)
+        }
+        positions = player_positions(df, position_col).reindex(grouped.index)
+        pools = [pool_by_pos.get(pos) for pos in positions]
+
+    # Same model as build_points_pmf per player, for every player at once
+    histories = [np.asarray(h, dtype=int) for h in grouped]
+    pmfs = batch_points_pmf(
+        histories,
+        pools=pools,
+        decay=config.decay,
+        mix_with_pool=config.mix_with_pool,
+        zero_boost=zero_boosts(histories, window=config.zero_window),
+        smooth_sigma=config.smooth_sigma,
+    )
+    return PointsDistributions.from_batch(grouped.index.to_numpy(), pmfs)
 
-    grouped = df.groupby("element")["total_points"].apply(list)
 
-    results = []
-    for player_id, history in tqdm(
-        grouped.items(),
-        desc=f"Building pmf (GW {latest_round})",
-        total=len(grouped),
-        unit="player",
-    ):
-        pts = np.asarray(history, dtype=int)
-
-        if pts.size:
-            w = 0.8 ** np.arange(min(6, pts.size))[::-1]
-            recent = pts[-len(w) :]
-            zero_rate = (w * (recent == 0)).sum() / w.sum()
-            zero_boost = float(np.clip(0.5 * zero_rate, 0.0, 0.06))
-        else:
-            zero_boost = 0.0
-
-        grid, pmf = build_points_pmf(
-            player_points=pts,
-            decay=0.9,
-            pool_points=get_player_pool_points(int(player_id)),  # type: ignore[arg-type]
-            mix_with_pool=0.20,
-            zero_boost=zero_boost,
-            smooth_sigma=0.4,
-        )
+def build_incremental_distributions(
+    stats: DecayedPointStats,
+    new_rows: pd.DataFrame,
+    config: ForecastConfig | None = None,
+) -> PointsDistributions:
+    """Fold ``new_rows`` into ``stats`` and rebuild every player's PMF from it.
 
-        results.append(
-            {"player_id": player_id, "expected_points": float((grid * pmf).sum())}
-        )
+    Matches ``build_simulation_distributions`` on the full season when there are
+    no position pools (``player_gameweek_stats`` has no position column). The
+    decay and zero window are the ones ``stats`` was built with.
+    """
+    if config is None:
+        config = ForecastConfig()
+    stats.fold(new_rows)
+    pmfs = stats.pmfs(
+        mix_with_pool=config.mix_with_pool, smooth_sigma=config.smooth_sigma
+    )
+    return PointsDistributions.from_batch(stats.player_ids, pmfs)
+
+
+def build_simulation_forecasts(
+    df: pd.DataFrame,
+    pool_cache: PoolPmfCache | None = None,
+    config: ForecastConfig | None = None,
+) -> pd.DataFrame:
+    """Expected points plus variance, P(0) and P(haul) per player."""
+    return build_simulation_distributions(df, pool_cache, config).summary()
+
+
+def build_forecast_horizon(
+    forecast_df: pd.DataFrame,
+    player_teams: pd.Series,
+    fixtures: pd.DataFrame,
+    next_round: int,
+    horizon: int = HORIZON,
+    strength: StrengthModel | None = None,
+) -> HorizonForecast | None:
+    """Players x upcoming rounds expected points, blanks and doubles included.
+
+    ``forecast_df`` holds per-match ``expected_points``; ``player_teams`` maps
+    player ids to team ids and ``fixtures`` has a row per team per match
+    (``team``, ``round``). With ``strength``, it is fitted to the played
+    fixtures and each match is scaled by its opponent and venue. None once the
+    season has no rounds left.
+    """
+    rounds = horizon_rounds(next_round, horizon, TOTAL_ROUNDS)
+    if not rounds.size:
+        return None
+    weights = fixture_weights
+    if strength is not None and fixtures["team_score"].notna().any():
+        strength.fit(fixtures)
+        weights = strength.difficulty
+    player_ids = forecast_df["player_id"].to_numpy()
+    return build_horizon(
+        player_ids,
+        player_teams.reindex(player_ids).to_numpy(),
+        forecast_df["expected_points"].to_numpy(),
+        fixtures,
+        rounds,
+        weights,
+    )
 
-    return pd.DataFrame(results)
 
+def enhanced_stats_index(players: pd.DataFrame) -> NameIndex:
+    """Index ``players`` under both their full name and their web name.
 
-def build_enhanced_stats_forecasts(conn) -> pd.DataFrame | None:
+    Both names go into one index: an exact match prefers the full name, and a
+    fuzzy match takes whichever name scores the best ratio.
     """
-    Use xFP from enhanced_stats as expected_points, joined to players table by name.
+    full_names = (players["first_name"] + " " + players["second_name"]).str.strip()
+    return NameIndex(
+        pd.concat([players["id"], players["id"]]).tolist(),
+        pd.concat([full_names, players["web_name"]]).fillna("").tolist(),
+    )
+
 
-    Returns a DataFrame with columns [player_id, expected_points], or None
-    if the enhanced_stats table is empty.
+def build_enhanced_stats_forecasts(
+    conn, names_path: Path = NAMES_PATH
+) -> pd.DataFrame | None:
     """
-    import difflib
+    Use xFP from enhanced_stats as expected_points, joined to players table by name.
 
+    Names are resolved through the mapping saved at ``names_path``; only names not
+    seen before are fuzzy-matched. Returns a DataFrame with columns
+    [player_id, expected_points], or None if the enhanced_stats table is empty.
+    """
     es = pd.read_sql(
         text('SELECT name, "xFP" FROM enhanced_stats WHERE "xFP" IS NOT NULL'),
         conn,
@@ -177,69 +280,159 @@ def build_enhanced_stats_forecasts(conn) -> pd.DataFrame | None:
         text("SELECT id, web_name, first_name, second_name FROM players"),
         conn,
     )
-    players["full_name"] = (
-        players["first_name"] + " " + players["second_name"]
-    ).str.strip()
-
-    player_names = players["full_name"].tolist()
-
-    def match_name(es_name: str) -> int | None:
-        matches = difflib.get_close_matches(es_name, player_names, n=1, cutoff=0.6)
-        if not matches:
-            # fallback: try matching against web_name
-            web_names = players["web_name"].tolist()
-            matches = difflib.get_close_matches(es_name, web_names, n=1, cutoff=0.6)
-            if not matches:
-                return None
-            idx = players[players["web_name"] == matches[0]].index[0]
-        else:
-            idx = players[players["full_name"] == matches[0]].index[0]
-        return int(players.loc[idx, "id"])
-
-    results = []
-    unmatched = []
-    for _, row in es.iterrows():
-        player_id = match_name(row["name"])
-        if player_id is None:
-            unmatched.append(row["name"])
-            continue
-        results.append({"player_id": player_id, "expected_points": float(row["xFP"])})
-
-    if unmatched:
+
+    name_map = NameMap.load(names_path)
+    new_unmatched = name_map.resolve(
+        es["name"], lambda: enhanced_stats_index(players), valid_ids=players["id"]
+    )
+    name_map.save(names_path)
+    if new_unmatched:
         print(
-            f"Could not match {len(unmatched)} enhanced_stats players to DB: {unmatched[:5]}..."
+            f"Could not match {len(new_unmatched)} enhanced_stats players to DB:"
+            f" {new_unmatched}"
         )
 
-    return pd.DataFrame(results) if results else None
+    player_ids = pd.Series(name_map.lookup(es["name"]), index=es.index, dtype="Int64")
+    matched = player_ids.notna()
+    if not matched.any():
+        return None
+    return pd.DataFrame(
+        {
+            "player_id": player_ids[matched].astype(int).to_numpy(),
+            "expected_points": es.loc[matched, "xFP"].astype(float).to_numpy(),
+        }
+    )
 
 
 if __name__ == "__main__":
-    from sqlalchemy import text
+    import argparse
+    from datetime import date
 
-    from fantasy_optimizer.db.database import engine
-    from fantasy_optimizer.db.upsert import upsert_forecasts
+    from fantasy_optimizer.db.database import get_engine, pool_stats
+    from fantasy_optimizer.db.forecasts import save_forecast_run
 
-    with engine.connect() as conn:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--model-version",
+        default=MODEL_VERSION,
+        help=f"Version label stored with this run (default {MODEL_VERSION})",
+    )
+    parser.add_argument(
+        "--horizon",
+        type=int,
+        default=HORIZON,
+        help=f"Upcoming rounds to forecast with fixtures (default {HORIZON})",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Fold only rounds newer than the saved state into the simulation forecast",
+    )
+    args = parser.parse_args()
+
+    season = date.today().year
+    forecast_cfg = load_forecast_config()
+    # The run's gameweek comes from the primary, so a lagging replica cannot
+    # mislabel it
+    with get_engine().connect() as conn:
+        last_round = conn.execute(
+            text("SELECT max(round) FROM player_gameweek_stats WHERE season = :season"),
+            {"season": season},
+        ).scalar()
+    gameweek = (last_round or 0) + 1
+
+    # The scans below are read-only, so they can go to a replica
+    with get_engine(replica=True).connect() as conn:
         print("Checking for enhanced stats data...")
         forecast_df = build_enhanced_stats_forecasts(conn)
+        model_name = "enhanced_stats"
+        distributions = None
 
         if forecast_df is not None:
             print(f"Using enhanced stats xFP for {len(forecast_df)} players.")
         else:
             print("No enhanced stats data found — falling back to simulation forecast.")
-            print("Loading current-season gameweek stats...")
-            df = pd.read_sql(
-                text(
-                    "SELECT * FROM player_gameweek_stats"
-                    " WHERE kickoff_time::timestamp >= date_trunc('year', CURRENT_DATE)"
-                ),
-                conn,
-            )
-            if df.empty:
-                print("No current-season data found either. Run ingest.py first.")
-                raise SystemExit(1)
-            forecast_df = build_simulation_forecasts(df)
+            stats = None
+            if args.incremental and STATE_PATH.exists():
+                stats = DecayedPointStats.load(STATE_PATH)
+                # Counts decayed with other settings cannot be reused
+                if (stats.season, stats.decay, stats.window) != (
+                    season,
+                    forecast_cfg.decay,
+                    forecast_cfg.zero_window,
+                ):
+                    stats = None
+            if stats is not None:
+                # The last round is read whole again: it may have landed in parts
+                print(f"Folding rounds from {stats.last_round} into saved stats...")
+                new_rows = pd.read_sql(
+                    text(
+                        "SELECT element, round, fixture, total_points"
+                        " FROM player_gameweek_stats"
+                        " WHERE season = :season AND round >= :last"
+                    ),
+                    conn,
+                    params={"season": season, "last": stats.last_round},
+                )
+                distributions = build_incremental_distributions(
+                    stats, new_rows, forecast_cfg
+                )
+                print(f"Folded {len(new_rows)} rows for {len(stats)} players")
+            else:
+                print("Loading current-season gameweek stats...")
+                df = pd.read_sql(
+                    text(
+                        "SELECT * FROM player_gameweek_stats WHERE season = :season"
+                        " ORDER BY element, round, fixture"
+                    ),
+                    conn,
+                    params={"season": season},
+                )
+                if df.empty:
+                    print("No current-season data found either. Run ingest.py first.")
+                    raise SystemExit(1)
+                distributions = build_simulation_distributions(df, config=forecast_cfg)
+                # Seed the state so the next build can be incremental
+                stats = DecayedPointStats(
+                    season, forecast_cfg.decay, forecast_cfg.zero_window
+                )
+                stats.fold(df)
+            stats.save(STATE_PATH)
+            forecast_df = distributions.summary()
+            model_name = "simulation"
+
+        player_teams = pd.read_sql(
+            text("SELECT id, team FROM players"), conn, index_col="id"
+        )["team"]
+        # Played rows fit the team strengths; upcoming ones make the horizon
+        fixtures = pd.read_sql(
+            text(
+                "SELECT round, team, opponent_team, was_home, team_score"
+                " FROM fixtures WHERE season = :season AND round < :stop"
+            ),
+            conn,
+            params={"season": season, "stop": gameweek + args.horizon},
+        )
+        horizon = build_forecast_horizon(
+            forecast_df, player_teams, fixtures, gameweek, args.horizon, STRENGTH
+        )
 
-    upsert_forecasts(forecast_df.to_dict(orient="records"))
-    print(f"Saved {len(forecast_df)} forecasts to DB")
+    run_id = save_forecast_run(
+        forecast_df.to_dict(orient="records"),
+        model_name=model_name,
+        model_version=args.model_version,
+        gameweek=gameweek,
+        distributions=distributions,
+        horizon=horizon,
+    )
+    print(
+        f"Saved {len(forecast_df)} forecasts to DB"
+        f" (run {run_id}: {model_name} v{args.model_version}, GW {gameweek})"
+    )
     print(forecast_df.sort_values("expected_points", ascending=False).head())
+    if horizon is not None:
+        print(
+            f"Horizon: rounds {horizon.rounds[0]}-{horizon.rounds[-1]},"
+            f" {(horizon.expected == 0).all(axis=0).sum()} rounds blank for everyone"
+        )
+    print(f"DB pool: {pool_stats()}")
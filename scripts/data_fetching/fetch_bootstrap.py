@@ -1,31 +1,25 @@
 from loguru import logger
 
-from fantasy_optimizer.api_client import fetch_bootstrap_static
+from fantasy_optimizer.api_client import load_bootstrap
+from fantasy_optimizer.bootstrap import BootstrapSnapshot
 from fantasy_optimizer.db.upsert import upsert_players, upsert_teams
 from fantasy_optimizer.models.player import Player
 from fantasy_optimizer.models.team import Team
+from fantasy_optimizer.models.validation import validate_rows
 
 
-def main(force_refresh: bool = True):
-    data = fetch_bootstrap_static(force_refresh=force_refresh)
-
-    teams = []
-    for raw in data["teams"]:
-        try:
-            teams.append(Team(**raw).model_dump())
-        except Exception as e:
-            logger.warning("Failed to parse team ID %s: %s", raw.get("id"), e)
+def main(force_refresh: bool = True, snapshot: BootstrapSnapshot | None = None):
+    data = snapshot or load_bootstrap(force_refresh=force_refresh)
 
+    teams, report = validate_rows(Team, data["teams"])
+    if report:
+        logger.warning("Rejected invalid teams:\n{}", report)
     upsert_teams(teams)
     print(f"Upserted {len(teams)} teams to DB")
 
-    players = []
-    for raw in data["elements"]:
-        try:
-            players.append(Player(**raw).model_dump())
-        except Exception as e:
-            logger.warning("Failed to parse player ID %s: %s", raw.get("id"), e)
-
+    players, report = validate_rows(Player, data["elements"])
+    if report:
+        logger.warning("Rejected invalid players:\n{}", report)
     upsert_players(players)
     print(f"Upserted {len(players)} players to DB")
 
@@ -51,13 +51,17 @@ def build_fixture_frame(data: list[dict]) -> pd.DataFrame:
     return df.drop_duplicates(subset=["season", "round", "team", "was_home"])
 
 
-def main():
+def save_fixtures(data: list[dict]) -> int:
     from fantasy_optimizer.db.upsert import upsert_fixtures
 
-    data = fetch_fixtures()
     df = build_fixture_frame(data)
     upsert_fixtures(df.to_dict(orient="records"))
     print(f"Upserted {len(df)} fixture rows to DB")
+    return len(df)
+
+
+def main():
+    save_fixtures(fetch_fixtures())
 
 
 if __name__ == "__main__":
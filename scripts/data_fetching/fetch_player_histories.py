@@ -1,45 +1,200 @@
-from time import sleep
+import json
+import time
+from collections.abc import Iterator
+from pathlib import Path
 
 from loguru import logger
 
-from fantasy_optimizer.api_client import fetch_bootstrap_static, fetch_player_history
+from fantasy_optimizer.api_client import (
+    DATA_DIR,
+    HISTORY_STORE,
+    fetch_player_history,
+    load_bootstrap,
+    refresh_player_history,
+)
+from fantasy_optimizer.bootstrap import BootstrapSnapshot
+from fantasy_optimizer.config import load_ingest_config
+from fantasy_optimizer.db.database import database_key
 from fantasy_optimizer.db.upsert import upsert_gameweek_stats
+from fantasy_optimizer.http import RateLimiter
 from fantasy_optimizer.models.gameweek import PlayerGameweekStat
+from fantasy_optimizer.models.validation import ValidationReport, validate_rows
+from fantasy_optimizer.pipeline import Pipeline
 
-BATCH_SIZE = 50
+# Per-player bootstrap totals as of the last completed history ingest, per database
+WATERMARK_PATH = DATA_DIR / "history_watermarks.json"
+WATERMARK_FIELDS = ("total_points", "minutes", "event_points")
 
 
-def main(force_refresh: bool = False):
-    data = fetch_bootstrap_static(force_refresh=force_refresh)
-    player_ids = [p["id"] for p in data["elements"]]
+def element_watermark(element: dict) -> list:
+    return [element.get(field) for field in WATERMARK_FIELDS]
+
+
+def _read_watermark_file(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        data = json.load(f)
+    # A file from before watermarks were kept per database is ignored
+    return {k: v for k, v in data.items() if isinstance(v, dict)}
+
+
+def load_watermarks(db_key: str, path: Path | None = None) -> dict[int, list]:
+    """Watermarks recorded against the database ``db_key``; empty if there are none."""
+    stored = _read_watermark_file(path or WATERMARK_PATH).get(db_key, {})
+    return {int(pid): mark for pid, mark in stored.items()}
+
+
+def save_watermarks(
+    watermarks: dict[int, list], db_key: str, path: Path | None = None
+) -> None:
+    path = path or WATERMARK_PATH
+    data = _read_watermark_file(path)
+    data[db_key] = {str(pid): mark for pid, mark in watermarks.items()}
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def changed_player_ids(elements: list[dict], watermarks: dict[int, list]) -> list[int]:
+    """IDs whose bootstrap totals differ from the watermark (or have none yet)."""
+    return [
+        p["id"] for p in elements if watermarks.get(p["id"]) != element_watermark(p)
+    ]
+
+
+def main(
+    force_refresh: bool = False,
+    concurrency: int | None = None,
+    incremental: bool = False,
+    snapshot: BootstrapSnapshot | None = None,
+):
+    """Fetch every player's gameweek history and upsert it in batches.
+
+    Runs as a three-stage pipeline joined by bounded queues (``[ingest]`` in
+    config.toml sizes the queues and batches): ``concurrency`` fetch threads sharing
+    one rate limiter, a validator, and a single DB writer. Fetching continues while
+    a batch is being written, and fetchers wait when the writer falls behind.
+
+    With ``force_refresh`` every cached history is revalidated with its stored
+    ETag/Last-Modified; players the server reports as unchanged (304) are neither
+    re-parsed nor re-upserted. To reload an empty database from the local cache,
+    run without ``force_refresh``.
+
+    With ``incremental`` the bootstrap is refreshed and only players whose
+    ``total_points``, ``minutes`` or ``event_points`` moved since the last completed
+    ingest against the same database (see ``WATERMARK_PATH``) are re-fetched and
+    upserted; with no watermarks for the database every player is.
+
+    ``snapshot`` is the bootstrap already loaded by an earlier step; without it the
+    bootstrap is loaded here, refreshed when ``force_refresh`` or ``incremental``.
+    """
+    cfg = load_ingest_config()
+    concurrency = max(1, concurrency or cfg.concurrency)
+    rate_limiter = RateLimiter(min_interval=cfg.request_interval)
+
+    if snapshot is None:
+        snapshot = load_bootstrap(force_refresh=force_refresh or incremental)
+    elements = snapshot.elements
+    db_key = database_key()
+    watermarks = load_watermarks(db_key) if incremental else {}
+    if incremental and not watermarks:
+        print("Incremental: no watermarks for this database, fetching every player")
+        player_ids = [p["id"] for p in elements]
+    elif incremental:
+        player_ids = changed_player_ids(elements, watermarks)
+        print(
+            f"Incremental: {len(player_ids)} of {len(elements)} players changed,"
+            f" skipping {len(elements) - len(player_ids)}"
+        )
+    else:
+        player_ids = [p["id"] for p in elements]
     print(
-        f"Fetching gameweek histories for {len(player_ids)} players (force_refresh={force_refresh})"
+        f"Fetching gameweek histories for {len(player_ids)} players"
+        f" (force_refresh={force_refresh}, concurrency={concurrency})"
     )
 
-    batch = []
+    def fetch(pids: Iterator[int]) -> Iterator[dict | None]:
+        for pid in pids:
+            if incremental:
+                # Totals moved: revalidate rather than trust the cache, falling back
+                # to the stored copy only if the server still answers 304
+                yield fetch_player_history(
+                    pid, force_refresh=True, rate_limiter=rate_limiter
+                )
+            elif force_refresh:
+                yield refresh_player_history(pid, rate_limiter=rate_limiter)
+            else:
+                yield fetch_player_history(pid, rate_limiter=rate_limiter)
+
+    unchanged = 0
+    report = ValidationReport(PlayerGameweekStat.__name__)
+
+    def validate(payloads: Iterator[dict | None]) -> Iterator[list[dict]]:
+        nonlocal unchanged, report
+        raw: list[dict] = []
+        valid: list[dict] = []
+
+        def check() -> None:
+            nonlocal report
+            rows, batch_report = validate_rows(PlayerGameweekStat, raw, key="element")
+            report += batch_report
+            valid.extend(rows)
+            raw.clear()
+
+        for history_json in payloads:
+            if history_json is None:
+                unchanged += 1
+                continue
+            raw.extend(history_json["history"])
+            if len(raw) >= cfg.validate_batch_size:
+                check()
+            if len(valid) >= cfg.write_batch_size:
+                yield valid
+                valid = []
+        if raw:
+            check()
+        if valid:
+            yield valid
+
     total_saved = 0
 
-    for i, pid in enumerate(player_ids):
-        history_json = fetch_player_history(pid, force_refresh=force_refresh)
-        for raw_gw in history_json["history"]:
-            try:
-                stat = PlayerGameweekStat(**raw_gw)
-                batch.append(stat.model_dump())
-            except Exception as e:
-                logger.warning("Failed to parse GW stat for player %s: %s", pid, e)
-        sleep(0.05)
-
-        if len(batch) >= BATCH_SIZE:
-            upsert_gameweek_stats(batch)
-            total_saved += len(batch)
-            batch = []
-            print(f"  {total_saved} stats saved ({i + 1}/{len(player_ids)} players)...")
-
-    if batch:
-        upsert_gameweek_stats(batch)
-        total_saved += len(batch)
+    def write(batches: Iterator[list[dict]]) -> Iterator[int]:
+        nonlocal total_saved
+        for rows in batches:
+            upsert_gameweek_stats(rows, use_copy=cfg.bulk_copy)
+            total_saved += len(rows)
+            print(f"  {total_saved} stats saved...")
+            yield len(rows)
+
+    pipeline = (
+        Pipeline(queue_size=cfg.queue_size)
+        .add_stage("fetch", fetch, workers=concurrency)
+        .add_stage("validate", validate)
+        .add_stage("write", write)
+    )
+    start = time.perf_counter()
+    try:
+        pipeline.run(player_ids)
+    finally:
+        # Keep what was fetched even if a later stage failed
+        written = HISTORY_STORE.flush()
+        if written:
+            print(f"Cached {written} fetched histories in {HISTORY_STORE.root}")
+
+    if report:
+        logger.warning("Rejected invalid gameweek stats:\n{}", report)
+    save_watermarks({p["id"]: element_watermark(p) for p in elements}, db_key)
 
+    elapsed = time.perf_counter() - start
+    rate = len(player_ids) / elapsed if elapsed > 0 else float("inf")
     print(f"Upserted {total_saved} player gameweek stats to DB")
+    if unchanged:
+        print(f"Skipped {unchanged} players whose history was not modified")
+    print(
+        f"Processed {len(player_ids)} players in {elapsed:.1f}s ({rate:.1f} players/s)"
+    )
+    for stats in pipeline.stats:
+        print(f"  {stats}")
 
 
 if __name__ == "__main__":
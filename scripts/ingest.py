@@ -4,26 +4,99 @@ Single entrypoint for all data ingestion.
 Usage:
     uv run python scripts/ingest.py            # use cached player histories
     uv run python scripts/ingest.py --refresh  # force re-fetch everything from API
+    uv run python scripts/ingest.py --refresh --concurrency 16
+    uv run python scripts/ingest.py --incremental  # only players whose totals changed
+    uv run python scripts/ingest.py --force    # rewrite stages whose inputs are unchanged
+
+The steps run as a dependency graph: the fixtures fetch runs alongside the
+bootstrap, and once the bootstrap is in, players/teams and player histories run
+in parallel. Players/teams and fixtures are skipped when their payload hashes the
+same as at the last successful run against the same database.
 """
 
 import argparse
+import json
 
 from data_fetching.fetch_bootstrap import main as fetch_bootstrap
-from data_fetching.fetch_fixtures import main as fetch_fixtures
+from data_fetching.fetch_fixtures import fetch_fixtures, save_fixtures
 from data_fetching.fetch_player_histories import main as fetch_player_histories
 
+from fantasy_optimizer.api_client import DATA_DIR, load_bootstrap
+from fantasy_optimizer.bootstrap import BootstrapSnapshot, content_hash
+from fantasy_optimizer.dag import DagRunner, Stage, load_hashes, save_hashes
+from fantasy_optimizer.db.database import database_key, pool_stats
+from fantasy_optimizer.http import get_client
+
+# Input hashes of the last successful run of each stage, per database
+STATE_PATH = DATA_DIR / "ingest_state.json"
+
+
+def build_stages(
+    force_refresh: bool = False,
+    concurrency: int | None = None,
+    incremental: bool = False,
+) -> list[Stage]:
+    def bootstrap() -> BootstrapSnapshot:
+        # Loaded (and refreshed) once, then shared by every stage that needs it
+        return load_bootstrap(force_refresh=force_refresh or incremental)
+
+    def players_teams(bootstrap: BootstrapSnapshot) -> None:
+        fetch_bootstrap(snapshot=bootstrap)
 
-def main(force_refresh: bool = False):
-    print("=== Step 1/3: Players & Teams ===")
-    fetch_bootstrap(force_refresh=force_refresh)
+    def fixtures(fixtures_api: list[dict]) -> None:
+        save_fixtures(fixtures_api)
 
-    print("\n=== Step 2/3: Fixtures ===")
-    fetch_fixtures()
+    def histories(bootstrap: BootstrapSnapshot) -> None:
+        fetch_player_histories(
+            force_refresh=force_refresh,
+            concurrency=concurrency,
+            incremental=incremental,
+            snapshot=bootstrap,
+        )
 
-    print("\n=== Step 3/3: Player Gameweek Histories ===")
-    fetch_player_histories(force_refresh=force_refresh)
+    return [
+        Stage("bootstrap", bootstrap),
+        Stage("fixtures_api", fetch_fixtures),
+        Stage(
+            "players_teams",
+            players_teams,
+            deps=("bootstrap",),
+            input_hash=lambda bootstrap: bootstrap.content_hash,
+        ),
+        Stage(
+            "fixtures",
+            fixtures,
+            deps=("fixtures_api",),
+            input_hash=lambda fixtures_api: content_hash(
+                json.dumps(fixtures_api, sort_keys=True).encode()
+            ),
+        ),
+        # Histories skip unchanged players themselves (304s and watermarks)
+        Stage("histories", histories, deps=("bootstrap",)),
+    ]
 
-    print("\nIngestion complete.")
+
+def main(
+    force_refresh: bool = False,
+    concurrency: int | None = None,
+    incremental: bool = False,
+    force: bool = False,
+):
+    state = load_hashes(STATE_PATH)
+
+    runner = DagRunner(
+        build_stages(force_refresh, concurrency, incremental),
+        hashes=state.setdefault(database_key(), {}),
+        force=force,
+    )
+    try:
+        runner.run()
+        print("\nIngestion complete.")
+    finally:
+        save_hashes(state, STATE_PATH)
+        print(f"\n{runner.report()}")
+        print(f"HTTP: {get_client().stats}")
+        print(f"DB pool: {pool_stats()}")
 
 
 if __name__ == "__main__":
@@ -33,5 +106,26 @@ if __name__ == "__main__":
         action="store_true",
         help="Force re-fetch from API instead of using cache",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Worker threads for player-history fetching (default: config.toml)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Refresh the bootstrap and only re-fetch histories whose totals changed",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Write players, teams and fixtures even if their payloads are unchanged",
+    )
     args = parser.parse_args()
-    main(force_refresh=args.refresh)
+    main(
+        force_refresh=args.refresh,
+        concurrency=args.concurrency,
+        incremental=args.incremental,
+        force=args.force,
+    )
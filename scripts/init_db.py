@@ -1,5 +1,11 @@
+from pathlib import Path
+
 import fantasy_optimizer.db.models  # noqa: F401 — registers all ORM models with Base
-from fantasy_optimizer.db.database import Base, engine
+from alembic import command
+from alembic.config import Config
+from fantasy_optimizer.db.database import Base, get_engine
 
-Base.metadata.create_all(engine)
+Base.metadata.create_all(get_engine())
+# Fresh tables already match the models, so later migrations start from here
+command.stamp(Config(str(Path(__file__).parent.parent / "alembic.ini")), "head")
 print("Tables created successfully")
@@ -0,0 +1,59 @@
+"""One-shot migration of data/player_histories/*.json into the columnar history store.
+
+Usage:
+    uv run python scripts/migrate_history_cache.py
+    uv run python scripts/migrate_history_cache.py --delete-json  # remove old files after
+"""
+
+import argparse
+import json
+import time
+
+from fantasy_optimizer.api_client import HISTORY_DIR, HISTORY_STORE
+from fantasy_optimizer.history_store import migrate_json_cache
+
+
+def _json_cache_files():
+    return sorted(HISTORY_DIR.glob("*.json")) + sorted(HISTORY_DIR.glob("*.json.meta"))
+
+
+def main(delete_json: bool = False):
+    files = _json_cache_files()
+    if not files:
+        print(f"No JSON cache found in {HISTORY_DIR} — nothing to migrate.")
+        return
+
+    json_bytes = sum(p.stat().st_size for p in files)
+    start = time.perf_counter()
+    for path in HISTORY_DIR.glob("*.json"):
+        with open(path) as f:
+            json.load(f)
+    json_load = time.perf_counter() - start
+
+    n = migrate_json_cache(HISTORY_DIR, HISTORY_STORE)
+
+    start = time.perf_counter()
+    for table in ("history", "history_past", "fixtures"):
+        HISTORY_STORE.load(table)
+    store_load = time.perf_counter() - start
+
+    store_bytes = HISTORY_STORE.disk_usage()
+    print(f"Migrated {n} player histories into {HISTORY_STORE.root}")
+    print(f"  disk: {json_bytes / 1e6:.1f} MB JSON -> {store_bytes / 1e6:.1f} MB store")
+    print(f"  full-league load: {json_load:.2f}s JSON -> {store_load:.3f}s store")
+
+    if delete_json:
+        for path in files:
+            path.unlink()
+        print(f"Deleted {len(files)} files from {HISTORY_DIR}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--delete-json",
+        action="store_true",
+        help="Delete the per-player JSON files once they are in the store",
+    )
+    args = parser.parse_args()
+    main(delete_json=args.delete_json)
@@ -4,27 +4,27 @@ from pathlib import Path
 
 import cvxpy as cp
 import pandas as pd
-from sqlalchemy import text
 
-from fantasy_optimizer.api_client import fetch_bootstrap_static
-from fantasy_optimizer.config import load_config
-from fantasy_optimizer.db.database import engine
+from fantasy_optimizer.api_client import load_bootstrap
+from fantasy_optimizer.config import load_config, load_simulation_config
+from fantasy_optimizer.db.database import get_engine
+from fantasy_optimizer.db.forecasts import load_distributions, load_forecasts
+from fantasy_optimizer.forecasting.simulate import Squad, SquadSimulator
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "data"
 
 
 def load_player_data():
-    bootstrap = fetch_bootstrap_static()
-    players = pd.DataFrame(bootstrap["elements"])
-    teams = pd.DataFrame(bootstrap["teams"])
-    team_name_to_id = {row["name"]: row["id"] for _, row in teams.iterrows()}
+    bootstrap = load_bootstrap()
+    players = pd.DataFrame(bootstrap.elements)
+    team_name_to_id = dict(bootstrap.team_id_by_name)
     team_id_to_name = {v: k for k, v in team_name_to_id.items()}
     # Map team_division onto players so we can filter by division later
-    team_id_to_division = (
-        teams.set_index("id")["team_division"].to_dict()
-        if "team_division" in teams.columns
-        else {}
-    )
+    team_id_to_division = {
+        tid: t["team_division"]
+        for tid, t in bootstrap.team_by_id.items()
+        if "team_division" in t
+    }
     players["team_name"] = players["team"].map(team_id_to_name)  # type: ignore[arg-type]
     players["team_division"] = players["team"].map(team_id_to_division)  # type: ignore[arg-type]
     players["position"] = players["element_type"].map(
@@ -37,11 +37,10 @@ def load_player_data():
     return players, team_name_to_id
 
 
-def apply_forecast(players):
-    with engine.connect() as conn:
-        forecast_df = pd.read_sql(
-            text("SELECT player_id, expected_points FROM forecasts"), conn
-        )
+def apply_forecast(players, model_name=None, model_version=None, gameweek=None):
+    """Join a stored forecast run onto ``players``; the newest run by default."""
+    with get_engine(replica=True).connect() as conn:
+        forecast_df = load_forecasts(conn, model_name, model_version, gameweek)
     if forecast_df.empty:
         players["expected_points"] = players["form"].astype(float).fillna(0.0)
     else:
@@ -245,6 +244,47 @@ def build_optimizer(player_pool, current_team_ids, current_balance, max_transfer
     return cp.Problem(objective, constraints), x
 
 
+def simulate_squads(
+    players, squads, sim_cfg, model_name=None, model_version=None, gameweek=None
+):
+    """Score ``squads`` (label -> 15 player ids) on the same simulated gameweeks.
+
+    Each squad starts its highest-expected XI with the top two as captain and vice.
+    Returns the outcome summary per label, or None if the forecast run stored no
+    distributions.
+    """
+    with get_engine(replica=True).connect() as conn:
+        dists = load_distributions(conn, model_name, model_version, gameweek)
+    if dists is None:
+        return None
+    by_id = players.set_index("player_id")
+    known = set(dists.player_ids.tolist()) & set(by_id.index)
+    labels, lineups = [], []
+    for label, ids in squads.items():
+        if not set(ids) <= known:
+            print(f"Skipping {label}: some players have no forecast distribution")
+            continue
+        sub = by_id.loc[list(ids)]
+        lineups.append(
+            Squad.from_expected(
+                list(ids), sub["position"].tolist(), sub["expected_points"].to_numpy()
+            )
+        )
+        labels.append(label)
+    if not lineups:
+        return None
+    simulator = SquadSimulator(
+        dists,
+        by_id["position"].to_dict(),
+        seed=sim_cfg.seed,
+        batch_size=sim_cfg.batch_size,
+    )
+    outcomes = simulator.simulate(lineups, sim_cfg.n_scenarios, labels=labels)
+    summary = outcomes.summary()
+    summary["p_50_plus"] = outcomes.prob_at_least(50)
+    return summary
+
+
 def validate_team_file(path: str) -> dict:
     """Validate --team-file exists, is valid JSON, and contains exactly 15 players."""
     p = Path(path)
@@ -282,12 +322,25 @@ if __name__ == "__main__":
     parser.add_argument(
         "--save-team", action="store_true", help="Save the optimized team to a file"
     )
+    parser.add_argument(
+        "--forecast-model",
+        help="Forecast model name, e.g. simulation (default: newest run)",
+    )
+    parser.add_argument("--forecast-version", help="Forecast model version")
+    parser.add_argument("--forecast-gameweek", type=int, help="Forecast gameweek")
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="Compare the current and optimal squads' simulated gameweek totals",
+    )
     args = parser.parse_args()
 
     cfg = load_config()
     players, team_name_to_id = load_player_data()
 
-    players = apply_forecast(players)
+    players = apply_forecast(
+        players, args.forecast_model, args.forecast_version, args.forecast_gameweek
+    )
     players = enhance_features(players, cfg)
 
     players = players.rename(columns={"id": "player_id"})
@@ -351,3 +404,21 @@ if __name__ == "__main__":
             ]
         ]
     )
+
+    if args.simulate:
+        summary = simulate_squads(
+            players,
+            {
+                "current": list(current_team_ids),
+                "optimal": optimal_team["player_id"].tolist(),
+            },
+            load_simulation_config(),
+            args.forecast_model,
+            args.forecast_version,
+            args.forecast_gameweek,
+        )
+        if summary is None:
+            print("\nNo stored points distributions for this forecast run.")
+        else:
+            print("\nSimulated gameweek totals:")
+            print(summary.round(2))
@@ -0,0 +1,62 @@
+"""Tune the simulation forecast's parameters by walk-forward backtest.
+
+Scores every setting in ``tuning.SEARCH_SPACE`` (plus the current one) on a
+season, across a process pool, and writes the best into the ``[forecast]``
+section of config.toml.
+
+Usage:
+    uv run python scripts/tune_forecasts.py
+    uv run python scripts/tune_forecasts.py --season 2025 --metric mae --dry-run
+"""
+
+import argparse
+import time
+from dataclasses import asdict
+from datetime import date
+
+from backtest_forecasts import load_season
+
+from fantasy_optimizer.config import load_forecast_config, save_forecast_config
+from fantasy_optimizer.forecasting.tuning import METRICS, best_config, grid, tune
+
+
+def main(season: int, metric: str, processes: int | None, dry_run: bool):
+    rows = load_season(season)
+    if rows.empty:
+        print(f"No gameweek stats for season {season}. Run ingest.py first.")
+        raise SystemExit(1)
+
+    current = load_forecast_config()
+    configs = grid()
+    if current not in configs:
+        configs.append(current)
+
+    start = time.perf_counter()
+    trials = tune(rows, configs, processes=processes, metric=metric)
+    elapsed = time.perf_counter() - start
+    print(f"{len(trials)} trials on season {season} in {elapsed:.1f} s")
+    print(trials.head(10).to_string(index=False, float_format="%.4f"))
+
+    params = list(asdict(current))
+    now = trials[(trials[params] == list(asdict(current).values())).all(axis=1)]
+    best = best_config(trials)
+    print(f"Current {metric}: {now[metric].iloc[0]:.4f} with {current}")
+    print(f"Best {metric}: {trials[metric].iloc[0]:.4f} with {best}")
+    if dry_run or best == current:
+        return
+    save_forecast_config(best)
+    print("Wrote the best setting to config.toml")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--season", type=int, default=date.today().year)
+    parser.add_argument("--metric", choices=list(METRICS), default="log_loss")
+    parser.add_argument(
+        "--processes", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print results without writing config"
+    )
+    args = parser.parse_args()
+    main(args.season, args.metric, args.processes, args.dry_run)
@@ -1,5 +1,9 @@
 """Shared fixtures for the test suite."""
 
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
 import pytest
 
 
@@ -143,3 +147,82 @@ def sample_players_df():
         }
     )
     return df
+
+
+POSITIONS = ["GK", "DEF", "MID", "FWD"]
+
+
+@dataclass
+class SyntheticSeason:
+    players: pd.DataFrame  # element, round, fixture, total_points[, position]
+    results: pd.DataFrame  # round, team, opponent_team, was_home, team_score
+    attack: np.ndarray  # true team ratings the results were drawn from
+    defence: np.ndarray
+
+
+def synthetic_season(
+    rounds: int = 10,
+    players: int = 30,
+    seed: int = 0,
+    teams: int = 8,
+    joining: bool = False,
+    resting: int = 0,
+    hauls: bool = False,
+    mean_points: float = 2.5,
+    positions: bool = True,
+) -> SyntheticSeason:
+    """A season of random team results and per-player gameweek rows.
+
+    Teams are paired at random each round and score Poisson goals from hidden
+    attack/defence ratings, with a home advantage of 0.3. Player ``element`` plays
+    for team ``(element - 1) % teams + 1``; ``fixture`` identifies the match.
+    With ``joining`` players join over the first rounds (10 + 4 per round);
+    ``resting`` players sit out each round at random. ``hauls`` adds the odd big
+    score and some -1s, which widen the support as the season goes on.
+    """
+    rng = np.random.default_rng(seed)
+    attack = rng.normal(0, 0.4, teams)
+    defence = rng.normal(0, 0.4, teams)
+    results, fixture_of = [], {}
+    for rnd in range(1, rounds + 1):
+        for home, away in rng.permutation(teams).reshape(-1, 2):
+            gh = rng.poisson(np.exp(0.1 + 0.3 + attack[home] - defence[away]))
+            ga = rng.poisson(np.exp(0.1 + attack[away] - defence[home]))
+            results += [
+                (rnd, home + 1, away + 1, True, gh),
+                (rnd, away + 1, home + 1, False, ga),
+            ]
+            fixture_of[rnd, home + 1] = fixture_of[rnd, away + 1] = rnd * 100 + home
+
+    rows = []
+    for rnd in range(1, rounds + 1):
+        elements = np.arange(
+            1, (min(players, 10 + 4 * rnd) if joining else players) + 1
+        )
+        if resting:
+            elements = np.sort(rng.choice(elements, len(elements) - resting, False))
+        for element in elements.tolist():
+            points = int(rng.poisson(mean_points))
+            if hauls:
+                points = points if rng.random() > 0.02 else rnd * 2
+                points -= int(rng.random() < 0.05)
+            team = (element - 1) % teams + 1
+            rows.append((element, rnd, fixture_of[rnd, team], points))
+    df = pd.DataFrame(rows, columns=["element", "round", "fixture", "total_points"])
+    if positions:
+        df["position"] = [POSITIONS[e % 4] for e in df["element"]]
+    return SyntheticSeason(
+        df,
+        pd.DataFrame(
+            results,
+            columns=["round", "team", "opponent_team", "was_home", "team_score"],
+        ),
+        attack,
+        defence,
+    )
+
+
+@pytest.fixture()
+def make_season():
+    """Factory for ``synthetic_season``, shared by the forecasting tests."""
+    return synthetic_season
@@ -0,0 +1,142 @@
+"""Tests for the revalidating caches in fantasy_optimizer/api_client.py"""
+
+import json
+
+import pytest
+
+from fantasy_optimizer import api_client
+from fantasy_optimizer.history_store import HistoryStore
+from fantasy_optimizer.http import ConditionalResult, Validators
+
+
+@pytest.fixture()
+def fake_api(tmp_path, monkeypatch):
+    """Point the caches at tmp_path and serve one versioned payload per URL."""
+    monkeypatch.setattr(api_client, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(api_client, "HISTORY_STORE", HistoryStore(tmp_path / "store"))
+    monkeypatch.setattr(api_client.HISTORY_RATE_LIMITER, "min_interval", 0.0)
+    monkeypatch.setattr(api_client, "_bootstrap", None)
+    server = {"version": 1, "calls": []}
+
+    def fetch_if_modified(url, validators=Validators()):
+        server["calls"].append(validators)
+        etag = f'"v{server["version"]}"'
+        if validators.etag == etag:
+            return ConditionalResult(None, validators)
+        return ConditionalResult(
+            {"history": [{"round": server["version"]}]}, Validators(etag=etag)
+        )
+
+    monkeypatch.setattr(api_client, "fetch_if_modified", fetch_if_modified)
+    return server
+
+
+def _rounds(payload: dict) -> list[int]:
+    return [r["round"] for r in payload["history"]]
+
+
+def test_refresh_stages_payload_and_validators(fake_api):
+    data = api_client.refresh_player_history(7)
+    assert _rounds(data) == [1]
+    assert api_client.HISTORY_STORE.validators(7) == Validators(etag='"v1"')
+
+    api_client.HISTORY_STORE.flush()
+    reopened = HistoryStore(api_client.HISTORY_STORE.root)
+    assert _rounds(reopened.payload(7)) == [1]
+    assert reopened.validators(7) == Validators(etag='"v1"')
+
+
+def test_refresh_returns_none_when_not_modified(fake_api):
+    api_client.refresh_player_history(7)
+    api_client.HISTORY_STORE.flush()
+    assert api_client.refresh_player_history(7) is None
+    assert fake_api["calls"][-1] == Validators(etag='"v1"')
+
+
+def test_refresh_downloads_when_changed(fake_api):
+    api_client.refresh_player_history(7)
+    api_client.HISTORY_STORE.flush()
+    fake_api["version"] = 2
+    assert _rounds(api_client.refresh_player_history(7)) == [2]
+    assert api_client.HISTORY_STORE.validators(7) == Validators(etag='"v2"')
+
+
+def test_force_refresh_falls_back_to_cache_on_304(fake_api):
+    api_client.fetch_player_history(7)
+    api_client.HISTORY_STORE.flush()
+    assert _rounds(api_client.fetch_player_history(7, force_refresh=True)) == [1]
+
+
+def test_304_without_stored_payload_refetches_unconditionally(fake_api, monkeypatch):
+    store = api_client.HISTORY_STORE
+    monkeypatch.setattr(store, "validators", lambda pid: Validators(etag='"v1"'))
+    assert _rounds(api_client.fetch_player_history(7, force_refresh=True)) == [1]
+    assert fake_api["calls"] == [Validators(etag='"v1"'), Validators()]
+    assert 7 in store
+
+
+def test_cache_hit_skips_network(fake_api):
+    api_client.fetch_player_history(7)
+    api_client.fetch_player_history(7)
+    assert len(fake_api["calls"]) == 1
+
+
+def test_bootstrap_validators_sidecar(fake_api, tmp_path):
+    api_client.fetch_bootstrap_static(force_refresh=True)
+    meta = json.loads((tmp_path / "bootstrap-static.json.meta").read_text())
+    assert meta["etag"] == '"v1"'
+    assert api_client.fetch_bootstrap_static(force_refresh=True) == {
+        "history": [{"round": 1}]
+    }
+    assert fake_api["calls"][-1] == Validators(etag='"v1"')
+
+
+def test_bootstrap_missing_file_ignores_stale_validators(fake_api, tmp_path):
+    api_client.fetch_bootstrap_static(force_refresh=True)
+    (tmp_path / "bootstrap-static.json").unlink()
+    api_client.fetch_bootstrap_static(force_refresh=True)
+    assert fake_api["calls"][-1] == Validators()
+
+
+def test_load_bootstrap_parses_once_per_content(fake_api, tmp_path, monkeypatch):
+    first = api_client.load_bootstrap(force_refresh=True)
+    parses = []
+    monkeypatch.setattr(
+        api_client.BootstrapSnapshot,
+        "from_bytes",
+        classmethod(lambda cls, raw: parses.append(raw) or first),
+    )
+
+    # Unchanged file, a 304 refresh and a rewrite with the same bytes all reuse it
+    assert api_client.load_bootstrap() is first
+    assert api_client.load_bootstrap(force_refresh=True) is first
+    path = tmp_path / "bootstrap-static.json"
+    path.write_bytes(path.read_bytes())
+    assert api_client.load_bootstrap() is first
+    assert parses == []
+
+    path.write_text('{"elements": [{"id": 3}]}')
+    api_client.load_bootstrap()
+    assert parses == [b'{"elements": [{"id": 3}]}']
+
+
+def test_load_bootstrap_refresh_replaces_snapshot(fake_api):
+    first = api_client.load_bootstrap(force_refresh=True)
+    fake_api["version"] = 2
+    second = api_client.load_bootstrap(force_refresh=True)
+    assert second.content_hash != first.content_hash
+    assert second["history"] == [{"round": 2}]
+    assert api_client.load_bootstrap() is second
+
+
+def test_load_bootstrap_download_skips_reparse(fake_api, tmp_path, monkeypatch):
+    def from_bytes(cls, raw):
+        raise AssertionError("downloaded bootstrap was parsed again")
+
+    monkeypatch.setattr(
+        api_client.BootstrapSnapshot, "from_bytes", classmethod(from_bytes)
+    )
+    snapshot = api_client.load_bootstrap(force_refresh=True)
+    raw = (tmp_path / "bootstrap-static.json").read_bytes()
+    assert json.loads(raw) == snapshot.data == {"history": [{"round": 1}]}
+    assert snapshot.content_hash == api_client.content_hash(raw)
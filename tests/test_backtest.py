@@ -0,0 +1,80 @@
+"""Tests for fantasy_optimizer/forecasting/backtest.py."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fantasy_optimizer.forecasting.backtest import Backtest, score_round
+from fantasy_optimizer.forecasting.pmf import PmfBatch, PoolPmfCache
+from scripts.build_forecasts import build_simulation_distributions
+
+
+def test_round_pmfs_match_forecast_build_on_earlier_rows(make_season):
+    # Pool points are decayed in the forecast query's order
+    df = make_season(joining=True).players.sort_values(["element", "round", "fixture"])
+    backtest = Backtest(df.sample(frac=1, random_state=0))
+    for features in backtest.features()[::3]:
+        before = df[df["round"] < features.round]
+        expected = build_simulation_distributions(before, PoolPmfCache())
+        pmfs = backtest.pmfs(features)
+        np.testing.assert_array_equal(features.player_ids, expected.player_ids)
+        np.testing.assert_allclose(pmfs.expected, expected.expected, atol=1e-12)
+
+
+def test_scores_do_not_look_ahead(make_season):
+    df = make_season(joining=True).players
+    changed = df.copy()
+    changed.loc[changed["round"] == 10, "total_points"] += 7
+    a = Backtest(df).run().rounds
+    b = Backtest(changed).run().rounds
+    pd.testing.assert_frame_equal(a.iloc[:-1], b.iloc[:-1])
+    assert a.iloc[-1]["mae"] != b.iloc[-1]["mae"]
+
+
+def test_run_skips_players_without_history(make_season):
+    df = make_season(joining=True).players
+    result = Backtest(df, first_round=3).run()
+    assert result.rounds["round"].tolist() == list(range(3, 11))
+    # Round 3 has 22 players, of whom 18 played before it
+    assert result.rounds["n"].iloc[0] == 18
+    summary = result.summary()
+    assert summary["n"] == result.rounds["n"].sum()
+    assert 0 < summary["mae"] < 5 and summary["log_loss"] > 0
+
+
+def test_run_skips_round_without_forecast_players(make_season):
+    df = make_season(rounds=5, joining=True).players
+    # Round 3 is played only by newcomers, so nobody in it has a forecast
+    df = df[df["round"] != 3]
+    newcomers = make_season(rounds=1, joining=True).players
+    newcomers = newcomers.assign(element=newcomers["element"] + 100, round=3)
+    result = Backtest(pd.concat([df, newcomers])).run()
+    assert result.rounds["round"].tolist() == [2, 4, 5]
+    assert result.summary()["n"] > 0
+
+
+def test_features_are_cached_per_decay_and_window(make_season):
+    backtest = Backtest(make_season(joining=True).players)
+    assert backtest.features(0.9) is backtest.features(0.9)
+    assert backtest.features(0.8) is not backtest.features(0.9)
+    backtest.run(mix_with_pool=0.1)
+    misses = backtest.pool_cache.misses
+    backtest.run(mix_with_pool=0.3, smooth_sigma=0.6)
+    assert backtest.pool_cache.misses == misses
+
+
+def test_score_round_by_hand():
+    pmfs = PmfBatch(
+        grid=np.array([0, 1, 2]),
+        probs=np.array([[0.5, 0.5, 0.0], [0.0, 0.25, 0.75]]),
+        lo=np.array([0, 0]),
+        hi=np.array([1, 2]),
+    )
+    scores = score_round(pmfs, np.array([0, 1, 1]), np.array([1, 2, 5]))
+    assert scores["n"] == 3
+    # Expected points 0.5, 1.75, 1.75
+    assert scores["mae"] == pytest.approx((0.5 + 0.25 + 3.25) / 3)
+    assert scores["log_loss"] == pytest.approx(
+        -(np.log(0.5) + np.log(0.75) + np.log(1e-9)) / 3
+    )
+    assert scores["spearman"] == pytest.approx(np.sqrt(3) / 2)
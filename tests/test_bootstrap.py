@@ -0,0 +1,39 @@
+"""Tests for fantasy_optimizer/bootstrap.py"""
+
+import json
+
+from fantasy_optimizer.bootstrap import BootstrapSnapshot, content_hash
+
+PAYLOAD = {
+    "elements": [{"id": 10, "team": 1}, {"id": 11, "team": 2}],
+    "teams": [{"id": 1, "name": "AIK"}, {"id": 2, "name": "Hammarby"}],
+    "events": [
+        {"id": 1, "is_current": False, "is_next": False},
+        {"id": 2, "is_current": True, "is_next": False},
+        {"id": 3, "is_current": False, "is_next": True},
+    ],
+}
+
+
+def test_lookups():
+    snapshot = BootstrapSnapshot(PAYLOAD, content_hash="x")
+    assert snapshot.element_by_id[11]["team"] == 2
+    assert snapshot.team_by_id[1]["name"] == "AIK"
+    assert snapshot.team_id_by_name == {"AIK": 1, "Hammarby": 2}
+    assert snapshot.event_by_id[3]["is_next"]
+    assert snapshot.current_event["id"] == 2
+    assert snapshot.next_event["id"] == 3
+    assert snapshot["elements"] is snapshot.elements
+
+
+def test_from_bytes_hashes_raw_payload():
+    raw = json.dumps(PAYLOAD).encode()
+    snapshot = BootstrapSnapshot.from_bytes(raw)
+    assert snapshot.content_hash == content_hash(raw)
+    assert snapshot.data == PAYLOAD
+
+
+def test_missing_sections_are_empty():
+    snapshot = BootstrapSnapshot({"elements": []}, content_hash="x")
+    assert snapshot.teams == [] and snapshot.event_by_id == {}
+    assert snapshot.current_event is None
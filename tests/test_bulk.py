@@ -0,0 +1,47 @@
+import csv
+from datetime import date, datetime
+
+from fantasy_optimizer.db.bulk import _csv_field, _dedupe, rows_to_csv
+
+
+def test_csv_field_null_is_unquoted_empty():
+    assert _csv_field(None) == ""
+    assert _csv_field("") == '""'
+
+
+def test_csv_field_scalars():
+    assert _csv_field(True) == "t"
+    assert _csv_field(False) == "f"
+    assert _csv_field(3) == "3"
+    assert _csv_field(2.5) == "2.5"
+    assert _csv_field(date(2025, 4, 1)) == "2025-04-01"
+    assert _csv_field(datetime(2025, 4, 1, 17, 0)) == "2025-04-01T17:00:00"
+
+
+def test_csv_field_quotes_strings():
+    assert _csv_field('Malmö, "MFF"') == '"Malmö, ""MFF"""'
+
+
+def test_rows_to_csv_round_trips_through_csv_reader():
+    rows = [
+        {"id": 1, "name": "Anna, B", "team": None, "home": True},
+        {"id": 2, "name": 'Say "hi"', "team": 7, "home": False},
+    ]
+    parsed = list(csv.reader(rows_to_csv(rows, ["id", "name", "team", "home"])))
+    assert parsed == [["1", "Anna, B", "", "t"], ["2", 'Say "hi"', "7", "f"]]
+
+
+def test_rows_to_csv_uses_column_order_and_fills_missing():
+    buf = rows_to_csv([{"b": 2, "a": 1}], ["a", "b", "c"])
+    assert buf.getvalue() == "1,2,\n"
+
+
+def test_dedupe_keeps_last_row_per_key():
+    rows = [
+        {"element": 1, "fixture": 10, "total_points": 2},
+        {"element": 2, "fixture": 10, "total_points": 5},
+        {"element": 1, "fixture": 10, "total_points": 9},
+    ]
+    deduped = _dedupe(rows, ["element", "fixture"])
+    assert len(deduped) == 2
+    assert {(r["element"], r["total_points"]) for r in deduped} == {(1, 9), (2, 5)}
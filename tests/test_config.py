@@ -1,6 +1,19 @@
 """Tests for fantasy_optimizer/config.py"""
 
-from fantasy_optimizer.config import OptimizationConfig, load_config
+import pytest
+
+from fantasy_optimizer.config import (
+    ForecastConfig,
+    IngestConfig,
+    OptimizationConfig,
+    SimulationConfig,
+    load_config,
+    load_database_config,
+    load_forecast_config,
+    load_ingest_config,
+    load_simulation_config,
+    save_forecast_config,
+)
 
 
 def test_defaults():
@@ -48,3 +61,99 @@ def test_load_config_empty_toml_returns_defaults(tmp_path):
     toml.write_text("", encoding="utf-8")
     cfg = load_config(toml)
     assert cfg == OptimizationConfig()
+
+
+def test_ingest_config_defaults(tmp_path):
+    cfg = load_ingest_config(tmp_path / "nonexistent.toml")
+    assert cfg == IngestConfig()
+    assert cfg.concurrency == 8
+    assert cfg.request_interval == 0.05
+    assert cfg.bulk_copy is False
+
+
+def test_load_ingest_config_reads_toml(tmp_path):
+    toml = tmp_path / "config.toml"
+    toml.write_text(
+        "[ingest]\nconcurrency = 16\nrequest_interval = 0.1\nbulk_copy = true\n"
+        "write_batch_size = 500\n",
+        encoding="utf-8",
+    )
+    cfg = load_ingest_config(toml)
+    assert cfg.concurrency == 16
+    assert cfg.request_interval == 0.1
+    assert cfg.bulk_copy is True
+    assert cfg.write_batch_size == 500
+    assert cfg.validate_batch_size == IngestConfig().validate_batch_size
+
+
+def test_database_config_defaults_to_postgresql(tmp_path):
+    cfg = load_database_config(tmp_path / "nonexistent.toml")
+    assert cfg.backend == "postgresql"
+    assert cfg.url is None
+
+
+def test_load_database_config_sqlite(tmp_path):
+    toml = tmp_path / "config.toml"
+    toml.write_text(
+        '[database]\nbackend = "sqlite"\nsqlite_path = "/tmp/x.db"\n', encoding="utf-8"
+    )
+    cfg = load_database_config(toml)
+    assert cfg.backend == "sqlite"
+    assert cfg.url == "sqlite:////tmp/x.db"
+
+
+def test_sqlite_path_relative_to_project_root(tmp_path):
+    toml = tmp_path / "config.toml"
+    toml.write_text('[database]\nbackend = "sqlite"\n', encoding="utf-8")
+    url = load_database_config(toml).url
+    assert url is not None and url.endswith("/data/fantasy.db")
+    assert url.startswith("sqlite:////")
+
+
+def test_load_database_config_rejects_unknown_backend(tmp_path):
+    toml = tmp_path / "config.toml"
+    toml.write_text('[database]\nbackend = "oracle"\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="oracle"):
+        load_database_config(toml)
+
+
+def test_load_simulation_config(tmp_path):
+    assert load_simulation_config(tmp_path / "nonexistent.toml") == SimulationConfig()
+    toml = tmp_path / "config.toml"
+    toml.write_text("[simulation]\nn_scenarios = 5000\nseed = 7\n", encoding="utf-8")
+    cfg = load_simulation_config(toml)
+    assert (cfg.n_scenarios, cfg.seed) == (5000, 7)
+    assert cfg.batch_size == SimulationConfig().batch_size
+
+
+def test_load_forecast_config(tmp_path):
+    assert load_forecast_config(tmp_path / "nonexistent.toml") == ForecastConfig()
+    toml = tmp_path / "config.toml"
+    toml.write_text("[forecast]\ndecay = 0.85\nzero_window = 4\n", encoding="utf-8")
+    cfg = load_forecast_config(toml)
+    assert (cfg.decay, cfg.zero_window) == (0.85, 4)
+    assert cfg.smooth_sigma == ForecastConfig().smooth_sigma
+
+
+def test_save_forecast_config_keeps_comments_and_other_sections(tmp_path):
+    toml = tmp_path / "config.toml"
+    toml.write_text(
+        "[forecast]\n\n# Tuned\ndecay = 0.9    # recency\nsmooth_sigma = 0.4\n\n"
+        "[simulation]\nseed = 42\n",
+        encoding="utf-8",
+    )
+    cfg = ForecastConfig(decay=0.85, mix_with_pool=0.3, smooth_sigma=0.2, zero_window=9)
+    save_forecast_config(cfg, toml)
+    text = toml.read_text(encoding="utf-8")
+    assert "# Tuned\ndecay = 0.85    # recency\n" in text
+    assert load_forecast_config(toml) == cfg
+    assert load_simulation_config(toml).seed == 42
+
+
+def test_save_forecast_config_appends_section(tmp_path):
+    toml = tmp_path / "config.toml"
+    toml.write_text("[simulation]\nseed = 42\n", encoding="utf-8")
+    cfg = ForecastConfig(decay=0.95)
+    save_forecast_config(cfg, toml)
+    assert load_forecast_config(toml) == cfg
+    assert load_simulation_config(toml).seed == 42
@@ -0,0 +1,143 @@
+"""Tests for fantasy_optimizer/dag.py"""
+
+import time
+
+import pytest
+
+from fantasy_optimizer.dag import DagRunner, Stage, load_hashes, save_hashes
+from fantasy_optimizer.metrics import record_fetch, record_rows
+from fantasy_optimizer.pipeline import Pipeline
+
+
+def _sleep(seconds, value=None):
+    def run(**_):
+        time.sleep(seconds)
+        return value
+
+    return run
+
+
+def test_results_flow_to_dependents():
+    runner = DagRunner(
+        [
+            Stage("a", lambda: 2),
+            Stage("b", lambda: 3),
+            Stage("product", lambda a, b: a * b, deps=("a", "b")),
+        ]
+    )
+    assert runner.run() == {"a": 2, "b": 3, "product": 6}
+    assert {r.status for r in runner.reports.values()} == {"ran"}
+
+
+def test_independent_stages_run_in_parallel():
+    runner = DagRunner(
+        [
+            Stage("bootstrap", _sleep(0.1)),
+            Stage("fixtures", _sleep(0.15)),
+            Stage("histories", _sleep(0.1), deps=("bootstrap",)),
+        ]
+    )
+    runner.run()
+    # Critical path is bootstrap -> histories (0.2s), not the 0.35s sum
+    assert runner.wall_seconds < 0.3
+    assert runner.reports["histories"].started >= 0.1
+    assert runner.reports["fixtures"].started < 0.05
+
+
+def test_unchanged_inputs_are_skipped():
+    calls = []
+    stages = [
+        Stage("payload", lambda: {"v": 1}),
+        Stage(
+            "write",
+            lambda payload: calls.append(payload),
+            deps=("payload",),
+            input_hash=lambda payload: str(payload["v"]),
+        ),
+    ]
+    hashes: dict[str, str] = {}
+    DagRunner(stages, hashes).run()
+    assert hashes == {"write": "1"}
+
+    runner = DagRunner(stages, hashes)
+    assert runner.run()["write"] is None
+    assert runner.reports["write"].status == "skipped"
+    assert len(calls) == 1
+
+    DagRunner(stages, hashes, force=True).run()
+    assert len(calls) == 2
+
+
+def test_failure_blocks_dependents_and_is_reraised():
+    def boom():
+        raise RuntimeError("api down")
+
+    ran = []
+    hashes: dict[str, str] = {}
+    runner = DagRunner(
+        [
+            Stage("fetch", boom),
+            Stage("parse", lambda fetch: ran.append("parse"), deps=("fetch",)),
+            Stage("write", lambda parse: ran.append("write"), deps=("parse",)),
+            Stage(
+                "other",
+                lambda: ran.append("other"),
+                input_hash=lambda: "h",
+            ),
+        ],
+        hashes,
+    )
+    with pytest.raises(RuntimeError, match="api down"):
+        runner.run()
+    assert ran == ["other"]
+    assert hashes == {"other": "h"}
+    statuses = {name: r.status for name, r in runner.reports.items()}
+    assert statuses == {
+        "fetch": "failed",
+        "parse": "blocked",
+        "write": "blocked",
+        "other": "ran",
+    }
+
+
+def test_counters_follow_stage_into_pipeline_threads():
+    def fetch():
+        record_fetch(100)
+
+    def write():
+        def upsert(batches):
+            for batch in batches:
+                record_rows(len(batch))
+                yield batch
+
+        Pipeline(queue_size=2).add_stage("write", upsert, workers=3).run(
+            [[1, 2], [3], [4, 5, 6]]
+        )
+
+    runner = DagRunner([Stage("fetch", fetch), Stage("write", write)])
+    runner.run()
+    assert (
+        runner.reports["fetch"].bytes_fetched,
+        runner.reports["fetch"].rows_written,
+    ) == (100, 0)
+    assert runner.reports["write"].rows_written == 6
+    assert "write" in runner.report()
+
+
+def test_rejects_bad_graphs():
+    with pytest.raises(ValueError, match="unknown"):
+        DagRunner([Stage("a", lambda b: b, deps=("b",))])
+    with pytest.raises(ValueError, match="cycle"):
+        DagRunner(
+            [
+                Stage("a", lambda b: b, deps=("b",)),
+                Stage("b", lambda a: a, deps=("a",)),
+            ]
+        )
+
+
+def test_hashes_round_trip(tmp_path):
+    path = tmp_path / "state.json"
+    assert load_hashes(path) == {}
+    save_hashes({"db": {"fixtures": "abc"}}, path)
+    assert load_hashes(path) == {"db": {"fixtures": "abc"}}
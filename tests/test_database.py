@@ -0,0 +1,103 @@
+"""Tests for fantasy_optimizer/db/database.py — lazy engines and pool metrics."""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from fantasy_optimizer.config import DatabaseConfig
+from fantasy_optimizer.db import database
+
+
+@pytest.fixture()
+def sqlite_config(tmp_path, monkeypatch):
+    cfg = DatabaseConfig(backend="sqlite", sqlite_path=str(tmp_path / "t.db"))
+    monkeypatch.setattr(database, "load_database_config", lambda: cfg)
+    monkeypatch.setattr(database, "_engines", {})
+    yield cfg
+    database.dispose_engines()
+
+
+def test_import_does_not_create_engine():
+    import fantasy_optimizer.db.forecasts  # noqa: F401
+    import fantasy_optimizer.db.upsert  # noqa: F401
+
+    assert "engine" not in vars(database)
+
+
+def test_get_engine_is_cached(sqlite_config):
+    engine = database.get_engine()
+    assert database.get_engine() is engine
+    assert engine.url.database == sqlite_config.sqlite_path
+
+
+def test_replica_falls_back_to_primary(sqlite_config, monkeypatch):
+    monkeypatch.setenv(database.REPLICA_URL_ENV, "postgresql://replica/db")
+    # The replica URL only applies to the PostgreSQL backend
+    assert database.get_engine(replica=True) is database.get_engine()
+
+
+def test_replica_engine_from_env(monkeypatch):
+    cfg = DatabaseConfig()
+    monkeypatch.setattr(database, "load_database_config", lambda: cfg)
+    monkeypatch.setattr(database, "_engines", {})
+    monkeypatch.setenv("DATABASE_URL", "postgresql://primary-host/db")
+    monkeypatch.setenv(database.REPLICA_URL_ENV, "postgresql://replica-host/db")
+
+    assert database.get_engine().url.host == "primary-host"
+    assert database.get_engine(replica=True).url.host == "replica-host"
+
+
+def test_pool_settings_from_config(monkeypatch):
+    captured = {}
+    real_create_engine = database.create_engine
+
+    def create_engine(url, **kwargs):
+        captured.update(kwargs)
+        return real_create_engine("sqlite://")
+
+    monkeypatch.setattr(database, "create_engine", create_engine)
+    cfg = DatabaseConfig(
+        pool_size=3, max_overflow=1, pool_timeout=5, statement_timeout_ms=2000
+    )
+    database.make_engine("postgresql://host/db", cfg)
+
+    assert captured["pool_size"] == 3
+    assert captured["max_overflow"] == 1
+    assert captured["pool_timeout"] == 5
+    assert captured["connect_args"] == {"options": "-c statement_timeout=2000"}
+
+
+def test_pool_stats_count_checkouts(sqlite_config):
+    engine = database.get_engine()
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    stats = database.pool_stats(engine)
+    assert stats.checkouts == 3
+    assert stats.connections_opened == 1
+    assert stats.peak_checked_out == 1
+
+
+def test_pool_stats_show_contention(tmp_path):
+    cfg = DatabaseConfig(pool_size=1, max_overflow=0, pool_timeout=5)
+    engine = database.make_engine(f"sqlite:///{tmp_path / 'c.db'}", cfg)
+    held = threading.Event()
+
+    def hold():
+        with engine.connect():
+            held.set()
+            time.sleep(0.2)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait()
+    with engine.connect():
+        pass
+    thread.join()
+
+    stats = database.pool_stats(engine)
+    assert stats.checkouts == 2
+    assert stats.max_wait_seconds >= 0.1
+    engine.dispose()
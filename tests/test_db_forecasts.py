@@ -0,0 +1,79 @@
+"""Tests for fantasy_optimizer/db/forecasts.py — query building, no database."""
+
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from fantasy_optimizer.db import forecasts
+
+
+@pytest.fixture()
+def read_sql():
+    with patch.object(forecasts.pd, "read_sql", return_value=pd.DataFrame()) as m:
+        yield m
+
+
+def _query(read_sql) -> tuple[str, dict]:
+    args, kwargs = read_sql.call_args
+    return str(args[0]), kwargs["params"]
+
+
+def test_load_forecasts_defaults_to_newest_run(read_sql):
+    forecasts.load_forecasts(MagicMock())
+    sql, params = _query(read_sql)
+    assert "FROM forecast_runs ORDER BY gameweek DESC, created_at DESC" in sql
+    assert params == {}
+
+
+def test_load_forecasts_filters_on_chosen_run(read_sql):
+    forecasts.load_forecasts(MagicMock(), "simulation", "2", gameweek=5)
+    sql, params = _query(read_sql)
+    assert (
+        "WHERE model_name = :model_name AND model_version = :model_version"
+        " AND gameweek = :gameweek" in sql
+    )
+    assert params == {"model_name": "simulation", "model_version": "2", "gameweek": 5}
+
+
+def test_latest_forecast_per_player_optional_model(read_sql):
+    forecasts.latest_forecast_per_player(MagicMock())
+    sql, params = _query(read_sql)
+    assert "WHERE l.player_id = f.player_id ORDER BY lr.gameweek DESC" in sql
+    assert "model_name =" not in sql
+    assert params == {}
+
+    forecasts.latest_forecast_per_player(MagicMock(), model_name="simulation")
+    sql, params = _query(read_sql)
+    assert "lr.model_name = :model_name" in sql
+    assert params == {"model_name": "simulation"}
+
+
+def test_save_forecast_run_replaces_run_in_one_transaction():
+    engine = MagicMock()
+    conn = engine.begin.return_value.__enter__.return_value
+    conn.dialect.name = "postgresql"
+    conn.execute.return_value.scalar_one.return_value = 42
+    rows = [
+        {"player_id": 7, "expected_points": 3},
+        {"player_id": 9.0, "expected_points": 1.5},
+    ]
+
+    with (
+        patch.object(forecasts, "get_engine", return_value=engine),
+        patch.object(forecasts, "upsert_forecasts") as upsert,
+    ):
+        run_id = forecasts.save_forecast_run(rows, "simulation", "1", gameweek=4)
+
+    assert run_id == 42
+    engine.begin.assert_called_once()
+    # Run upsert, then deletes of old rows and of arrays this save did not pass
+    assert conn.execute.call_count == 4
+    upsert.assert_called_once_with(
+        [
+            {"run_id": 42, "player_id": 7, "expected_points": 3.0},
+            {"run_id": 42, "player_id": 9, "expected_points": 1.5},
+        ],
+        use_copy=False,
+        conn=conn,
+    )
@@ -0,0 +1,253 @@
+"""Tests for scripts/data_fetching/fetch_player_histories.py"""
+
+from unittest.mock import patch
+
+import pytest
+
+from fantasy_optimizer.bootstrap import BootstrapSnapshot
+from fantasy_optimizer.config import IngestConfig
+from scripts.data_fetching import fetch_player_histories
+
+MODULE = "scripts.data_fetching.fetch_player_histories"
+
+
+@pytest.fixture(autouse=True)
+def watermark_path(tmp_path, monkeypatch):
+    path = tmp_path / "history_watermarks.json"
+    monkeypatch.setattr(fetch_player_histories, "WATERMARK_PATH", path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def db_key(monkeypatch):
+    monkeypatch.setattr(fetch_player_histories, "database_key", lambda: "db-a")
+    return "db-a"
+
+
+@pytest.fixture(autouse=True)
+def ingest_config(monkeypatch):
+    cfg = IngestConfig(
+        request_interval=0.0, queue_size=4, validate_batch_size=20, write_batch_size=50
+    )
+    monkeypatch.setattr(fetch_player_histories, "load_ingest_config", lambda: cfg)
+    return cfg
+
+
+def _snapshot(elements: list[dict]) -> BootstrapSnapshot:
+    return BootstrapSnapshot({"elements": elements}, content_hash="test")
+
+
+def _gw(element: int, fixture: int) -> dict:
+    return {
+        "element": element,
+        "fixture": fixture,
+        "opponent_team": 2,
+        "total_points": 3,
+        "was_home": True,
+        "kickoff_time": "2025-04-01T17:00:00Z",
+        "minutes": 90,
+        "goals_scored": 0,
+        "assists": 0,
+        "clean_sheets": 0,
+        "goals_conceded": 1,
+        "own_goals": 0,
+        "penalties_saved": 0,
+        "penalties_missed": 0,
+        "yellow_cards": 0,
+        "red_cards": 0,
+        "saves": 0,
+        "bonus": 0,
+        "round": fixture,
+    }
+
+
+def _run(n_players: int, rounds: int, concurrency: int):
+    bootstrap = _snapshot([{"id": pid} for pid in range(1, n_players + 1)])
+    batches = []
+    with (
+        patch(f"{MODULE}.load_bootstrap", return_value=bootstrap),
+        patch(
+            f"{MODULE}.fetch_player_history",
+            side_effect=lambda pid, **_: {
+                "history": [_gw(pid, r) for r in range(1, rounds + 1)]
+            },
+        ),
+        patch(
+            f"{MODULE}.upsert_gameweek_stats",
+            side_effect=lambda batch, **_: batches.append(batch),
+        ),
+    ):
+        fetch_player_histories.main(concurrency=concurrency)
+    return batches
+
+
+def test_concurrent_fetch_upserts_every_row():
+    batches = _run(n_players=40, rounds=3, concurrency=8)
+    rows = [r for b in batches for r in b]
+    assert len(rows) == 120
+    assert len({(r["element"], r["fixture"]) for r in rows}) == 120
+
+
+def test_concurrent_fetch_matches_serial_and_batches_writes(ingest_config):
+    serial = _run(n_players=30, rounds=4, concurrency=1)
+    parallel = _run(n_players=30, rounds=4, concurrency=6)
+
+    def keys(batches):
+        return sorted((r["element"], r["fixture"]) for b in batches for r in b)
+
+    assert keys(parallel) == keys(serial)
+    assert len(keys(parallel)) == 120
+    assert [len(b) for b in parallel] == [len(b) for b in serial]
+    assert all(len(b) >= ingest_config.write_batch_size for b in parallel[:-1])
+
+
+def test_refresh_skips_players_not_modified():
+    bootstrap = _snapshot([{"id": pid} for pid in range(1, 7)])
+    batches = []
+    with (
+        patch(f"{MODULE}.load_bootstrap", return_value=bootstrap),
+        patch(
+            f"{MODULE}.refresh_player_history",
+            side_effect=lambda pid, **_: (
+                None if pid % 2 else {"history": [_gw(pid, 1), _gw(pid, 2)]}
+            ),
+        ),
+        patch(
+            f"{MODULE}.upsert_gameweek_stats",
+            side_effect=lambda batch, **_: batches.append(batch),
+        ),
+    ):
+        fetch_player_histories.main(force_refresh=True, concurrency=3)
+    rows = [r for b in batches for r in b]
+    assert {r["element"] for r in rows} == {2, 4, 6}
+    assert len(rows) == 6
+
+
+# --- incremental mode ---
+
+
+def _element(pid: int, total_points: int, minutes: int = 90, event_points: int = 2):
+    return {
+        "id": pid,
+        "total_points": total_points,
+        "minutes": minutes,
+        "event_points": event_points,
+    }
+
+
+def test_changed_player_ids_compares_watermark_fields():
+    marks = {1: [10, 90, 2], 2: [5, 90, 2], 3: [7, 90, 2]}
+    elements = [
+        _element(1, 10),  # unchanged
+        _element(2, 5, minutes=180),  # played again
+        _element(3, 7, event_points=0),  # new gameweek started
+        _element(4, 0),  # never ingested
+    ]
+    assert fetch_player_histories.changed_player_ids(elements, marks) == [2, 3, 4]
+
+
+def test_watermarks_round_trip_per_database(watermark_path):
+    fetch_player_histories.save_watermarks({3: [1, 2, 3]}, "db-a")
+    fetch_player_histories.save_watermarks({4: [4, 5, 6]}, "db-b")
+    assert fetch_player_histories.load_watermarks("db-a") == {3: [1, 2, 3]}
+    assert fetch_player_histories.load_watermarks("db-b") == {4: [4, 5, 6]}
+    assert fetch_player_histories.load_watermarks("db-c") == {}
+    assert watermark_path.exists()
+
+
+def _run_incremental(bootstrap: BootstrapSnapshot):
+    fetched, batches = [], []
+
+    def fake_fetch(pid, **kwargs):
+        fetched.append((pid, kwargs["force_refresh"]))
+        return {"history": [_gw(pid, 1)]}
+
+    with (
+        patch(f"{MODULE}.load_bootstrap", return_value=bootstrap) as boot,
+        patch(f"{MODULE}.fetch_player_history", side_effect=fake_fetch),
+        patch(
+            f"{MODULE}.upsert_gameweek_stats",
+            side_effect=lambda batch, **_: batches.append(batch),
+        ),
+    ):
+        fetch_player_histories.main(incremental=True, concurrency=2)
+    boot.assert_called_once_with(force_refresh=True)
+    return fetched, [r["element"] for b in batches for r in b]
+
+
+def test_incremental_only_fetches_changed_players(db_key):
+    marks = {pid: [10, 90, 2] for pid in range(1, 11)}
+    fetch_player_histories.save_watermarks(marks, db_key)
+    bootstrap = _snapshot(
+        [_element(pid, 10 if pid != 4 else 16) for pid in range(1, 11)]
+    )
+    fetched, written = _run_incremental(bootstrap)
+
+    assert fetched == [(4, True)]
+    assert written == [4]
+    assert fetch_player_histories.load_watermarks(db_key)[4] == [16, 90, 2]
+
+
+def test_incremental_fetches_everyone_for_another_database(db_key):
+    marks = {pid: [10, 90, 2] for pid in range(1, 6)}
+    fetch_player_histories.save_watermarks(marks, "other-db")
+    fetched, written = _run_incremental(
+        _snapshot([_element(pid, 10) for pid in range(1, 6)])
+    )
+
+    assert sorted(written) == [1, 2, 3, 4, 5]
+    assert len(fetched) == 5
+    assert fetch_player_histories.load_watermarks(db_key) == marks
+    assert fetch_player_histories.load_watermarks("other-db") == marks
+
+
+def test_invalid_rows_are_skipped_and_reported():
+    def history(pid, **_):
+        rows = [_gw(pid, 1), _gw(pid, 2)]
+        if pid == 2:
+            rows[1]["minutes"] = "n/a"
+        return {"history": rows}
+
+    batches = []
+    with (
+        patch(
+            f"{MODULE}.load_bootstrap",
+            return_value=_snapshot([{"id": 1}, {"id": 2}]),
+        ),
+        patch(f"{MODULE}.fetch_player_history", side_effect=history),
+        patch(
+            f"{MODULE}.upsert_gameweek_stats",
+            side_effect=lambda batch, **_: batches.append(batch),
+        ),
+        patch(f"{MODULE}.logger") as logger,
+    ):
+        fetch_player_histories.main()
+
+    saved = [(r["element"], r["fixture"]) for b in batches for r in b]
+    assert saved == [(1, 1), (1, 2), (2, 1)]
+    assert all(r["season"] == 2025 for b in batches for r in b)
+    (message, report), _ = logger.warning.call_args
+    assert report.invalid_rows == 1
+    assert report.errors[0].key == 2
+    assert report.errors[0].field == "minutes"
+
+
+def test_passed_snapshot_is_not_reloaded():
+    batches = []
+    with (
+        patch(f"{MODULE}.load_bootstrap") as boot,
+        patch(
+            f"{MODULE}.refresh_player_history",
+            side_effect=lambda pid, **_: {"history": [_gw(pid, 1)]},
+        ),
+        patch(
+            f"{MODULE}.upsert_gameweek_stats",
+            side_effect=lambda batch, **_: batches.append(batch),
+        ),
+    ):
+        fetch_player_histories.main(
+            force_refresh=True, snapshot=_snapshot([{"id": 5}, {"id": 6}])
+        )
+
+    boot.assert_not_called()
+    assert [r["element"] for b in batches for r in b] == [5, 6]
@@ -2,7 +2,9 @@
 
 import numpy as np
 import pandas as pd
+import pytest
 
+from fantasy_optimizer.forecasting.pmf import PoolPmfCache
 from scripts.build_forecasts import (
     _align_and_mix_pmfs,
     _apply_zero_inflation,
@@ -10,6 +12,7 @@ from scripts.build_forecasts import (
     _smooth_discrete_pmf,
     build_points_pmf,
     build_simulation_forecasts,
+    player_positions,
 )
 
 # --- PMF helpers ---
@@ -103,6 +106,13 @@ def test_simulation_forecasts_returns_one_row_per_player():
     result = build_simulation_forecasts(df)
     assert set(result["player_id"]) == {1, 2}
     assert len(result) == 2
+    assert list(result.columns) == [
+        "player_id",
+        "expected_points",
+        "variance",
+        "p_zero",
+        "p_haul",
+    ]
 
 
 def test_simulation_forecasts_expected_points_positive():
@@ -131,3 +141,77 @@ def test_simulation_forecasts_player_with_all_zeros():
     assert len(result) == 1
     # Expected points should be low but not negative
     assert result["expected_points"].iloc[0] >= 0
+
+
+def test_player_positions_takes_mode_with_ties_to_lowest():
+    df = pd.DataFrame(
+        {
+            "element": [1, 1, 1, 2, 2, 3],
+            "position": ["MID", "FWD", "MID", "MID", "DEF", None],
+        }
+    )
+    positions = player_positions(df, "position")
+    assert positions.to_dict() == {1: "MID", 2: "DEF"}
+
+
+def test_simulation_forecasts_match_per_player_reference():
+    rng = np.random.default_rng(3)
+    rows = []
+    for element in range(1, 41):
+        position = ["GK", "DEF", "MID", "FWD"][element % 4]
+        for rnd in range(1, 1 + int(rng.integers(1, 12))):
+            # A few players moved position mid-season
+            pos = "MID" if element % 7 == 0 and rnd > 3 else position
+            rows.append((element, rnd, int(rng.poisson(2.5)), pos))
+    df = pd.DataFrame(rows, columns=["element", "round", "total_points", "position"])
+
+    result = build_simulation_forecasts(df, pool_cache=PoolPmfCache())
+
+    pools = {
+        pos: sub["total_points"].astype(int).to_numpy()
+        for pos, sub in df.groupby("position")
+    }
+    for player_id, expected in zip(result["player_id"], result["expected_points"]):
+        sub = df[df["element"] == player_id]
+        pts = sub["total_points"].to_numpy()
+        w = 0.8 ** np.arange(min(6, pts.size))[::-1]
+        zero_rate = (w * (pts[-len(w) :] == 0)).sum() / w.sum()
+        grid, pmf = build_points_pmf(
+            pts,
+            pool_points=pools[sub["position"].mode().iloc[0]],
+            zero_boost=float(np.clip(0.5 * zero_rate, 0.0, 0.06)),
+        )
+        assert expected == pytest.approx(float((grid * pmf).sum()), abs=1e-12)
+
+
+def test_simulation_forecasts_reuse_cached_pools():
+    df = pd.DataFrame(
+        {
+            "element": [1, 1, 2, 2],
+            "total_points": [5, 6, 3, 4],
+            "round": [1, 2, 1, 2],
+            "position": ["FWD", "FWD", "DEF", "DEF"],
+        }
+    )
+    cache = PoolPmfCache()
+    first = build_simulation_forecasts(df, pool_cache=cache)
+    second = build_simulation_forecasts(df, pool_cache=cache)
+    assert (cache.misses, cache.hits) == (2, 2)
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_simulation_forecasts_do_not_reuse_another_frames_pools():
+    df = pd.DataFrame(
+        {
+            "element": [1, 1, 2, 2],
+            "total_points": [1, 2, 12, 12],
+            "round": [1, 2, 1, 2],
+            "position": ["MID"] * 4,
+        }
+    )
+    changed = df.assign(total_points=12)
+    cache = PoolPmfCache()
+    for pool_cache in [None, cache]:
+        build_simulation_forecasts(df, pool_cache=pool_cache)
+        result = build_simulation_forecasts(changed, pool_cache=pool_cache)
+        assert result["expected_points"].tolist() == pytest.approx([12.0, 12.0])
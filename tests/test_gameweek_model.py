@@ -0,0 +1,64 @@
+"""Tests for fantasy_optimizer/models/gameweek.py"""
+
+from datetime import datetime, timezone
+
+from fantasy_optimizer.models.gameweek import PlayerGameweekStat
+from fantasy_optimizer.models.validation import validate_rows
+
+
+def _stat(kickoff_time):
+    return PlayerGameweekStat(
+        element=1,
+        fixture=10,
+        opponent_team=2,
+        total_points=6,
+        was_home=True,
+        kickoff_time=kickoff_time,
+        minutes=90,
+        goals_scored=1,
+        assists=0,
+        clean_sheets=0,
+        goals_conceded=1,
+        own_goals=0,
+        penalties_saved=0,
+        penalties_missed=0,
+        yellow_cards=0,
+        red_cards=0,
+        saves=0,
+        round=3,
+    )
+
+
+def test_kickoff_at_parses_api_timestamp():
+    stat = _stat("2025-04-01T17:00:00Z")
+    assert stat.kickoff_at == datetime(2025, 4, 1, 17, 0, tzinfo=timezone.utc)
+    assert stat.season == 2025
+
+
+def test_missing_kickoff_has_no_season():
+    stat = _stat(None)
+    assert stat.kickoff_at is None
+    assert stat.season is None
+
+
+def test_model_dump_includes_typed_columns():
+    row = _stat("2024-11-09T15:00:00Z").model_dump()
+    assert row["season"] == 2024
+    assert row["kickoff_at"].tzinfo is not None
+    assert row["kickoff_time"] == "2024-11-09T15:00:00Z"
+
+
+def test_empty_kickoff_is_none():
+    stat = _stat("")
+    assert stat.kickoff_at is None
+    assert stat.season is None
+
+
+def test_validate_rows_keeps_row_with_empty_kickoff():
+    raw = _stat("2025-04-01T17:00:00Z").model_dump(exclude={"kickoff_at", "season"})
+    rows, report = validate_rows(
+        PlayerGameweekStat, [raw, {**raw, "fixture": 11, "kickoff_time": ""}]
+    )
+    assert not report.errors
+    assert [r["kickoff_at"] is None for r in rows] == [False, True]
+    assert rows[1]["kickoff_time"] == "" and rows[1]["season"] is None
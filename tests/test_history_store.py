@@ -0,0 +1,153 @@
+"""Tests for fantasy_optimizer/history_store.py"""
+
+import json
+
+import numpy as np
+import pytest
+
+from fantasy_optimizer.history_store import HistoryStore, migrate_json_cache
+from fantasy_optimizer.http import Validators
+
+
+def _payload(element: int, rounds: int, points: int = 2) -> dict:
+    return {
+        "history": [
+            {
+                "element": element,
+                "fixture": 100 * element + r,
+                "round": r,
+                "total_points": points,
+                "was_home": r % 2 == 0,
+                "kickoff_time": f"2025-04-{r:02d}T17:00:00Z",
+                "team_h_score": None if r == rounds else 1,
+            }
+            for r in range(1, rounds + 1)
+        ],
+        "history_past": [{"season_name": "2024", "total_points": 50 + element}],
+        "fixtures": [{"id": 900 + element, "event": rounds + 1, "is_home": True}],
+    }
+
+
+@pytest.fixture()
+def store(tmp_path):
+    s = HistoryStore(tmp_path / "store")
+    s.upsert({3: _payload(3, 2), 1: _payload(1, 3), 2: _payload(2, 1)})
+    return HistoryStore(s.root)  # reopen from disk
+
+
+def test_payload_round_trip(store):
+    assert store.payload(1) == _payload(1, 3)
+
+
+def test_payload_keeps_absent_keys_and_value_types(tmp_path):
+    first, second = _payload(1, 2), _payload(2, 2)
+    first["history"][0]["expected_goals"] = 0.35
+    first["history"][1]["expected_goals"] = 1
+    second["history"][0]["value"] = "55"
+    second["history"][1]["value"] = 55
+    second["history_past"][0].pop("total_points")
+    store = HistoryStore(tmp_path / "store")
+    store.upsert({1: first})
+    store.upsert({2: second})
+
+    reopened = HistoryStore(store.root)
+    for pid, payload in [(1, first), (2, second)]:
+        returned = reopened.payload(pid)
+        assert returned == payload
+        for table in payload:
+            for got, want in zip(returned[table], payload[table]):
+                assert {k: type(v) for k, v in got.items()} == {
+                    k: type(v) for k, v in want.items()
+                }
+    assert reopened.load("history")["expected_goals"].dtype == np.float64
+
+
+def test_missing_element(store):
+    assert store.payload(42) is None
+    assert 42 not in store
+    assert store.load("history", element=42).empty
+
+
+def test_load_whole_league_sorted_by_element(store):
+    df = store.load("history")
+    assert len(df) == 6
+    assert df["element"].tolist() == [1, 1, 1, 2, 3, 3]
+    assert df["team_h_score"].isna().sum() == 3
+    assert str(df["team_h_score"].dtype) == "Int64"
+
+
+def test_load_single_player_is_zero_copy(store):
+    df = store.load("history", element=3)
+    assert df["round"].tolist() == [1, 2]
+    mapped = store._table("history").columns["round"].values
+    assert isinstance(mapped, np.memmap)
+    assert np.shares_memory(df["round"].to_numpy(), mapped)
+
+
+def test_upsert_replaces_only_given_elements(store):
+    store.upsert({2: _payload(2, 4, points=9)})
+    df = HistoryStore(store.root).load("history")
+    assert df.groupby("element").size().to_dict() == {1: 3, 2: 4, 3: 2}
+    assert set(df.loc[df["element"] == 2, "total_points"]) == {9}
+
+
+def test_upsert_appends_new_element_with_new_column(store):
+    payload = _payload(5, 1)
+    payload["history"][0]["expected_goals"] = "0.35"
+    store.upsert({5: payload})
+    df = store.load("history")
+    assert df.loc[df["element"] == 5, "expected_goals"].tolist() == ["0.35"]
+    assert df.loc[df["element"] == 1, "expected_goals"].isna().all()
+    assert store.elements().tolist() == [1, 2, 3, 5]
+
+
+def test_stage_is_visible_before_flush(store):
+    store.stage(7, _payload(7, 1), Validators(etag='"x"'))
+    assert 7 in store
+    assert store.validators(7) == Validators(etag='"x"')
+    assert store.load("history", element=7)["round"].tolist() == [1]
+    assert 7 not in HistoryStore(store.root)
+
+    assert store.flush() == 1
+    reopened = HistoryStore(store.root)
+    assert reopened.payload(7)["history"] == _payload(7, 1)["history"]
+    assert reopened.validators(7) == Validators(etag='"x"')
+
+
+def test_whole_league_load_includes_staged_payloads(store):
+    store.stage(2, _payload(2, 4, points=9))
+    store.stage(7, _payload(7, 1))
+    df = store.load("history")
+    assert df["element"].tolist() == [1, 1, 1, 2, 2, 2, 2, 3, 3, 7]
+    assert set(df.loc[df["element"] == 2, "total_points"]) == {9}
+
+    store.flush()
+    flushed = HistoryStore(store.root).load("history")
+    assert flushed.equals(df)
+
+
+def test_old_generations_are_removed(store):
+    store.upsert({1: _payload(1, 1)})
+    store.upsert({1: _payload(1, 2)})
+    assert len(list(store.root.glob("gen-*"))) == 1
+
+
+def test_migrate_json_cache(tmp_path):
+    legacy = tmp_path / "player_histories"
+    legacy.mkdir()
+    for pid in range(1, 31):
+        (legacy / f"{pid}.json").write_text(json.dumps(_payload(pid, 10), indent=2))
+    (legacy / "9.json.meta").write_text(json.dumps({"etag": '"e9"'}))
+
+    store = HistoryStore(tmp_path / "store")
+    assert migrate_json_cache(legacy, store) == 30
+    reopened = HistoryStore(store.root)
+    assert reopened.elements().tolist() == list(range(1, 31))
+    assert reopened.payload(4)["history"] == _payload(4, 10)["history"]
+    assert reopened.validators(9) == Validators(etag='"e9"')
+    assert reopened.disk_usage() < sum(p.stat().st_size for p in legacy.iterdir())
+
+
+def test_unknown_table(store):
+    with pytest.raises(ValueError):
+        store.load("events")
@@ -0,0 +1,92 @@
+"""Tests for fantasy_optimizer/forecasting/horizon.py."""
+
+import numpy as np
+import pandas as pd
+
+from fantasy_optimizer.forecasting.horizon import (
+    build_horizon,
+    fixture_weights,
+    horizon_rounds,
+)
+from fantasy_optimizer.forecasting.strength import StrengthModel
+from scripts.build_forecasts import TOTAL_ROUNDS, build_forecast_horizon
+
+# Team 1 blanks in round 6 and doubles in round 7; team 2 plays once a round
+FIXTURES = pd.DataFrame(
+    {
+        "round": [5, 5, 6, 7, 7, 7, 7, 9],
+        "team": [1, 2, 2, 1, 2, 1, 3, 1],
+    }
+)
+
+
+def test_fixture_weights_count_blanks_and_doubles():
+    weights = fixture_weights(FIXTURES, np.array([1, 2]), np.arange(5, 8))
+    np.testing.assert_array_equal(weights, [[1, 0, 2], [1, 1, 1]])
+
+
+def test_build_horizon_scales_per_match_forecast():
+    horizon = build_horizon(
+        np.array([10, 20, 30]),
+        np.array([1, 2, np.nan]),
+        np.array([4.0, 2.5, 9.0]),
+        FIXTURES,
+        np.arange(5, 8),
+    )
+    np.testing.assert_array_equal(horizon.rounds, [5, 6, 7])
+    np.testing.assert_allclose(
+        horizon.expected, [[4.0, 0.0, 8.0], [2.5, 2.5, 2.5], [0.0, 0.0, 0.0]]
+    )
+    np.testing.assert_allclose(horizon.total, [12.0, 7.5, 0.0])
+    assert horizon.frame().loc[10, 7] == 8.0
+
+
+def test_horizon_stops_at_the_last_round():
+    np.testing.assert_array_equal(horizon_rounds(28, 5, TOTAL_ROUNDS), [28, 29, 30])
+    forecasts = pd.DataFrame({"player_id": [10], "expected_points": [3.0]})
+    teams = pd.Series({10: 1})
+    assert build_forecast_horizon(forecasts, teams, FIXTURES, 31) is None
+
+
+def test_build_forecast_horizon_maps_players_to_teams():
+    forecasts = pd.DataFrame(
+        {"player_id": [10, 20, 99], "expected_points": [3.0, 1.0, 5.0]}
+    )
+    teams = pd.Series({10: 1, 20: 2})  # 99 has no known team
+    horizon = build_forecast_horizon(forecasts, teams, FIXTURES, 7, horizon=3)
+    np.testing.assert_array_equal(horizon.rounds, [7, 8, 9])
+    np.testing.assert_allclose(horizon.expected, [[6, 0, 3], [1, 0, 0], [0, 0, 0]])
+
+
+def test_build_forecast_horizon_scales_by_fixture_difficulty():
+    played = pd.DataFrame(
+        {
+            "round": [1, 1, 2, 2],
+            "team": [1, 2, 1, 2],
+            "opponent_team": [2, 1, 2, 1],
+            "was_home": [True, False, False, True],
+            "team_score": [3, 0, 2, 1],
+        }
+    )
+    upcoming = pd.DataFrame(
+        {
+            "round": [3, 3],
+            "team": [1, 2],
+            "opponent_team": [2, 1],
+            "was_home": [True, False],
+            "team_score": np.nan,
+        }
+    )
+    forecasts = pd.DataFrame({"player_id": [10, 20], "expected_points": [4.0, 4.0]})
+    strength = StrengthModel()
+    horizon = build_forecast_horizon(
+        forecasts,
+        pd.Series({10: 1, 20: 2}),
+        pd.concat([played, upcoming]),
+        3,
+        horizon=2,
+        strength=strength,
+    )
+    scale = strength.fixture_multipliers(upcoming)
+    np.testing.assert_allclose(horizon.expected, [[4 * scale[0], 0], [4 * scale[1], 0]])
+    assert scale[0] > 1 > scale[1]
@@ -0,0 +1,184 @@
+"""Tests for fantasy_optimizer/http.py"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from fantasy_optimizer.http import HttpClient, RateLimiter, Validators, get_client
+from fantasy_optimizer.metrics import counting
+
+
+def test_rate_limiter_spaces_calls():
+    limiter = RateLimiter(min_interval=0.02)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait()
+    # First call is immediate, the next four wait one interval each
+    assert time.monotonic() - start >= 4 * 0.02 - 1e-3
+
+
+def test_rate_limiter_is_shared_across_threads():
+    limiter = RateLimiter(min_interval=0.02)
+    stamps = []
+    lock = threading.Lock()
+
+    def worker():
+        limiter.wait()
+        with lock:
+            stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stamps.sort()
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert min(gaps) >= 0.02 - 5e-3
+
+
+def test_rate_limiter_zero_interval_never_sleeps():
+    limiter = RateLimiter(min_interval=0.0)
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.wait()
+    assert time.monotonic() - start < 0.05
+
+
+# --- HttpClient ---
+
+
+@pytest.fixture()
+def json_server():
+    """Local keep-alive HTTP/1.1 server.
+
+    Paths under /fail/<n> answer 503 for the first n hits; /etag honours If-None-Match.
+    """
+    hits: dict[str, int] = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            hits[self.path] = hits.get(self.path, 0) + 1
+            if self.path.startswith("/fail/") and hits[self.path] <= int(
+                self.path.rsplit("/", 1)[1]
+            ):
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            body = json.dumps({"path": self.path}).encode()
+            self.send_response(200)
+            if self.path == "/etag":
+                self.send_header("ETag", '"v1"')
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_reuses_keep_alive_connection(json_server):
+    base, _ = json_server
+    client = HttpClient()
+    for i in range(5):
+        assert client.get_json(f"{base}/item/{i}") == {"path": f"/item/{i}"}
+    stats = client.stats
+    assert stats.requests == 5
+    assert stats.connections_opened == 1
+    assert stats.connections_reused == 4
+    client.close()
+
+
+def test_client_records_fetched_bytes(json_server):
+    base, _ = json_server
+    client = HttpClient()
+    with counting() as counters:
+        client.get_json(f"{base}/a")
+        client.get_json(f"{base}/bb")
+    assert counters.bytes_fetched == len(b'{"path": "/a"}') + len(b'{"path": "/bb"}')
+    client.close()
+
+
+def test_client_retries_with_backoff(json_server, monkeypatch):
+    base, hits = json_server
+    sleeps = []
+    monkeypatch.setattr("fantasy_optimizer.http.time.sleep", sleeps.append)
+    client = HttpClient()
+    assert client.get_json(f"{base}/fail/2") == {"path": "/fail/2"}
+    assert hits["/fail/2"] == 3
+    assert sleeps == [1.0, 2.0]
+    client.close()
+
+
+def test_client_raises_after_max_attempts(json_server, monkeypatch):
+    base, _ = json_server
+    monkeypatch.setattr("fantasy_optimizer.http.time.sleep", lambda _: None)
+    client = HttpClient()
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_json(f"{base}/fail/9", max_attempts=3)
+    client.close()
+
+
+def test_conditional_get_returns_none_on_304(json_server):
+    base, hits = json_server
+    client = HttpClient()
+
+    first = client.get_json_if_modified(f"{base}/etag")
+    assert first.data == {"path": "/etag"}
+    assert first.validators == Validators(etag='"v1"')
+
+    second = client.get_json_if_modified(f"{base}/etag", first.validators)
+    assert second.not_modified
+    assert second.validators == first.validators
+    assert hits["/etag"] == 2
+    assert client.stats.not_modified == 1
+    client.close()
+
+
+def test_conditional_get_without_validators_downloads(json_server):
+    base, _ = json_server
+    client = HttpClient()
+    result = client.get_json_if_modified(f"{base}/plain")
+    assert result.data == {"path": "/plain"}
+    assert not result.validators
+    client.close()
+
+
+def test_validators_request_headers():
+    assert Validators().request_headers() == {}
+    assert Validators(etag='"a"', last_modified="Mon").request_headers() == {
+        "If-None-Match": '"a"',
+        "If-Modified-Since": "Mon",
+    }
+
+
+def test_client_compression_toggle():
+    assert "gzip" in HttpClient().session.headers["Accept-Encoding"]
+    assert HttpClient(compression=False).session.headers["Accept-Encoding"] == (
+        "identity"
+    )
+
+
+def test_get_client_is_shared():
+    assert get_client() is get_client()
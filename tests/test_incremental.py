@@ -0,0 +1,144 @@
+"""Tests for fantasy_optimizer/forecasting/incremental.py."""
+
+import numpy as np
+import pandas as pd
+
+from fantasy_optimizer.config import ForecastConfig
+from fantasy_optimizer.forecasting.incremental import DecayedPointStats
+from fantasy_optimizer.forecasting.pmf import (
+    PointsDistributions,
+    batch_points_pmf,
+    counts_points_pmf,
+    zero_boosts,
+)
+from scripts.build_forecasts import (
+    build_incremental_distributions,
+    build_simulation_distributions,
+)
+
+# Players sit out now and then and there is no position column, so the full
+# build has no pools and matches the incremental one exactly
+SEASON = dict(players=40, resting=5, hauls=True, mean_points=2, positions=False)
+
+
+def _histories(df):
+    ordered = df.sort_values(["element", "round", "fixture"])
+    return ordered.groupby("element")["total_points"].apply(
+        lambda s: s.to_numpy(dtype=int)
+    )
+
+
+def test_round_by_round_folds_match_full_rebuild(make_season):
+    df = make_season(rounds=12, **SEASON).players
+    stats = DecayedPointStats(season=2025)
+    for rnd in range(1, 13):
+        assert stats.fold(df[df["round"] == rnd]) > 0
+        assert stats.last_round == rnd
+
+    histories = _histories(df)
+    np.testing.assert_array_equal(stats.player_ids, histories.index)
+    full = batch_points_pmf(list(histories), zero_boost=zero_boosts(list(histories)))
+    incremental = stats.pmfs()
+    np.testing.assert_array_equal(incremental.grid, full.grid)
+    np.testing.assert_allclose(incremental.probs, full.probs, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(incremental.lo, full.lo)
+    np.testing.assert_array_equal(incremental.hi, full.hi)
+
+
+def test_fold_ignores_earlier_rounds_and_refolds_the_last(make_season):
+    df = make_season(rounds=4, **SEASON).players
+    stats = DecayedPointStats(season=2025)
+    stats.fold(df)
+    counts = stats.counts.copy()
+    assert stats.fold(df[df["round"] <= 3]) == 0
+    assert stats.fold(df) == (df["round"] == 4).sum()
+    np.testing.assert_array_equal(stats.counts, counts)
+
+
+def _full_rebuild(df):
+    histories = _histories(df)
+    return batch_points_pmf(list(histories), zero_boost=zero_boosts(list(histories)))
+
+
+def test_round_landing_in_two_parts_matches_full_rebuild(tmp_path, make_season):
+    df = make_season(rounds=7, seed=2, **SEASON).players
+    round6 = df[df["round"] == 6]
+    early = round6["element"] % 2 == 0
+    stats = DecayedPointStats(season=2025)
+    stats.fold(pd.concat([df[df["round"] <= 5], round6[early]]))
+    assert stats.last_round == 6
+
+    # The next build, from a saved state, reads the last round whole again
+    path = tmp_path / "state.npz"
+    stats.save(path)
+    stats = DecayedPointStats.load(path)
+    stats.fold(df[df["round"] >= 6])
+    assert stats.last_round == 7
+    np.testing.assert_allclose(
+        stats.pmfs().probs, _full_rebuild(df).probs, rtol=0, atol=1e-12
+    )
+
+
+def test_refold_picks_up_corrected_points_in_last_round(make_season):
+    df = make_season(rounds=5, seed=4, **SEASON).players
+    stats = DecayedPointStats(season=2025)
+    stats.fold(df)
+    corrected = df.copy()
+    corrected.loc[corrected["round"] == 5, "total_points"] += 3
+    stats.fold(corrected[corrected["round"] >= 5])
+    np.testing.assert_allclose(
+        stats.pmfs().probs, _full_rebuild(corrected).probs, rtol=0, atol=1e-12
+    )
+
+
+def test_counts_pmf_matches_histories_with_pools():
+    rng = np.random.default_rng(3)
+    histories = [rng.integers(-1, 12, rng.integers(0, 15)) for _ in range(30)]
+    pools = [rng.integers(0, 15, 200), None, np.array([], dtype=int)] * 10
+    boosts = zero_boosts(histories)
+    value_min = -3
+    counts = np.zeros((30, 20))
+    for i, h in enumerate(histories):
+        w = 0.9 ** np.arange(len(h))[::-1]
+        np.add.at(counts[i], h - value_min, 7.0 * w)  # any scale
+    from_counts = counts_points_pmf(counts, value_min, pools, zero_boost=boosts)
+    direct = batch_points_pmf(histories, pools, zero_boost=boosts)
+    np.testing.assert_array_equal(from_counts.grid, direct.grid)
+    np.testing.assert_allclose(from_counts.probs, direct.probs, rtol=0, atol=1e-12)
+
+
+def test_state_round_trips_through_file(tmp_path, make_season):
+    df = make_season(rounds=5, **SEASON).players
+    stats = DecayedPointStats(season=2025)
+    stats.fold(df)
+    path = tmp_path / "state.npz"
+    stats.save(path)
+    loaded = DecayedPointStats.load(path)
+    assert (loaded.season, loaded.last_round, loaded.decay) == (2025, 5, 0.9)
+    np.testing.assert_array_equal(loaded.counts, stats.counts)
+    np.testing.assert_array_equal(loaded.recent_points()[3], stats.recent_points()[3])
+
+
+def test_incremental_build_matches_simulation_build(make_season):
+    df = make_season(rounds=8, seed=5, **SEASON).players
+    stats = DecayedPointStats(season=2025)
+    stats.fold(df[df["round"] <= 6])
+    incremental = build_incremental_distributions(stats, df)
+    full = build_simulation_distributions(
+        df.sort_values(["element", "round", "fixture"])
+    )
+    assert isinstance(incremental, PointsDistributions)
+    np.testing.assert_array_equal(incremental.player_ids, full.player_ids)
+    np.testing.assert_allclose(incremental.probs, full.probs, rtol=0, atol=1e-12)
+
+
+def test_incremental_build_follows_forecast_config(make_season):
+    df = make_season(rounds=8, seed=6, **SEASON).players
+    cfg = ForecastConfig(decay=0.8, mix_with_pool=0.35, smooth_sigma=0.6, zero_window=3)
+    stats = DecayedPointStats(2025, cfg.decay, cfg.zero_window)
+    stats.fold(df[df["round"] <= 5])
+    incremental = build_incremental_distributions(stats, df, cfg)
+    full = build_simulation_distributions(
+        df.sort_values(["element", "round", "fixture"]), config=cfg
+    )
+    np.testing.assert_allclose(incremental.probs, full.probs, rtol=0, atol=1e-12)
@@ -0,0 +1,127 @@
+"""Tests for fantasy_optimizer/names.py"""
+
+import difflib
+import random
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from fantasy_optimizer.names import NameIndex, NameMap, fold_name
+from scripts.build_forecasts import build_enhanced_stats_forecasts
+
+PLAYERS = pd.DataFrame(
+    {
+        "id": [1, 2, 3, 4],
+        "first_name": ["Viktor", "Mikael", "Jesper", "Noah"],
+        "second_name": ["Gyökeres", "Åström", "Löfgren", "Sørensen"],
+        "web_name": ["Gyökeres", "Åström", "J. Löfgren", "Sørensen"],
+    }
+)
+
+
+def _index(players=PLAYERS) -> NameIndex:
+    full = (players["first_name"] + " " + players["second_name"]).tolist()
+    ids = players["id"].tolist()
+    return NameIndex(ids + ids, full + players["web_name"].tolist())
+
+
+def test_fold_name_strips_accents_and_punctuation():
+    assert fold_name("Åström-Öhman") == "astrom ohman"
+    assert fold_name("  J. LÖFGREN ") == "j lofgren"
+    assert fold_name("Sørensen") == "sorensen"
+
+
+def test_match_exact_after_folding():
+    index = _index()
+    assert index.match("Mikael Astrom") == 2
+    assert index.match("sorensen") == 4
+
+
+def test_match_fuzzy_and_unmatched():
+    index = _index()
+    assert index.match("Jesper Lofgrn") == 3
+    assert index.match("Viktor Gyokeres Jr") == 1
+    assert index.match("Completely Different") is None
+
+
+def test_match_agrees_with_difflib_on_random_league():
+    rng = random.Random(0)
+    letters = "abcdefghijklmnoprstuvy"
+    names = [
+        " ".join(
+            "".join(rng.choice(letters) for _ in range(rng.randint(4, 9)))
+            for _ in range(2)
+        )
+        for _ in range(400)
+    ]
+    index = NameIndex(list(range(len(names))), names)
+    for name in rng.sample(names, 50):
+        typo = name[:3] + name[4:]
+        expected = difflib.get_close_matches(typo, names, n=1, cutoff=0.6)
+        assert index.match(typo) == names.index(expected[0])
+
+
+def test_index_rejects_length_mismatch():
+    with pytest.raises(ValueError):
+        NameIndex([1, 2], ["a"])
+
+
+def test_name_map_builds_index_only_for_new_names(tmp_path):
+    path = tmp_path / "names.json"
+    builds = []
+
+    def build():
+        builds.append(1)
+        return _index()
+
+    name_map = NameMap.load(path)
+    assert name_map.resolve(["Mikael Åström", "Nobody Known"], build) == [
+        "Nobody Known"
+    ]
+    name_map.save(path)
+
+    reloaded = NameMap.load(path)
+    assert reloaded.matched == {"Mikael Åström": 2}
+    assert reloaded.unmatched == {"Nobody Known"}
+    # The unmatched name is neither retried nor reported again
+    assert reloaded.resolve(["Mikael Åström", "Nobody Known"], build) == []
+    assert reloaded.resolve(["Mikael Åström"], build) == []
+    assert len(builds) == 1
+    assert reloaded.lookup(["Mikael Åström", "x"]) == [2, None]
+
+    # Removing it from the file makes the next import try it again
+    reloaded.unmatched.clear()
+    assert reloaded.resolve(["Nobody Known"], build) == ["Nobody Known"]
+    assert len(builds) == 2
+
+
+def test_name_map_rematches_ids_no_longer_valid():
+    name_map = NameMap({"Jesper Löfgren": 99})
+    name_map.resolve(["Jesper Löfgren"], _index, valid_ids=PLAYERS["id"])
+    assert name_map.matched == {"Jesper Löfgren": 3}
+
+
+def test_build_enhanced_stats_forecasts_uses_saved_mapping(tmp_path, capsys):
+    engine = create_engine(f"sqlite:///{tmp_path / 'es.db'}")
+    with engine.begin() as conn:
+        PLAYERS.to_sql("players", conn, index=False)
+        pd.DataFrame(
+            {"name": ["Viktor Gyokeres", "J Lofgren", "Unknown Player"], "xFP": 1.0}
+        ).to_sql("enhanced_stats", conn, index=False)
+        conn.execute(
+            text('UPDATE enhanced_stats SET "xFP" = 4.5 WHERE name = "J Lofgren"')
+        )
+
+    path = tmp_path / "names.json"
+    with engine.connect() as conn:
+        df = build_enhanced_stats_forecasts(conn, names_path=path)
+        assert df.to_dict("list") == {
+            "player_id": [1, 3],
+            "expected_points": [1.0, 4.5],
+        }
+        assert "Unknown Player" in capsys.readouterr().out
+
+        build_enhanced_stats_forecasts(conn, names_path=path)
+        assert "Could not match" not in capsys.readouterr().out
+    engine.dispose()
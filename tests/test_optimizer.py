@@ -1,10 +1,14 @@
 """Tests for the optimizer constraint logic in scripts/optimize_team.py"""
 
+from unittest.mock import patch
+
 import cvxpy as cp
 import numpy as np
 import pandas as pd
 
-from fantasy_optimizer.config import OptimizationConfig
+from fantasy_optimizer.config import OptimizationConfig, SimulationConfig
+from fantasy_optimizer.forecasting.pmf import PointsDistributions
+from scripts import optimize_team
 from scripts.optimize_team import build_optimizer
 
 
@@ -112,3 +116,29 @@ def test_tight_budget_still_finds_solution():
     current_ids = list(pool["player_id"].iloc[:15])
     problem, x = _solve(pool, current_ids, balance=0.0)
     assert problem.status == cp.OPTIMAL
+
+
+def test_simulate_squads_scores_optimal_and_current_on_shared_scenarios():
+    pool = _make_pool()
+    problem, x = _solve(pool, current_ids=list(range(1, 16)))
+    optimal = pool.loc[x.value > 0.99, "player_id"].tolist()
+    # First 2 GK, 5 DEF, 5 MID and 3 FWD of the pool
+    current = [1, 2, 5, 6, 7, 8, 9, 15, 16, 17, 18, 19, 25, 26, 27]
+    grid = np.arange(0, 15)
+    rng = np.random.default_rng(1)
+    probs = rng.dirichlet(np.ones(grid.size), len(pool))
+    dists = PointsDistributions(pool["player_id"].to_numpy(), grid, probs)
+
+    with (
+        patch.object(optimize_team, "get_engine"),
+        patch.object(optimize_team, "load_distributions", return_value=dists),
+    ):
+        summary = optimize_team.simulate_squads(
+            pool,
+            {"current": current, "optimal": optimal, "unknown": list(range(90, 105))},
+            SimulationConfig(n_scenarios=2000, seed=3),
+        )
+
+    assert list(summary.index) == ["current", "optimal"]
+    assert {"mean", "q05", "q95", "p_50_plus"} <= set(summary.columns)
+    assert (summary["q05"] <= summary["q95"]).all()
@@ -0,0 +1,112 @@
+"""Tests for fantasy_optimizer/pipeline.py"""
+
+import threading
+import time
+
+import pytest
+
+from fantasy_optimizer.pipeline import Pipeline
+
+
+def _batched(size):
+    def stage(items):
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    return stage
+
+
+def test_items_flow_through_every_stage():
+    pipeline = (
+        Pipeline(queue_size=2)
+        .add_stage("double", lambda xs: (x * 2 for x in xs), workers=4)
+        .add_stage("batch", _batched(10))
+        .add_stage("sum", lambda batches: (sum(b) for b in batches))
+    )
+    assert sum(pipeline.run(range(95))) == 2 * sum(range(95))
+
+    double, batch, total = pipeline.stats
+    assert (double.workers, double.items_in, double.items_out) == (4, 95, 95)
+    assert (batch.items_in, batch.items_out) == (95, 10)
+    assert total.items_in == 10
+
+
+def test_empty_input():
+    pipeline = Pipeline().add_stage("batch", _batched(3)).add_stage("id", iter)
+    assert pipeline.run([]) == []
+
+
+def test_slow_consumer_applies_backpressure():
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+
+    def produce(xs):
+        nonlocal in_flight, peak
+        for x in xs:
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            yield x
+
+    def consume(xs):
+        nonlocal in_flight
+        for x in xs:
+            time.sleep(0.005)
+            with lock:
+                in_flight -= 1
+            yield x
+
+    pipeline = (
+        Pipeline(queue_size=2)
+        .add_stage("produce", produce)
+        .add_stage("consume", consume)
+    )
+    assert pipeline.run(range(40)) == list(range(40))
+    # Queue of two, one item being put and one being consumed
+    assert peak <= 4
+    assert pipeline.stats[0].blocked_seconds > pipeline.stats[1].blocked_seconds
+
+
+def test_stages_overlap():
+    def slow(delay):
+        def stage(items):
+            for item in items:
+                time.sleep(delay)
+                yield item
+
+        return stage
+
+    pipeline = (
+        Pipeline(queue_size=4)
+        .add_stage("fetch", slow(0.02))
+        .add_stage("write", slow(0.02))
+    )
+    start = time.perf_counter()
+    pipeline.run(range(15))
+    elapsed = time.perf_counter() - start
+
+    # Sequential would be 15 * 0.04 = 0.6s; pipelined is close to one stage's 0.3s
+    assert elapsed < 0.5
+    assert all(s.busy_seconds >= 0.25 for s in pipeline.stats)
+
+
+def test_failure_in_a_stage_is_reraised():
+    def boom(items):
+        for item in items:
+            if item == 5:
+                raise ValueError("bad item")
+            yield item
+
+    pipeline = (
+        Pipeline(queue_size=1)
+        .add_stage("fetch", lambda xs: xs, workers=2)
+        .add_stage("write", boom)
+    )
+    with pytest.raises(ValueError, match="bad item"):
+        pipeline.run(range(1000))
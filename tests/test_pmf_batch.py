@@ -0,0 +1,158 @@
+"""Tests for fantasy_optimizer/forecasting/pmf.py against the per-player PMF."""
+
+import numpy as np
+import pytest
+
+from fantasy_optimizer.forecasting.pmf import (
+    HAUL_POINTS,
+    PointsDistributions,
+    PoolPmfCache,
+    batch_points_pmf,
+    pool_pmf,
+    zero_boosts,
+)
+from scripts.build_forecasts import _pmf_from_pool, build_points_pmf
+
+
+def _reference_zero_boost(pts: np.ndarray) -> float:
+    if not pts.size:
+        return 0.0
+    w = 0.8 ** np.arange(min(6, pts.size))[::-1]
+    recent = pts[-len(w) :]
+    return float(np.clip(0.5 * (w * (recent == 0)).sum() / w.sum(), 0.0, 0.06))
+
+
+def _assert_matches(histories, pools, boosts, **kwargs):
+    batch = batch_points_pmf(histories, pools, zero_boost=boosts, **kwargs)
+    for i, (h, pool) in enumerate(zip(histories, pools)):
+        grid, pmf = build_points_pmf(
+            h, pool_points=pool, zero_boost=float(np.atleast_1d(boosts)[i]), **kwargs
+        )
+        batch_grid, batch_pmf = batch.row(i)
+        np.testing.assert_array_equal(batch_grid, grid)
+        np.testing.assert_allclose(batch_pmf, pmf, rtol=0, atol=1e-12)
+        assert batch.expected[i] == pytest.approx(float((grid * pmf).sum()), abs=1e-12)
+
+
+def test_random_league_matches_per_player():
+    rng = np.random.default_rng(1)
+    pools = [rng.integers(-2, 18, 400), rng.integers(0, 25, 900), None]
+    histories = [rng.integers(-1, 14, rng.integers(0, 25)) for _ in range(150)]
+    player_pools = [pools[i % 3] for i in range(len(histories))]
+    _assert_matches(histories, player_pools, zero_boosts(histories))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"smooth_sigma": 0.0},
+        {"smooth_sigma": 1.5},
+        {"mix_with_pool": 0.05},
+        {"decay": 0.5, "mix_with_pool": 0.6},
+    ],
+)
+def test_parameters_match_per_player(kwargs):
+    rng = np.random.default_rng(2)
+    pool = rng.integers(0, 15, 300)
+    histories = [rng.integers(0, 12, rng.integers(1, 20)) for _ in range(30)]
+    _assert_matches(histories, [pool] * 30, zero_boosts(histories), **kwargs)
+
+
+def test_edge_cases_match_per_player():
+    histories = [
+        np.array([], dtype=int),  # no history: spike at 0 mixed with the pool
+        np.array([0, 0, 0]),  # all blanks with an all-blank pool: only 0 in support
+        np.array([3, 4, 5]),  # support without 0, boosted: grid extended down to 0
+        np.array([-1, 2]),
+    ]
+    pools = [None, np.array([0, 0]), np.array([2, 3, 9]), None]
+    _assert_matches(histories, pools, np.array([0.0, 0.06, 0.05, 0.02]))
+
+
+def test_zero_boosts_match_per_player():
+    histories = [
+        np.array([], dtype=int),
+        np.array([0]),
+        np.array([5, 0, 0, 3, 0, 2, 0, 0]),
+        np.array([1, 2, 3]),
+    ]
+    expected = [_reference_zero_boost(h) for h in histories]
+    np.testing.assert_allclose(zero_boosts(histories), expected, rtol=0, atol=1e-15)
+
+
+def test_rows_are_distributions_on_shared_grid():
+    batch = batch_points_pmf([np.array([1, 2]), np.array([10, 12])], [None, None])
+    assert batch.probs.shape == (2, batch.grid.size)
+    np.testing.assert_allclose(batch.probs.sum(axis=1), 1.0)
+    assert batch.grid[0] == 0 and batch.grid[-1] == 20
+
+
+def test_pool_count_must_match():
+    with pytest.raises(ValueError, match="pools"):
+        batch_points_pmf([np.array([1])], [None, None])
+
+
+def test_pool_pmf_matches_per_player_pool():
+    points = np.random.default_rng(4).integers(-1, 20, 2000)
+    pmf = pool_pmf(points)
+    support, probs = _pmf_from_pool(points)
+    np.testing.assert_array_equal(pmf.support, support)
+    np.testing.assert_allclose(pmf.probs, probs, rtol=0, atol=1e-15)
+
+
+def test_prebuilt_pool_pmfs_give_same_rows():
+    rng = np.random.default_rng(5)
+    pool = rng.integers(0, 15, 500)
+    histories = [rng.integers(0, 10, 8) for _ in range(5)]
+    raw = batch_points_pmf(histories, [pool] * 5)
+    built = batch_points_pmf(histories, [pool_pmf(pool)] * 5)
+    np.testing.assert_array_equal(raw.probs, built.probs)
+
+
+def test_unverified_pool_cache_is_keyed_by_position_and_round():
+    cache = PoolPmfCache(verify=False)
+    points = np.array([0, 2, 2, 5])
+    first = cache.get("MID", 3, points)
+    assert cache.get("MID", 3, points.copy()) is first
+    assert cache.get("MID", 4, points) is not first
+    # The key alone decides; the points are not looked at on a hit
+    assert cache.get("MID", 3, np.array([0, 1])) is first
+    assert (cache.hits, cache.misses, len(cache)) == (2, 2, 2)
+
+
+def test_pool_cache_rebuilds_changed_content():
+    cache = PoolPmfCache()
+    points = np.array([0, 2, 2, 5])
+    first = cache.get("MID", 3, points)
+    assert cache.get("MID", 3, points.copy()) is first
+    # Same key with different points is rebuilt rather than served stale
+    changed = cache.get("MID", 3, np.array([0, 1]))
+    np.testing.assert_array_equal(changed.support, [0, 1])
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 1)
+
+
+def test_distribution_summaries_match_per_player_moments():
+    rng = np.random.default_rng(6)
+    histories = [rng.integers(-1, 16, 10) for _ in range(20)]
+    batch = batch_points_pmf(histories, [None] * 20, zero_boost=zero_boosts(histories))
+    dists = PointsDistributions.from_batch(np.arange(100, 120), batch)
+    summary = dists.summary()
+
+    for i, row in summary.iterrows():
+        grid, pmf = batch.row(i)
+        mean = float((grid * pmf).sum())
+        assert row["player_id"] == 100 + i
+        assert row["expected_points"] == pytest.approx(mean, abs=1e-12)
+        assert row["variance"] == pytest.approx(
+            float(((grid - mean) ** 2 * pmf).sum()), abs=1e-9
+        )
+        assert row["p_zero"] == pytest.approx(float(pmf[grid == 0].sum()), abs=1e-12)
+        assert row["p_haul"] == pytest.approx(
+            float(pmf[grid >= HAUL_POINTS].sum()), abs=1e-12
+        )
+
+
+def test_distributions_need_one_id_per_pmf():
+    batch = batch_points_pmf([np.array([1])])
+    with pytest.raises(ValueError, match="ids"):
+        PointsDistributions.from_batch(np.array([1, 2]), batch)
@@ -0,0 +1,156 @@
+"""Tests for fantasy_optimizer/forecasting/simulate.py."""
+
+import numpy as np
+import pytest
+
+from fantasy_optimizer.forecasting.pmf import PointsDistributions
+from fantasy_optimizer.forecasting.simulate import (
+    MAX_STARTERS,
+    MIN_STARTERS,
+    POSITIONS,
+    Squad,
+    SquadSimulator,
+    _score,
+)
+
+# 2 GK, 5 DEF, 5 MID, 3 FWD
+SQUAD_POSITIONS = ["GK"] * 2 + ["DEF"] * 5 + ["MID"] * 5 + ["FWD"] * 3
+
+
+def _reference_score(points: dict, squad: Squad, positions: dict) -> int:
+    """One gameweek scored by following the rules player by player."""
+    xi = list(squad.starters)
+    for sub in squad.bench:
+        if points[sub] == 0:
+            continue
+        for i, starter in enumerate(xi):
+            if points[starter] != 0 or starter not in squad.starters:
+                continue
+            trial = xi[:i] + [sub] + xi[i + 1 :]
+            counts = np.bincount(
+                [POSITIONS.index(positions[p]) for p in trial], minlength=4
+            )
+            if (counts >= MIN_STARTERS).all() and (counts <= MAX_STARTERS).all():
+                xi = trial
+                break
+    total = sum(points[p] for p in xi)
+    if points[squad.captain] != 0:
+        return total + points[squad.captain]
+    return total + points[squad.vice_captain]
+
+
+def _random_squad(rng, ids_by_pos) -> Squad:
+    ids = []
+    for pos, n in (("GK", 2), ("DEF", 5), ("MID", 5), ("FWD", 3)):
+        ids += list(rng.choice(ids_by_pos[pos], n, replace=False))
+    return Squad.from_expected(ids, SQUAD_POSITIONS, rng.random(15))
+
+
+def _league(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = {i: POSITIONS[i % 4] for i in range(n)}
+    grid = np.arange(-1, 9)
+    probs = rng.dirichlet(np.ones(grid.size), n)
+    probs[:, 1] += 0.4  # plenty of blanks, so substitutions happen
+    probs /= probs.sum(axis=1, keepdims=True)
+    return PointsDistributions(np.arange(n), grid, probs), positions
+
+
+def test_score_matches_reference_rules():
+    rng = np.random.default_rng(1)
+    dists, positions = _league()
+    ids_by_pos = {p: [i for i in positions if positions[i] == p] for p in POSITIONS}
+    squads = [_random_squad(rng, ids_by_pos) for _ in range(6)]
+    union = sorted({p for s in squads for p in s.player_ids})
+    column = {p: i for i, p in enumerate(union)}
+    slots = np.array([[column[p] for p in s.player_ids] for s in squads])
+    pos = np.array(
+        [[POSITIONS.index(positions[p]) for p in s.player_ids] for s in squads]
+    )
+    captain = np.array([s.starters.index(s.captain) for s in squads])
+    vice = np.array([s.starters.index(s.vice_captain) for s in squads])
+    points = rng.choice([-1, 0, 0, 0, 1, 2, 6], size=(300, len(union)))
+
+    totals = _score(points, slots, pos, captain, vice)
+
+    for q, squad in enumerate(squads):
+        for k in range(len(points)):
+            scenario = dict(zip(union, points[k]))
+            assert totals[q, k] == _reference_score(scenario, squad, positions)
+
+
+def test_from_expected_picks_best_valid_xi_and_captains():
+    expected = [9, 1, 8, 7, 2, 2, 2, 6, 5, 4, 3, 3, 1, 1, 0.5]
+    squad = Squad.from_expected(range(15), SQUAD_POSITIONS, expected)
+    # Formation minimums (the lone forward 12 included), then the best of the rest
+    assert squad.starters == (0, 2, 3, 7, 8, 9, 10, 11, 4, 5, 12)
+    assert squad.bench == (1, 6, 13, 14)
+    assert (squad.captain, squad.vice_captain) == (0, 2)
+
+
+def test_squad_rejects_bad_lineups():
+    with pytest.raises(ValueError, match="11 starters"):
+        Squad(tuple(range(10)), (10, 11, 12, 13), 0, 1)
+    with pytest.raises(ValueError, match="Captain"):
+        Squad(tuple(range(11)), (11, 12, 13, 14), 0, 0)
+    with pytest.raises(ValueError, match="positions"):
+        Squad.from_expected(range(15), ["GK"] * 15, [1.0] * 15)
+
+
+def test_simulation_is_seeded_and_shares_scenarios():
+    dists, positions = _league()
+    rng = np.random.default_rng(2)
+    ids_by_pos = {p: [i for i in positions if positions[i] == p] for p in POSITIONS}
+    squad = _random_squad(rng, ids_by_pos)
+
+    def run(squads, batch_size):
+        sim = SquadSimulator(dists, positions, seed=5, batch_size=batch_size)
+        return sim.simulate(squads, n_scenarios=5000)
+
+    first = run([squad, squad], 1000)
+    again = run([squad, squad], 1000)
+    np.testing.assert_array_equal(first.counts, again.counts)
+    # The same squad twice sees identical scenarios
+    np.testing.assert_array_equal(first.counts[0], first.counts[1])
+    assert first.n_scenarios == 5000
+
+
+def test_outcomes_summaries_agree_with_sampled_totals():
+    dists, positions = _league(seed=3)
+    rng = np.random.default_rng(4)
+    ids_by_pos = {p: [i for i in positions if positions[i] == p] for p in POSITIONS}
+    squads = [_random_squad(rng, ids_by_pos) for _ in range(2)]
+    outcomes = SquadSimulator(dists, positions, seed=1, batch_size=700).simulate(
+        squads, n_scenarios=4000, n_gameweeks=3, labels=["a", "b"]
+    )
+    totals = np.repeat(outcomes.points[None, :], 2, axis=0)
+    for q in range(2):
+        sample = np.repeat(totals[q], outcomes.counts[q])
+        assert outcomes.mean()[q] == pytest.approx(sample.mean())
+        assert outcomes.std()[q] == pytest.approx(sample.std())
+        np.testing.assert_array_equal(
+            outcomes.quantiles([0.1, 0.5, 0.9])[q],
+            np.quantile(sample, [0.1, 0.5, 0.9], method="inverted_cdf"),
+        )
+        assert outcomes.prob_at_least(20)[q] == pytest.approx((sample >= 20).mean())
+    summary = outcomes.summary()
+    assert list(summary.index) == ["a", "b"]
+    assert list(summary.columns) == ["mean", "std", "q05", "q25", "q50", "q75", "q95"]
+
+
+def test_simulation_mean_matches_expected_points_without_blanks():
+    # No zeros: no substitutions, so the mean is the XI's expectation plus the captain's
+    grid = np.arange(1, 4)
+    probs = np.tile([0.5, 0.3, 0.2], (15, 1))
+    dists = PointsDistributions(np.arange(15), grid, probs)
+    positions = dict(zip(range(15), SQUAD_POSITIONS))
+    squad = Squad.from_expected(range(15), SQUAD_POSITIONS, [1.0] * 15)
+    outcomes = SquadSimulator(dists, positions, seed=0).simulate([squad], 200_000)
+    assert outcomes.mean()[0] == pytest.approx(12 * 1.7, rel=0.005)
+
+
+def test_unknown_players_are_rejected():
+    dists, positions = _league()
+    squad = Squad.from_expected(range(100, 115), SQUAD_POSITIONS, [1.0] * 15)
+    with pytest.raises(ValueError, match="No distribution"):
+        SquadSimulator(dists, positions).simulate([squad], 10)
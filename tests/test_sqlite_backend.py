@@ -0,0 +1,192 @@
+"""Upsert and forecast storage against the embedded SQLite backend."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+import fantasy_optimizer.db.models  # noqa: F401 — registers all ORM models with Base
+from fantasy_optimizer.db import forecasts
+from fantasy_optimizer.db.database import Base, make_engine
+from fantasy_optimizer.db.models import PlayerGameweekStatRow, TeamRow
+from fantasy_optimizer.db.upsert import upsert_rows
+from fantasy_optimizer.forecasting.horizon import HorizonForecast
+from fantasy_optimizer.forecasting.pmf import PointsDistributions, batch_points_pmf
+
+
+@pytest.fixture()
+def sqlite_engine(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'fantasy.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _gw(element, fixture, points):
+    return {
+        "element": element,
+        "fixture": fixture,
+        "opponent_team": 2,
+        "total_points": points,
+        "was_home": True,
+        "kickoff_time": "2025-04-01T17:00:00Z",
+        "minutes": 90,
+        "goals_scored": 0,
+        "assists": 0,
+        "clean_sheets": 0,
+        "goals_conceded": 0,
+        "own_goals": 0,
+        "penalties_saved": 0,
+        "penalties_missed": 0,
+        "yellow_cards": 0,
+        "red_cards": 0,
+        "saves": 0,
+        "bonus": 0,
+        "round": fixture,
+        "season": 2025,
+    }
+
+
+def test_upsert_inserts_then_updates(sqlite_engine):
+    with sqlite_engine.begin() as conn:
+        upsert_rows(
+            PlayerGameweekStatRow,
+            [_gw(1, 1, 2), _gw(1, 2, 5)],
+            ["element", "fixture"],
+            conn=conn,
+        )
+        upsert_rows(
+            PlayerGameweekStatRow, [_gw(1, 2, 9)], ["element", "fixture"], conn=conn
+        )
+        rows = conn.execute(
+            text(
+                "SELECT fixture, total_points FROM player_gameweek_stats ORDER BY fixture"
+            )
+        ).all()
+    assert rows == [(1, 2), (2, 9)]
+
+
+def test_use_copy_falls_back_on_sqlite(sqlite_engine):
+    team = {"id": 1, "name": "Malmö FF", "short_name": "MFF"}
+    with sqlite_engine.begin() as conn:
+        assert upsert_rows(TeamRow, [team], ["id"], use_copy=True, conn=conn) == 1
+        assert conn.execute(text("SELECT name FROM teams")).scalar() == "Malmö FF"
+
+
+def test_forecast_runs_round_trip(sqlite_engine):
+    with patch.object(forecasts, "get_engine", return_value=sqlite_engine):
+        first = forecasts.save_forecast_run(
+            [
+                {"player_id": 1, "expected_points": 4.0},
+                {"player_id": 2, "expected_points": 2.0},
+            ],
+            "simulation",
+            "1",
+            gameweek=3,
+        )
+        second = forecasts.save_forecast_run(
+            [{"player_id": 1, "expected_points": 6.0}], "simulation", "2", gameweek=4
+        )
+        rerun = forecasts.save_forecast_run(
+            [{"player_id": 1, "expected_points": 5.0}], "simulation", "2", gameweek=4
+        )
+
+    assert rerun == second != first
+    with sqlite_engine.connect() as conn:
+        newest = forecasts.load_forecasts(conn)
+        chosen = forecasts.load_forecasts(conn, "simulation", "1")
+        latest = forecasts.latest_forecast_per_player(conn)
+        runs = forecasts.list_forecast_runs(conn)
+
+    assert newest.to_dict("records") == [{"player_id": 1, "expected_points": 5.0}]
+    assert sorted(chosen["player_id"]) == [1, 2]
+    assert latest.set_index("player_id")["expected_points"].to_dict() == {
+        1: 5.0,
+        2: 2.0,
+    }
+    assert latest.set_index("player_id")["model_version"].to_dict() == {1: "2", 2: "1"}
+    assert sorted(runs["players"]) == [1, 2]
+
+
+def test_latest_per_player_agrees_with_load_forecasts(sqlite_engine):
+    with patch.object(forecasts, "get_engine", return_value=sqlite_engine):
+        forecasts.save_forecast_run(
+            [{"player_id": 1, "expected_points": 6.0}], "simulation", "1", gameweek=4
+        )
+        # A later run for an earlier gameweek is not the newest forecast
+        forecasts.save_forecast_run(
+            [{"player_id": 1, "expected_points": 2.0}], "simulation", "2", gameweek=3
+        )
+
+    with sqlite_engine.connect() as conn:
+        newest = forecasts.load_forecasts(conn)
+        latest = forecasts.latest_forecast_per_player(conn)
+    assert newest["expected_points"].tolist() == [6.0]
+    assert latest["expected_points"].tolist() == [6.0]
+    assert latest["gameweek"].tolist() == [4]
+
+
+def test_deleting_run_cascades(sqlite_engine):
+    with patch.object(forecasts, "get_engine", return_value=sqlite_engine):
+        run_id = forecasts.save_forecast_run(
+            [{"player_id": 1, "expected_points": 4.0}], "simulation", "1", gameweek=1
+        )
+    with sqlite_engine.begin() as conn:
+        conn.execute(text("DELETE FROM forecast_runs WHERE id = :id"), {"id": run_id})
+        assert conn.execute(text("SELECT count(*) FROM forecasts")).scalar() == 0
+
+
+def test_distributions_round_trip_with_summaries(sqlite_engine):
+    batch = batch_points_pmf([np.array([0, 3, 12]), np.array([2, 2, 5])])
+    dists = PointsDistributions.from_batch(np.array([7, 9]), batch)
+    summary = dists.summary()
+    with patch.object(forecasts, "get_engine", return_value=sqlite_engine):
+        forecasts.save_forecast_run(
+            summary.to_dict("records"), "simulation", "1", gameweek=2
+        )
+        # Re-saving the run replaces its stored distributions
+        forecasts.save_forecast_run(
+            summary.to_dict("records"),
+            "simulation",
+            "1",
+            gameweek=2,
+            distributions=dists,
+        )
+        forecasts.save_forecast_run(
+            [{"player_id": 7, "expected_points": 1.0}], "enhanced", "1", gameweek=1
+        )
+
+    with sqlite_engine.connect() as conn:
+        loaded = forecasts.load_distributions(conn, "simulation")
+        stats = forecasts.load_forecasts(conn, "simulation", with_stats=True)
+        assert forecasts.load_distributions(conn, "enhanced") is None
+
+    np.testing.assert_array_equal(loaded.player_ids, [7, 9])
+    np.testing.assert_array_equal(loaded.grid, batch.grid)
+    assert loaded.probs.dtype == np.float32
+    np.testing.assert_allclose(loaded.probs, batch.probs, rtol=1e-6, atol=1e-7)
+    pd.testing.assert_frame_equal(stats, summary, check_dtype=False)
+    np.testing.assert_allclose(loaded.expected, summary["expected_points"], rtol=1e-6)
+
+
+def test_horizon_round_trip_and_replaced_on_resave(sqlite_engine):
+    horizon = HorizonForecast(
+        np.array([7, 9]), np.array([3, 4, 5]), np.array([[1.5, 0, 3], [2, 2, 2.25]])
+    )
+    rows = [{"player_id": 7, "expected_points": 1.5}]
+    with patch.object(forecasts, "get_engine", return_value=sqlite_engine):
+        forecasts.save_forecast_run(
+            rows, "simulation", "1", gameweek=3, horizon=horizon
+        )
+        with sqlite_engine.connect() as conn:
+            loaded = forecasts.load_horizon(conn)
+        # Saving the run again without a horizon drops the stale one
+        forecasts.save_forecast_run(rows, "simulation", "1", gameweek=3)
+        with sqlite_engine.connect() as conn:
+            assert forecasts.load_horizon(conn) is None
+
+    np.testing.assert_array_equal(loaded.player_ids, [7, 9])
+    np.testing.assert_array_equal(loaded.rounds, [3, 4, 5])
+    np.testing.assert_array_equal(loaded.expected, horizon.expected)
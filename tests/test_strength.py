@@ -0,0 +1,93 @@
+"""Tests for fantasy_optimizer/forecasting/strength.py."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fantasy_optimizer.forecasting.strength import (
+    StrengthModel,
+    _design,
+    fit_team_strength,
+)
+
+
+def test_fit_solves_penalised_score_equations(make_season):
+    df = make_season(rounds=20, players=0).results
+    ridge, decay = 0.5, 0.95
+    ratings = fit_team_strength(df, ridge=ridge, round_decay=decay)
+
+    team = np.searchsorted(ratings.teams, df["team"])
+    opp = np.searchsorted(ratings.teams, df["opponent_team"])
+    X = _design(team, opp, df["was_home"].to_numpy(), len(ratings.teams))
+    beta = np.concatenate(
+        [[ratings.intercept, ratings.home], ratings.attack, ratings.defence]
+    )
+    w = decay ** (df["round"].max() - df["round"].to_numpy())
+    gradient = X.T @ (w * (df["team_score"] - np.exp(X @ beta)))
+    gradient[2:] -= ridge * beta[2:]
+    np.testing.assert_allclose(gradient, 0.0, atol=1e-7)
+
+
+def test_fit_recovers_ratings_and_home_advantage(make_season):
+    season = make_season(rounds=200, seed=1, players=0)
+    ratings = fit_team_strength(season.results, ridge=0.01)
+    assert np.corrcoef(ratings.attack, season.attack)[0, 1] > 0.8
+    assert np.corrcoef(ratings.defence, season.defence)[0, 1] > 0.8
+    assert ratings.home == pytest.approx(0.3, abs=0.1)
+
+
+def test_unplayed_rows_are_ignored(make_season):
+    df = make_season(rounds=20, players=0).results
+    upcoming = df.assign(round=df["round"] + 100, team_score=np.nan)
+    both = fit_team_strength(pd.concat([df, upcoming]))
+    played = fit_team_strength(df)
+    np.testing.assert_allclose(both.attack, played.attack)
+
+
+def test_multipliers_favour_strong_teams_at_home(make_season):
+    df = make_season(rounds=40, seed=2, players=0).results
+    ratings = fit_team_strength(df)
+    best = ratings.teams[np.argmax(ratings.attack + ratings.defence)]
+    worst = ratings.teams[np.argmin(ratings.attack + ratings.defence)]
+    home, away = ratings.multipliers(
+        np.array([best, best]), np.array([worst, worst]), np.array([True, False]), 0.3
+    )
+    assert home > away > 1.0
+    reverse = ratings.multipliers(
+        np.array([worst]), np.array([best]), np.array([False]), 0.3
+    )
+    assert reverse[0] == pytest.approx(1 / home)
+    # Teams the model has never seen rate as average
+    assert ratings.expected_goals(np.array([99]), np.array([99]), np.array([False]))[
+        0
+    ] == pytest.approx(np.exp(ratings.intercept))
+
+
+def test_model_refits_only_on_new_results_and_caches_difficulty(make_season):
+    df = make_season(rounds=20, players=0).results
+    upcoming = pd.DataFrame(
+        {
+            "round": [21, 21, 22, 22, 22, 22],
+            "team": [1, 2, 1, 2, 1, 3],
+            "opponent_team": [2, 1, 2, 1, 3, 1],
+            "was_home": [True, False, False, True, True, False],
+            "team_score": np.nan,
+        }
+    )
+    model = StrengthModel()
+    model.fit(pd.concat([df[df["round"] < 20], upcoming]))
+    first = model.ratings
+    model.fit(pd.concat([df, upcoming]))
+    model.fit(pd.concat([df, upcoming]))
+    assert model.fits == 2
+    # Warm-started from the previous round's fit
+    assert model.ratings.iterations < first.iterations
+
+    teams, rounds = np.array([1, 2, 3]), np.array([21, 22, 23])
+    matrix = model.difficulty(upcoming, teams, rounds)
+    assert model.difficulty(upcoming, teams, rounds) is matrix
+    assert (matrix[:, 2] == 0).all()  # nobody plays round 23
+    assert matrix[0, 1] == pytest.approx(
+        model.fixture_multipliers(upcoming.iloc[[2, 4]]).sum()
+    )
+    assert matrix[2, 0] == 0 and matrix[2, 1] > 0
@@ -0,0 +1,88 @@
+"""Tests for fantasy_optimizer/forecasting/tuning.py."""
+
+from dataclasses import asdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fantasy_optimizer.config import ForecastConfig
+from fantasy_optimizer.forecasting.backtest import Backtest
+from fantasy_optimizer.forecasting.tuning import (
+    SharedFrame,
+    attach_frame,
+    best_config,
+    grid,
+    tune,
+)
+
+
+def test_grid_covers_every_combination():
+    configs = grid({"decay": [0.8, 0.9], "smooth_sigma": [0.0, 0.2, 0.4]})
+    assert len(configs) == 6
+    assert len({tuple(asdict(c).values()) for c in configs}) == 6
+    assert {c.mix_with_pool for c in configs} == {ForecastConfig().mix_with_pool}
+    assert len(grid()) == 192
+
+
+def test_shared_frame_round_trip_is_read_only(make_season):
+    df = make_season(rounds=8, players=24).players[["element", "round", "total_points"]]
+    with SharedFrame(df) as shared:
+        attached, blocks = attach_frame(shared.spec)
+        pd.testing.assert_frame_equal(attached, df, check_dtype=True)
+        with pytest.raises(ValueError):
+            attached["element"].to_numpy()[0] = 99
+        for block in blocks:
+            block.close()
+
+
+def test_tune_matches_serial_backtest_and_ranks_by_metric(make_season):
+    df = make_season(rounds=8, players=24).players
+    configs = grid({"decay": [0.8, 0.95], "mix_with_pool": [0.1, 0.4]})
+    trials = tune(df, configs, processes=2)
+
+    assert len(trials) == 4
+    assert trials["log_loss"].is_monotonic_increasing
+    backtest = Backtest(df)
+    for _, trial in trials.iterrows():
+        cfg = ForecastConfig(
+            trial["decay"], trial["mix_with_pool"], trial["smooth_sigma"]
+        )
+        expected = backtest.run(**asdict(cfg)).summary()
+        assert trial["log_loss"] == pytest.approx(expected["log_loss"], abs=1e-12)
+        assert trial["mae"] == pytest.approx(expected["mae"], abs=1e-12)
+
+    best = best_config(trials)
+    assert best in configs
+    assert isinstance(best.zero_window, int)
+
+
+def test_tune_rejects_unknown_metric(make_season):
+    with pytest.raises(ValueError):
+        tune(
+            make_season(rounds=8, players=24).players,
+            grid({"decay": [0.9]}),
+            metric="accuracy",
+        )
+
+
+def test_worker_backtest_uses_shared_buffers(make_season):
+    df = make_season(rounds=8, players=24).players.sort_values(
+        ["round", "element", "fixture"]
+    )
+    df["position"] = pd.factorize(df["position"], sort=True)[0]
+    with SharedFrame(df) as shared:
+        attached, blocks = attach_frame(shared.spec)
+        raw = {
+            col: np.ndarray((n,), np.dtype(dtype), buffer=block.buf)
+            for (col, _, dtype, n), block in zip(shared.spec, blocks)
+        }
+        backtest = Backtest(attached)
+        for col in df.columns:
+            assert np.shares_memory(backtest.rows[col].to_numpy(), raw[col])
+        round_points = backtest.round_rows(3)["total_points"].to_numpy()
+        assert np.shares_memory(round_points, raw["total_points"])
+        backtest.run()
+        del backtest, attached, raw, round_points
+        for block in blocks:
+            block.close()
@@ -0,0 +1,130 @@
+"""Tests for fantasy_optimizer/db/upsert.py — statement batching, no database."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from fantasy_optimizer.db import upsert
+from fantasy_optimizer.db.models import ForecastRow, PlayerGameweekStatRow
+from fantasy_optimizer.db.upsert import (
+    MAX_BIND_PARAMS,
+    MAX_ROWS_PER_STATEMENT,
+    rows_per_statement,
+    upsert_rows,
+)
+
+
+@pytest.fixture()
+def engine():
+    engine = MagicMock()
+    _conn(engine).dialect.name = "postgresql"
+    with patch.object(upsert, "get_engine", return_value=engine):
+        yield engine
+
+
+def _conn(engine):
+    return engine.begin.return_value.__enter__.return_value
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+# --- rows_per_statement ---
+
+
+def test_rows_per_statement_respects_bind_param_limit():
+    assert rows_per_statement(100) == MAX_BIND_PARAMS // 100
+    assert rows_per_statement(100) * 100 <= MAX_BIND_PARAMS
+
+
+def test_rows_per_statement_capped_for_narrow_rows():
+    assert rows_per_statement(2) == MAX_ROWS_PER_STATEMENT
+    assert rows_per_statement(0) == MAX_ROWS_PER_STATEMENT
+
+
+def test_rows_per_statement_at_least_one():
+    assert rows_per_statement(MAX_BIND_PARAMS * 2) == 1
+
+
+# --- upsert_rows ---
+
+
+def test_empty_rows_is_noop(engine):
+    assert upsert_rows(PlayerGameweekStatRow, [], ["element", "fixture"]) == 0
+    assert upsert.upsert_players([]) == 0
+    engine.begin.assert_not_called()
+
+
+def test_chunks_run_in_one_transaction(engine):
+    rows = [{"element": i, "fixture": 1, "total_points": i} for i in range(2500)]
+    assert upsert_rows(PlayerGameweekStatRow, rows, ["element", "fixture"]) == 2500
+
+    engine.begin.assert_called_once()
+    calls = _conn(engine).execute.call_args_list
+    assert [len(c.args[1]) for c in calls] == [1000, 1000, 500]
+    assert [r for c in calls for r in c.args[1]] == rows
+
+
+def test_chunk_size_shrinks_with_column_count(engine):
+    rows = [{"element": i, "fixture": 1, "total_points": 0} for i in range(10)]
+    with patch.object(upsert, "MAX_BIND_PARAMS", 9):
+        upsert_rows(PlayerGameweekStatRow, rows, ["element", "fixture"])
+    sizes = [len(c.args[1]) for c in _conn(engine).execute.call_args_list]
+    assert sizes == [3, 3, 3, 1]
+
+
+def test_update_set_defaults_to_non_key_columns(engine):
+    upsert_rows(
+        PlayerGameweekStatRow,
+        [{"element": 1, "fixture": 2, "total_points": 3, "minutes": 90}],
+        ["element", "fixture"],
+    )
+    sql = _sql(_conn(engine).execute.call_args.args[0])
+    assert "ON CONFLICT (element, fixture) DO UPDATE SET" in sql
+    assert "total_points = excluded.total_points" in sql
+    assert "minutes = excluded.minutes" in sql
+    assert "element = excluded.element" not in sql
+
+
+def test_explicit_update_cols(engine):
+    upsert.upsert_forecasts([{"run_id": 7, "player_id": 1, "expected_points": 4.2}])
+    sql = _sql(_conn(engine).execute.call_args.args[0])
+    assert sql.startswith(f"INSERT INTO {ForecastRow.__tablename__}")
+    assert "ON CONFLICT (run_id, player_id)" in sql
+    assert "DO UPDATE SET expected_points = excluded.expected_points" in sql
+
+
+def test_no_update_cols_does_nothing_on_conflict(engine):
+    upsert_rows(
+        PlayerGameweekStatRow, [{"element": 1, "fixture": 2}], ["element", "fixture"]
+    )
+    assert "DO NOTHING" in _sql(_conn(engine).execute.call_args.args[0])
+
+
+def test_use_copy_delegates_to_copy_upsert(engine):
+    rows = [{"run_id": 7, "player_id": 1, "expected_points": 4.2}]
+    with patch.object(upsert, "copy_upsert", return_value=1) as copy:
+        assert upsert.upsert_forecasts(rows, use_copy=True) == 1
+    copy.assert_called_once_with(
+        _conn(engine),
+        ForecastRow.__table__,
+        rows,
+        ["run_id", "player_id"],
+        ["expected_points"],
+    )
+    _conn(engine).execute.assert_not_called()
+
+
+def test_caller_connection_skips_own_transaction(engine):
+    conn = MagicMock()
+    conn.dialect.name = "postgresql"
+    upsert_rows(
+        PlayerGameweekStatRow,
+        [{"element": 1, "fixture": 2, "total_points": 3}],
+        ["element", "fixture"],
+        conn=conn,
+    )
+    engine.begin.assert_not_called()
+    conn.execute.assert_called_once()
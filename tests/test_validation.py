@@ -0,0 +1,121 @@
+"""Tests for fantasy_optimizer/models/validation.py"""
+
+from typing import Optional
+
+from pydantic import BaseModel, computed_field, field_validator
+
+from fantasy_optimizer.models.gameweek import PlayerGameweekStat
+from fantasy_optimizer.models.team import Team
+from fantasy_optimizer.models.validation import (
+    MAX_REPORTED_ERRORS,
+    validate_rows,
+)
+
+
+def _team(tid: int, **overrides) -> dict:
+    return {"id": tid, "name": f"Team {tid}", "short_name": f"T{tid}", **overrides}
+
+
+def _gw(element: int, **overrides) -> dict:
+    row = {
+        "element": element,
+        "fixture": 1,
+        "opponent_team": 2,
+        "total_points": 3,
+        "was_home": True,
+        "kickoff_time": "2025-04-01T17:00:00Z",
+        "minutes": 90,
+        "goals_scored": 0,
+        "assists": 0,
+        "clean_sheets": 0,
+        "goals_conceded": 1,
+        "own_goals": 0,
+        "penalties_saved": 0,
+        "penalties_missed": 0,
+        "yellow_cards": 0,
+        "red_cards": 0,
+        "saves": 0,
+        "round": 1,
+        "bps": 12,  # extra API field, ignored
+    }
+    row.update(overrides)
+    return row
+
+
+def test_rows_match_per_row_model_dump():
+    raw = [_gw(1), _gw(2, kickoff_time=None, bonus=2), _gw(3, minutes="45")]
+    rows, report = validate_rows(PlayerGameweekStat, raw, key="element")
+    assert not report
+    assert rows == [PlayerGameweekStat(**r).model_dump() for r in raw]
+
+
+def test_defaults_and_computed_fields_filled():
+    rows, _ = validate_rows(PlayerGameweekStat, [_gw(1)], key="element")
+    assert rows[0]["bonus"] == 0
+    assert rows[0]["team_h_score"] is None
+    assert rows[0]["season"] == 2025
+    assert "bps" not in rows[0]
+
+
+def test_invalid_rows_reported_and_dropped():
+    raw = [_team(1), _team(2, name=None), _team(3), {"id": 4}]
+    rows, report = validate_rows(Team, raw)
+    assert [r["id"] for r in rows] == [1, 3]
+    assert report.total == 4
+    assert report.valid_rows == 2
+    assert report.invalid_rows == 2
+    assert {(e.index, e.key, e.field) for e in report.errors} == {
+        (1, 2, "name"),
+        (3, 4, "name"),
+        (3, 4, "short_name"),
+    }
+
+
+def test_non_dict_row_reported():
+    rows, report = validate_rows(Team, [_team(1), "garbage"])
+    assert len(rows) == 1
+    assert report.errors[0].key is None
+    assert report.errors[0].field == "<row>"
+
+
+def test_report_merge_offsets_indices():
+    _, first = validate_rows(Team, [_team(1), _team(2, name=None)])
+    _, second = validate_rows(Team, [_team(3, short_name=None)])
+    first += second
+    assert first.total == 3
+    assert [e.index for e in first.errors] == [1, 2]
+
+
+def test_report_truncates_long_error_lists():
+    _, report = validate_rows(Team, [{"id": i} for i in range(20)])
+    text = str(report)
+    assert text.startswith("Team: 0/20 rows valid, 20 rejected")
+    assert text.count("\n  row ") == MAX_REPORTED_ERRORS
+    assert "... and 30 more" in text
+
+
+def test_empty_payload():
+    rows, report = validate_rows(Team, [])
+    assert rows == []
+    assert report.total == 0 and not report
+
+
+class _Shouty(BaseModel):
+    id: int
+    name: Optional[str] = None
+
+    @field_validator("name")
+    @classmethod
+    def upper(cls, v):
+        return v.upper() if v else v
+
+    @computed_field
+    @property
+    def label(self) -> str:
+        return f"{self.id}:{self.name}"
+
+
+def test_models_with_validators_use_the_model():
+    rows, report = validate_rows(_Shouty, [{"id": 1, "name": "mff"}, {"id": "x"}])
+    assert rows == [{"id": 1, "name": "MFF", "label": "1:MFF"}]
+    assert report.errors[0].field == "id"